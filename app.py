@@ -1,16 +1,34 @@
 import streamlit as st
-from utils.report_generator import ReportGenerator
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+from utils.report_generator import TIMING_PHASES
+from utils.report_jobs import FAILED, ReportJobQueue
+from utils.report_retention import ReportRetention
+from utils.report_bundle import (
+    bundle_dir, bundle_filename, bundle_sources, folder_report_entries, read_bundle, write_zip_bundle,
+)
+from utils.address_book import AddressBook, normalize_uif_key
+from utils.batch import batch_output_dir, employer_report_path
+from utils.datafile import read_datafile, summarize_datafile, summarize_employers
+from utils.report_context import (
+    BUTTON_DATA_FIELDS,
+    DEFAULT_FINDINGS,
+    DEFAULT_SHARED_FIELDS,
+    build_employer_context,
+    datafile_form_fields,
+    findings_fields,
+    iteration_fields,
+)
+from utils.ingest_cache import IngestCache, datafile_cache_key
+from utils.completion import CompletionDict, tracked_button_data, tracked_form_data
+from utils.diagnostics import Diagnostics, diagnostics_level, log_to_file
+import functools
+import io
 import os
-import pandas as pd
-from datetime import datetime, timedelta
+import time
+import uuid
 import warnings
-from config.copy_paste_text import (
-    FINDINGS, COMPLIANCE, OVERALL_OUTCOMES, VERIFICATION_SCOPES, OBJECTIVES,
-    MONTHLY_AMOUNTS, UI_TEXT,
-    get_finding_text, get_compliance_text, get_overall_outcome_text,
-    get_verification_scope_text, get_objective_text, get_monthly_amount_helper_text,
-    substitute_template_variables
-)
+from datetime import date, datetime
+from config.copy_paste_text import HELPER_SECTIONS, get_section_text, substitute_template_variables
 
 # Suppress deprecation warning originating from docxcompose/pkg_resources
 # We don't use docxcompose directly; this avoids noisy logs in production.
@@ -25,125 +43,60 @@ warnings.filterwarnings(
     module=r"docxcompose\..*",
 )
 
-@st.cache_data(show_spinner=False)
+@st.cache_resource(show_spinner=False)
+def get_shared_address_book():
+    """One read-only address book per server process, shared by all sessions (no per-call copies)"""
+    return AddressBook()
+
+@st.cache_resource(show_spinner=False)
+def get_report_jobs(template_path):
+    """Process-wide pool of warm render worker processes for submitted reports (see ReportJobQueue)"""
+    report_jobs = ReportJobQueue(template_path)
+    report_jobs.warm()
+    return report_jobs
+
+@st.cache_resource(show_spinner=False)
+def get_report_retention():
+    """Process-wide background cleanup of generated_reports/ (size, age and per-employer limits)"""
+    return ReportRetention().start()
+
+@st.cache_resource(show_spinner=False)
+def get_ingest_cache():
+    """Process-wide content-addressed cache of DataFile summaries"""
+    return IngestCache()
+
+@st.cache_resource(show_spinner=False)
+def get_diagnostics_log():
+    """Append diagnostics to DIAGNOSTICS_LOG_FILE (once per server process) when it is set"""
+    path = os.environ.get("DIAGNOSTICS_LOG_FILE")
+    return log_to_file(path) if path else None
+
 def load_address_book():
-    """Load the combined address book and return a lookup dictionary"""
-    try:
-        # Resolve path from ENV or common filename variants to survive case-sensitive prod
-        env_path = os.environ.get("ADDRESS_BOOK_PATH")
-        candidate_paths = []
-        if env_path:
-            candidate_paths.append(env_path)
-        candidate_paths += [
-            os.path.join("data", "combined_address_book.xlsx"),
-            os.path.join("data", "Combined_Address_Book.xlsx"),
-            os.path.join("data", "COMBINED_ADDRESS_BOOK.xlsx"),
-        ]
-
-        resolved_path = None
-        for p in candidate_paths:
-            if os.path.exists(p):
-                resolved_path = p
-                break
-
-        if not resolved_path:
-            st.sidebar.info("Address book not found. Continuing without address enrichment.")
-            return {}
-
-        df = pd.read_excel(resolved_path)
-
-        # Normalize column names and support common aliases
-        col_map = {str(c).strip().upper().replace(" ", "_"): c for c in df.columns}
-
-        def pick(*aliases):
-            for a in aliases:
-                if a in col_map:
-                    return col_map[a]
-            return None
-
-        uif_col = pick("UIFREFERENCENUMBER", "UIF_REFERENCE_NUMBER", "UIF_REF_NUMBER", "UIF_NUMBER", "UIFREF", "UIF_REF")
-        addr_col = pick("ADDRESS", "ADDRESS_LINE", "ADDRESS1", "LOCATION", "ADDRESS_IN_FULL")
-        prov_col = pick("PROVINCE", "PROV", "STATE")
-
-        if not uif_col:
-            st.sidebar.warning("Address book loaded but UIF reference column was not found. Skipping address enrichment.")
-            return {}
-
-        # Create lookup dictionary: UIF -> (ADDRESS, PROVINCE)
-        address_lookup = {}
-        for _, row in df.iterrows():
-            uif_val = row[uif_col]
-            if pd.isna(uif_val):
-                continue
-            key = str(uif_val).strip()
-            # Tolerate Excel numeric-like strings such as '123.0'
-            if key.endswith('.0'):
-                try:
-                    key = str(int(float(key)))
-                except Exception:
-                    pass
-
-            addr_val = ""
-            if addr_col and addr_col in df.columns and pd.notna(row.get(addr_col)):
-                addr_val = str(row.get(addr_col)).strip()
-
-            prov_val = ""
-            if prov_col and prov_col in df.columns and pd.notna(row.get(prov_col)):
-                prov_val = str(row.get(prov_col)).strip()
-
-            if key:
-                address_lookup[key] = (addr_val, prov_val)
-
-        return address_lookup
-    except Exception as e:
-        st.sidebar.error(f"Error loading address book: {str(e)}")
-        return {}
+    """Return the shared address book lookup, reporting load problems in the sidebar"""
+    address_book = get_shared_address_book()
+    if address_book.status == "missing":
+        st.sidebar.info("Address book not found. Continuing without address enrichment.")
+    elif address_book.status == "no_uif_column":
+        st.sidebar.warning("Address book loaded but UIF reference column was not found. Skipping address enrichment.")
+    elif address_book.status == "error":
+        st.sidebar.error(f"Error loading address book: {address_book.error}")
+    return address_book
 
 def get_address_from_uif(uif_ref_number, address_lookup):
     """Get address and province for a given UIF reference number"""
     if not uif_ref_number or not address_lookup:
         return "", ""
-
-    uif_ref_clean = str(uif_ref_number).strip()
-    if uif_ref_clean.endswith('.0'):
-        try:
-            uif_ref_clean = str(int(float(uif_ref_clean)))
-        except Exception:
-            pass
-    return address_lookup.get(uif_ref_clean, ("", ""))
+    return address_lookup.get(normalize_uif_key(uif_ref_number), ("", ""))
 
 # Simple Streamlit app without custom CSS
 
-# Initialize session state for button approach
+# Initialize session state for button approach (one text per helper section, see HELPER_SECTIONS)
 if 'button_data' not in st.session_state:
-    st.session_state.button_data = {
-        "main_findings": "",
-        "limitation_of_scope": "",
-        "compliance_comments": "",
-        "overall_outcomes": "",
-        "payment_verification_scope": "",
-        "employment_verification_scope": "",
-        "claims_validity_scope": "",
-        "objective_1_comment": "",
-        "objective_2_comment": "",
-        "objective_3_comment": "",
-        "objective_4_comment": "",
-        "objective_5_comment": ""
-    }
-    st.session_state.saved = {
-        "main_findings": False,
-        "limitation_of_scope": False,
-        "compliance_comments": False,
-        "overall_outcomes": False,
-        "payment_verification_scope": False,
-        "employment_verification_scope": False,
-        "claims_validity_scope": False,
-        "objective_1_comment": False,
-        "objective_2_comment": False,
-        "objective_3_comment": False,
-        "objective_4_comment": False,
-        "objective_5_comment": False
-    }
+    st.session_state.button_data = tracked_button_data({section: "" for section in HELPER_SECTIONS})
+    st.session_state.saved = {section: False for section in HELPER_SECTIONS}
+if "helper_templates" not in st.session_state:
+    # Each helper section's text with its {{variables}} unfilled, for batch reports (see add_helper_text)
+    st.session_state.helper_templates = {section: "" for section in HELPER_SECTIONS}
 
 # Initialize monthly payments saved status
 if 'monthly_payments_saved' not in st.session_state:
@@ -151,29 +104,34 @@ if 'monthly_payments_saved' not in st.session_state:
 
 # Initialize other session state variables
 if "form_data" not in st.session_state:
-    st.session_state.form_data = {}
+    st.session_state.form_data = tracked_form_data()
 if 'widget_version' not in st.session_state:
     st.session_state.widget_version = 0
 if "findings" not in st.session_state:
-    st.session_state.findings = [
-        {
-            "description": "IRP5s, ID Copies and Employment contracts for the all the beneficiaries were not provided",
-            "rating": "Critical",
-            "page_ref": "TP.2"
-        },
-        {
-            "description": "The employer did not provide all the required bank statements detailing the funds they received from UIF.",
-            "rating": "Critical", 
-            "page_ref": "TP.3"
-        },
-        {
-            "description": "No payroll data or EMP501/201 documents were provided to confirm the employer's monthly UIF contributions/declarations.",
-            "rating": "Critical",
-            "page_ref": "TP.4"
-        }
-    ]
+    st.session_state.findings = [dict(finding) for finding in DEFAULT_FINDINGS]
 if "output_path" not in st.session_state:
     st.session_state.output_path = None
+if "report_bytes" not in st.session_state:
+    st.session_state.report_bytes = None
+if "generation_timings" not in st.session_state:
+    st.session_state.generation_timings = []
+if "report_job_id" not in st.session_state:
+    st.session_state.report_job_id = None
+if "server_timings" not in st.session_state:
+    st.session_state.server_timings = []
+if "run_counts" not in st.session_state:
+    # Script runs of this session; "extra" counts the reruns the app itself asked for
+    st.session_state.run_counts = {"page": 0, "section": 0, "extra": 0}
+if "diagnostics" not in st.session_state:
+    # Off unless DIAGNOSTICS_LEVEL is set (debug, info, warning or error)
+    st.session_state.diagnostics = Diagnostics(diagnostics_level())
+    if st.session_state.diagnostics.enabled:
+        get_diagnostics_log()
+if "session_id" not in st.session_state:
+    # Identifies this session's saved reports in generated_reports/index.sqlite
+    st.session_state.session_id = uuid.uuid4().hex
+if "report_notices" not in st.session_state:
+    st.session_state.report_notices = []
 if "disabled_fields" not in st.session_state:
     st.session_state.disabled_fields = set()
 if "validation_errors" not in st.session_state:
@@ -187,16 +145,21 @@ if "current_file_name" not in st.session_state:
 def initialize_session_state():
     """Initialize session state with nested structure for better organization"""
     if 'form_data' not in st.session_state:
-        st.session_state.form_data = {
+        st.session_state.form_data = tracked_form_data({
             'personal_info': {},
             'monthly_data': {},
             'findings': [],
             'completion_status': {}
-        }
+        })
     
     # Initialize legacy structure for backward compatibility
     if 'form_data' not in st.session_state or not isinstance(st.session_state.form_data, dict):
-        st.session_state.form_data = {}
+        st.session_state.form_data = tracked_form_data()
+    # Completion is counted as fields are written (see utils.completion); adopt plain dicts
+    if not isinstance(st.session_state.form_data, CompletionDict):
+        st.session_state.form_data = tracked_form_data(st.session_state.form_data)
+    if not isinstance(st.session_state.button_data, CompletionDict):
+        st.session_state.button_data = tracked_button_data(st.session_state.button_data)
     
     # Ensure nested structure exists even if form_data already exists
     if 'completion_status' not in st.session_state.form_data:
@@ -289,84 +252,10 @@ initialize_session_state()
 
 st.title("UIF TERS Report Generator - Button Approach")
 
-# Debug section removed for cleaner interface
+# Start of a whole-page run (timed at the end of the script; section reruns do not get here)
+page_run_started = time.perf_counter()
 
-# Calculate completion status
-# Enhanced completion status tracking
-def get_section_completion(section_name, required_fields, optional_fields=None):
-    """Calculate completion for a specific section with better accuracy"""
-    filled_count = 0
-    total_count = len(required_fields)
-    
-    # Count filled required fields
-    for field in required_fields:
-        field_value = st.session_state.form_data.get(field, "")
-        if field_value and str(field_value).strip() and field_value != "N/A":
-            filled_count += 1
-    
-    # Add optional fields if specified
-    if optional_fields:
-        total_count += len(optional_fields)
-        for field in optional_fields:
-            field_value = st.session_state.form_data.get(field, "")
-            if field_value and str(field_value).strip() and field_value != "N/A":
-                filled_count += 1
-    
-    percentage = (filled_count / total_count * 100) if total_count > 0 else 0
-    return {
-        'filled': filled_count,
-        'total': total_count,
-        'percentage': round(percentage, 1)
-    }
-
-def get_button_data_completion():
-    """Calculate completion for button-based sections"""
-    filled_count = 0
-    total_count = len(st.session_state.button_data)
-    
-    for key, value in st.session_state.button_data.items():
-        if value and str(value).strip():
-            filled_count += 1
-    
-    percentage = (filled_count / total_count * 100) if total_count > 0 else 0
-    return {
-        'filled': filled_count,
-        'total': total_count,
-        'percentage': round(percentage, 1)
-    }
-
-def get_monthly_data_completion():
-    """Calculate completion percentage for monthly data section"""
-    if 'monthly_data' not in st.session_state.form_data:
-        return {'filled': 0, 'total': 0, 'percentage': 0}
-    
-    monthly_data = st.session_state.form_data['monthly_data']
-    filled_months = 0
-    total_months = 0
-    
-    # Count months with both claim and payment data
-    for month_key in monthly_data.keys():
-        if month_key.endswith('_claim') or month_key.endswith('_payment'):
-            month_base = month_key.replace('_claim', '').replace('_payment', '')
-            if month_base not in [key.replace('_claim', '').replace('_payment', '') for key in monthly_data.keys() if key != month_key]:
-                continue
-            
-            claim_key = f"{month_base}_claim"
-            payment_key = f"{month_base}_payment"
-            
-            if claim_key in monthly_data and payment_key in monthly_data:
-                total_months += 1
-                if monthly_data[claim_key] and monthly_data[payment_key]:
-                    filled_months += 1
-    
-    percentage = (filled_months / total_months * 100) if total_months > 0 else 0
-    return {'filled': filled_months, 'total': total_months, 'percentage': percentage}
-
-def count_filled_fields(section_data):
-    """Count filled fields in a section"""
-    if isinstance(section_data, dict):
-        return sum(1 for value in section_data.values() if value and str(value).strip())
-    return 0
+# Debug section removed for cleaner interface
 
 def count_total_fields(section):
     """Count total fields in a section"""
@@ -378,32 +267,15 @@ def count_total_fields(section):
     return section_field_counts.get(section, 0)
 
 def update_completion_status():
-    """Calculate completion percentage for each section with enhanced accuracy"""
-    if 'completion_status' not in st.session_state.form_data:
-        st.session_state.form_data['completion_status'] = {}
-    
-    # Company Details - core required fields
-    company_fields = [
-        "Name_of_Employer", "UIF_REG_Number", "Location_Type_address_in_full", 
-        "Period_Claimed_For_Lockdown_Period", "Industry", "Number_of_Employees", "Province"
-    ]
-    
-    # Financials - core required fields
-    financial_fields = [
-        "Total_Amount_Verified", "Amount_Verified_as_Accurate", "Affected_Employees"
-    ]
-    
-    # Update completion status with enhanced calculations
+    """Store each section's completion in form_data. form_data and button_data count their filled
+    fields as they are written (see utils.completion), so this only reads four counters"""
     st.session_state.form_data['completion_status'] = {
-        'company_details': get_section_completion('company_details', company_fields),
-        'financials': get_section_completion('financials', financial_fields),
-        'monthly_data': get_monthly_data_completion(),
-        'findings': get_button_data_completion()
+        'company_details': st.session_state.form_data.completion('company_details'),
+        'financials': st.session_state.form_data.completion('financials'),
+        'monthly_data': st.session_state.form_data.completion('monthly_data'),
+        'findings': st.session_state.button_data.completion('findings')
     }
 
-# Update completion status
-update_completion_status()
-
 # Check for template
 template_path = "templates/UIF_Template.docx"
 if os.path.exists(template_path):
@@ -414,68 +286,91 @@ else:
 
 # Sidebar: Progress tracking
 st.sidebar.header("📊 Form Completion Progress")
+# Filled by progress_panel() once the DataFile upload below is handled, so an upload shows in the same run
+progress_area = st.sidebar.container()
 
-# Update completion status before displaying
-update_completion_status()
-
-# Get current progress data
-completion_status = st.session_state.form_data.get('completion_status', {})
-
-# Overall progress
-total_sections = 4
-completed_sections = sum(1 for section in completion_status.values() if section.get('percentage', 0) >= 100)
-overall_percentage = (completed_sections / total_sections) * 100
+@st.fragment(key="progress_panel")
+def progress_panel():
+    """Sidebar completion progress (a fragment: callbacks that move it rerun it together with their section)"""
+    # Update completion status before displaying
+    update_completion_status()
 
-# Display overall progress
-st.sidebar.markdown("### 🎯 Overall Progress")
-st.sidebar.progress(overall_percentage / 100)
-st.sidebar.metric(
-    label="Complete Sections", 
-    value=f"{completed_sections}/{total_sections}",
-    delta=f"{overall_percentage:.1f}% Complete"
-)
+    # Get current progress data
+    completion_status = st.session_state.form_data.get('completion_status', {})
+
+    # Overall progress
+    total_sections = 4
+    completed_sections = sum(1 for section in completion_status.values() if section.get('percentage', 0) >= 100)
+    overall_percentage = (completed_sections / total_sections) * 100
+
+    # Display overall progress
+    st.markdown("### 🎯 Overall Progress")
+    st.progress(overall_percentage / 100)
+    st.metric(
+        label="Complete Sections", 
+        value=f"{completed_sections}/{total_sections}",
+        delta=f"{overall_percentage:.1f}% Complete"
+    )
 
-st.sidebar.markdown("---")
-
-# Display section progress with better formatting
-st.sidebar.markdown("### 📋 Section Details")
-
-# Company Details
-company_progress = completion_status.get('company_details', {})
-st.sidebar.markdown(f"**🏢 Company Details**")
-st.sidebar.progress(company_progress.get('percentage', 0) / 100)
-st.sidebar.caption(f"{company_progress.get('filled', 0)}/{company_progress.get('total', 0)} fields completed")
-
-# Financials
-financials_progress = completion_status.get('financials', {})
-st.sidebar.markdown(f"**💰 Financials**")
-st.sidebar.progress(financials_progress.get('percentage', 0) / 100)
-st.sidebar.caption(f"{financials_progress.get('filled', 0)}/{financials_progress.get('total', 0)} fields completed")
-
-# Monthly Data
-monthly_progress = completion_status.get('monthly_data', {})
-st.sidebar.markdown(f"**📅 Monthly Data**")
-st.sidebar.progress(monthly_progress.get('percentage', 0) / 100)
-st.sidebar.caption(f"{monthly_progress.get('filled', 0)}/{monthly_progress.get('total', 0)} months completed")
-
-# Findings & Compliance
-findings_progress = completion_status.get('findings', {})
-st.sidebar.markdown(f"**🔍 Findings & Compliance**")
-st.sidebar.progress(findings_progress.get('percentage', 0) / 100)
-st.sidebar.caption(f"{findings_progress.get('filled', 0)}/{findings_progress.get('total', 0)} sections completed")
-
-# Status indicators
-st.sidebar.markdown("---")
-st.sidebar.markdown("### 📊 Status Summary")
-
-if overall_percentage == 100:
-    st.sidebar.success("🎉 **Form Complete!** Ready to generate report.")
-elif overall_percentage >= 75:
-    st.sidebar.info("📝 **Almost Complete!** Just a few more fields needed.")
-elif overall_percentage >= 50:
-    st.sidebar.warning("⚠️ **Halfway There!** Keep going!")
-else:
-    st.sidebar.info("🚀 **Getting Started!** Begin with company details.")
+    st.markdown("---")
+
+    # Display section progress with better formatting
+    st.markdown("### 📋 Section Details")
+
+    # Company Details
+    company_progress = completion_status.get('company_details', {})
+    st.markdown(f"**🏢 Company Details**")
+    st.progress(company_progress.get('percentage', 0) / 100)
+    st.caption(f"{company_progress.get('filled', 0)}/{company_progress.get('total', 0)} fields completed")
+
+    # Financials
+    financials_progress = completion_status.get('financials', {})
+    st.markdown(f"**💰 Financials**")
+    st.progress(financials_progress.get('percentage', 0) / 100)
+    st.caption(f"{financials_progress.get('filled', 0)}/{financials_progress.get('total', 0)} fields completed")
+
+    # Monthly Data
+    monthly_progress = completion_status.get('monthly_data', {})
+    st.markdown(f"**📅 Monthly Data**")
+    st.progress(monthly_progress.get('percentage', 0) / 100)
+    st.caption(f"{monthly_progress.get('filled', 0)}/{monthly_progress.get('total', 0)} months completed")
+
+    # Findings & Compliance
+    findings_progress = completion_status.get('findings', {})
+    st.markdown(f"**🔍 Findings & Compliance**")
+    st.progress(findings_progress.get('percentage', 0) / 100)
+    st.caption(f"{findings_progress.get('filled', 0)}/{findings_progress.get('total', 0)} sections completed")
+
+    # Status indicators
+    st.markdown("---")
+    st.markdown("### 📊 Status Summary")
+
+    if overall_percentage == 100:
+        st.success("🎉 **Form Complete!** Ready to generate report.")
+    elif overall_percentage >= 75:
+        st.info("📝 **Almost Complete!** Just a few more fields needed.")
+    elif overall_percentage >= 50:
+        st.warning("⚠️ **Halfway There!** Keep going!")
+    else:
+        st.info("🚀 **Getting Started!** Begin with company details.")
+    # What the sidebar now shows (see rerun_changed and form_section)
+    st.session_state.progress_shown = completion_status
+
+# Sidebar: Shared address book status and reload
+with st.sidebar.expander("📇 Address Book"):
+    shared_address_book = get_shared_address_book()
+    if shared_address_book.status == "ok":
+        load_source = "compiled index" if shared_address_book.stats.get("source") == "index" else "workbook"
+        st.caption(
+            f"{len(shared_address_book)} UIF references from {load_source} "
+            f"in {shared_address_book.stats.get('seconds', 0):.2f}s"
+        )
+        st.caption(f"Memory: {shared_address_book.memory_bytes() / (1024 * 1024):.1f} MB (shared by all sessions)")
+    else:
+        st.caption("Address book not loaded - address enrichment unavailable.")
+    if st.button("🔄 Reload Address Book", key="reload_address_book", use_container_width=True):
+        shared_address_book.reload()
+        st.success(f"Address book reloaded: {len(shared_address_book)} UIF references")
 
 # Sidebar: DataFile Upload
 st.sidebar.header("Upload DataFile")
@@ -491,45 +386,33 @@ if uploaded_file is not None:
         st.session_state.file_processed = False
     
     if not st.session_state.file_processed:
+        diagnostics = st.session_state.diagnostics
         try:
-            df = pd.read_excel(uploaded_file)
-
-            # Normalize headers and support common aliases
-            df_cols = {str(c).strip().upper().replace(' ', '_'): c for c in df.columns}
-            def pick_df(*aliases):
-                for a in aliases:
-                    if a in df_cols:
-                        return df_cols[a]
-                return None
-
-            name_col = pick_df('TRADENAME', 'TRADE_NAME', 'EMPLOYER_NAME', 'NAME_OF_EMPLOYER', 'NAME', 'COMPANY', 'TRADING_NAME')
-            uif_col = pick_df('UIFREFERENCENUMBER', 'UIF_REFERENCE_NUMBER', 'UIF_REF_NUMBER', 'UIF_NUMBER', 'UIFREF', 'UIF_REF', 'UIF_REG_NUMBER')
-            industry_col = pick_df('INDUSTRYSECTOR', 'INDUSTRY_SECTOR', 'INDUSTRY', 'SECTOR')
-
-            # Aggregate from DataFile using resolved columns
-            name_of_employer = ''
-            if name_col and name_col in df.columns and not df[name_col].dropna().empty:
-                name_of_employer = str(df[name_col].dropna().iloc[0])
-            st.sidebar.write(f"Info: Employer column detected = {name_col or 'None'}, value = '{name_of_employer}'")
-
-            uif_reg_number = ''
-            if uif_col and uif_col in df.columns and not df[uif_col].dropna().empty:
-                uif_reg_number = str(df[uif_col].dropna().iloc[0]).strip()
-                if uif_reg_number.endswith('.0'):
-                    try:
-                        uif_reg_number = str(int(float(uif_reg_number)))
-                    except Exception:
-                        pass
-            st.sidebar.write(f"Info: UIF column detected = {uif_col or 'None'}, value = '{uif_reg_number}'")
-
-            industry = ''
-            if industry_col and industry_col in df.columns and not df[industry_col].dropna().empty:
-                industry = str(df[industry_col].dropna().iloc[0])
-            st.sidebar.write(f"Info: Industry column detected = {industry_col or 'None'}, value = '{industry}'")
-            
+            # Serve repeat uploads of the same bytes from the ingestion cache without touching pandas
+            ingest_cache = get_ingest_cache()
+            file_bytes = uploaded_file.getvalue()
+            cache_key = datafile_cache_key(file_bytes)
+            summary = ingest_cache.get(cache_key)
+            if summary is None:
+                # Stream the workbook and keep only the columns resolved from the header row
+                with diagnostics.span(f"Read DataFile {uploaded_file.name}"):
+                    df, datafile_columns = read_datafile(io.BytesIO(file_bytes))
+                with diagnostics.span(f"Summarized {len(df)} rows"):
+                    summary = summarize_datafile(df, datafile_columns, diagnostics)
+                ingest_cache.put(cache_key, summary)
+            else:
+                diagnostics.info("DataFile summary of %s served from ingestion cache", uploaded_file.name)
+
+            uif_reg_number = summary["uif_reg_number"]
+            if summary["iteration_counts"] is not None:
+                # Persist to session
+                st.session_state['iteration_counts'] = summary["iteration_counts"]
+                st.session_state['gaps_flag'] = summary["gaps_flag"]
+
             # Load address book and lookup address/province for this UIF reference number
-            address_lookup = load_address_book()
-            auto_address, auto_province = get_address_from_uif(uif_reg_number, address_lookup)
+            with diagnostics.span(f"Address lookup for UIF {uif_reg_number}"):
+                address_lookup = load_address_book()
+                auto_address, auto_province = get_address_from_uif(uif_reg_number, address_lookup)
             
             # Show address lookup results in sidebar
             if auto_address or auto_province:
@@ -540,599 +423,68 @@ if uploaded_file is not None:
                     st.sidebar.write(f"**Province:** {auto_province}")
             else:
                 st.sidebar.info(f"ℹ️ No address found for UIF {uif_reg_number} in address book")
-            
-            # Count unique employees by ID number (assuming there's an ID column)
-            id_column = None
-            for col in df.columns:
-                if 'ID' in col.upper() or 'EMPLOYEE' in col.upper():
-                    id_column = col
-                    break
-            
-            if id_column:
-                number_of_employees = df[id_column].nunique()
-            else:
-                # Fallback to row count if no ID column found
-                number_of_employees = len(df)
-            
-            affected_employees = number_of_employees  # Assume all affected
-            
-            # Convert dates (handle both serial numbers and pandas Timestamps)
-            def serial_to_date(serial):
-                if pd.isna(serial):
-                    return None
-                if isinstance(serial, (pd.Timestamp, datetime)):
-                    return serial
-                try:
-                    # Try to convert to numeric for Excel serial dates
-                    base = datetime(1899, 12, 30)
-                    return base + timedelta(days=int(float(serial)))
-                except (ValueError, TypeError):
-                    # If conversion fails, try to parse as date string
-                    try:
-                        return pd.to_datetime(serial)
-                    except:
-                        return None
-            
-            # Get all shutdown periods and format them properly
-            if 'SHUTDOWN_FROM' in df and 'SHUTDOWN_TILL' in df:
-                # Get unique shutdown periods
-                shutdown_periods = []
-                st.sidebar.write(f"Debug: Processing {len(df)} rows for periods")
-                
-                for _, row in df.iterrows():
-                    if pd.notna(row['SHUTDOWN_FROM']) and pd.notna(row['SHUTDOWN_TILL']):
-                        from_date = serial_to_date(row['SHUTDOWN_FROM'])
-                        till_date = serial_to_date(row['SHUTDOWN_TILL'])
-                        if from_date and till_date:
-                            # Format as "27 March 2020 to 30 April 2020"
-                            from_formatted = from_date.strftime('%d %B %Y').lstrip('0') if from_date.day != 0 else from_date.strftime('%B %Y')
-                            till_formatted = till_date.strftime('%d %B %Y').lstrip('0') if till_date.day != 0 else till_date.strftime('%B %Y')
-                            period = f"{from_formatted} to {till_formatted}"
-                            if period not in shutdown_periods:
-                                shutdown_periods.append(period)
-                                st.sidebar.write(f"Debug: Added period: {period}")
-                
-                st.sidebar.write(f"Debug: Total unique periods found: {len(shutdown_periods)}")
-                if shutdown_periods:
-                    period_claimed = ", ".join(shutdown_periods)
-                else:
-                    period_claimed = ""
-            else:
-                period_claimed = ""
-            
-            # Financial totals - Calculate total amount verified from bank pay amounts with specific criteria
-            # Ensure expected numeric columns exist and are numeric
-            for col in ['PAYMENT_ITR_1', 'PAYMENT_ITR_2', 'PAYMENT_ITR_3', 'BANK_PAY_AMOUNT']:
-                if col in df.columns:
-                    df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0)
-                else:
-                    df[col] = 0
-            
-            # Calculate total amount verified based on payment status and medium
-            # Assuming columns exist for payment status and medium - adjust column names as needed
-            payment_status_col = None
-            payment_medium_col = None
-            
-            # Look for payment status and medium columns
-            for col in df.columns:
-                if 'STATUS' in col.upper() and 'PAYMENT' in col.upper():
-                    payment_status_col = col
-                elif 'MEDIUM' in col.upper() and 'PAYMENT' in col.upper():
-                    payment_medium_col = col
-            
-            # Calculate total amount verified based on criteria
-            try:
-                if payment_status_col and payment_medium_col:
-                    # Filter for payment status = 3 and payment medium = 1 or 2
-                    mask = (df[payment_status_col] == 3) & (df[payment_medium_col].isin([1, 2]))
-                    total_amount_verified = df.loc[mask, 'BANK_PAY_AMOUNT'].sum()
-                else:
-                    # Fallback: sum all bank pay amounts
-                    total_amount_verified = df['BANK_PAY_AMOUNT'].sum()
-            except Exception:
-                total_amount_verified = 0
-            
-            # Round to 2 decimal places and format with R prefix
-            total_amount_verified = round(total_amount_verified, 2)
-            st.sidebar.write(f"Info: Total Amount Verified computed = R {total_amount_verified:.2f}")
-            
-            # Amount verified as accurate will be left blank for user input
-            amount_verified_accurate = 0
-            amount_not_disbursed = total_amount_verified - amount_verified_accurate
-            verified_percentage = 0  # Will be calculated when user inputs amount verified as accurate
-            
-            # Monthly claims - determine based on shutdown dates
-            monthly_claims = {
-                "April_2020": "N/A",
-                "May_2020": "N/A", 
-                "June_2020": "N/A",
-                "July_2020": "N/A",
-                "Aug_2020": "N/A",
-                "Sep_2020": "N/A",
-                "Oct_2020": "N/A",
-                "Nov_2020": "N/A",
-                "Dec_2020": "N/A",
-                "Jan_2021": "N/A",
-                "Feb_2021": "N/A",
-                "Mar_2021": "N/A",
-                "Apr_2021": "N/A",
-                "May_2021": "N/A",
-                "Jun_2021": "N/A",
-                "July_2021": "N/A"
-            }
-            
-            # Calculate monthly claims based on shutdown dates
-            if 'SHUTDOWN_TILL' in df:
-                # First, let's debug what we're seeing
-                st.sidebar.write(f"Debug: Found {len(df)} rows in datafile")
-                st.sidebar.write(f"Debug: SHUTDOWN_TILL column values: {df['SHUTDOWN_TILL'].dropna().unique()}")
-                
-                # Group by SHUTDOWN_TILL to get unique periods and their amounts
-                shutdown_groups = df.groupby('SHUTDOWN_TILL')['BANK_PAY_AMOUNT'].sum()
-                st.sidebar.write(f"Debug: Found {len(shutdown_groups)} unique shutdown periods")
-                
-                for shutdown_till, total_amount in shutdown_groups.items():
-                    if pd.notna(shutdown_till):
-                        shutdown_date = serial_to_date(shutdown_till)
-                        if shutdown_date:
-                            # Determine which month this represents (shutdown till date indicates the month they claimed)
-                            month_key = shutdown_date.strftime('%B_%Y')
-                            st.sidebar.write(f"Debug: Processing shutdown date {shutdown_date} -> month_key: '{month_key}'")
-                            
-                            # Map full month names to abbreviated keys in monthly_claims
-                            month_mapping = {
-                                'January_2020': 'Jan_2020', 'February_2020': 'Feb_2020', 'March_2020': 'Mar_2020',
-                                'April_2020': 'April_2020', 'May_2020': 'May_2020', 'June_2020': 'June_2020',
-                                'July_2020': 'July_2020', 'August_2020': 'Aug_2020', 'September_2020': 'Sep_2020',
-                                'October_2020': 'Oct_2020', 'November_2020': 'Nov_2020', 'December_2020': 'Dec_2020',
-                                'January_2021': 'Jan_2021', 'February_2021': 'Feb_2021', 'March_2021': 'Mar_2021',
-                                'April_2021': 'Apr_2021', 'May_2021': 'May_2021', 'June_2021': 'Jun_2021',
-                                'July_2021': 'July_2021'
-                            }
-                            
-                            # Try to find the correct key
-                            if month_key in monthly_claims:
-                                monthly_claims[month_key] = f"R {round(total_amount, 2)}"
-                                st.sidebar.write(f"Debug: {month_key} -> R {round(total_amount, 2)}")
-                            elif month_key in month_mapping:
-                                mapped_key = month_mapping[month_key]
-                                if mapped_key in monthly_claims:
-                                    monthly_claims[mapped_key] = f"R {round(total_amount, 2)}"
-                                    st.sidebar.write(f"Debug: Mapped {month_key} -> {mapped_key} -> R {round(total_amount, 2)}")
-                                else:
-                                    st.sidebar.write(f"Debug: Mapped key '{mapped_key}' not found in monthly_claims")
-                            else:
-                                st.sidebar.write(f"Debug: Month key '{month_key}' not found in monthly_claims or mapping")
-                                st.sidebar.write(f"Debug: Available keys: {list(monthly_claims.keys())}")
-
-                # Compute Iterations (employees paid per period) and Gaps flag
-                try:
-                    # Collect unique shutdown months as datetime (normalized to month)
-                    unique_shutdowns = [serial_to_date(val) for val in df['SHUTDOWN_TILL'].dropna().unique()]
-                    unique_shutdowns = [d for d in unique_shutdowns if d is not None]
-                    unique_month_keys = sorted({datetime(d.year, d.month, 1) for d in unique_shutdowns})
-
-                    # Helper: month difference
-                    def months_diff(a, b):
-                        return (b.year - a.year) * 12 + (b.month - a.month)
-
-                    # Determine gaps: any non-consecutive month differences > 1
-                    gaps_flag = "No"
-                    for i in range(1, len(unique_month_keys)):
-                        if months_diff(unique_month_keys[i-1], unique_month_keys[i]) > 1:
-                            gaps_flag = "Yes"
-                            break
-
-                    # Determine employee identifier column
-                    emp_col = None
-                    for col in df.columns:
-                        if 'ID' in col.upper() or 'EMPLOYEE' in col.upper():
-                            emp_col = col
-                            break
-
-                    iteration_counts = []
-                    if len(unique_month_keys) > 0:
-                        for month_dt in unique_month_keys:
-                            # Filter rows matching this month
-                            mask = df['SHUTDOWN_TILL'].apply(lambda x: serial_to_date(x))
-                            mask = mask.apply(lambda d: (d is not None) and (d.year == month_dt.year and d.month == month_dt.month))
-                            period_df = df[mask]
-                            # Only count paid entries (BANK_PAY_AMOUNT > 0) if available
-                            if 'BANK_PAY_AMOUNT' in period_df.columns:
-                                period_df = period_df[pd.to_numeric(period_df['BANK_PAY_AMOUNT'], errors='coerce').fillna(0) > 0]
-                            # Count unique employees if column exists, else count rows
-                            if emp_col and emp_col in period_df.columns:
-                                count_val = period_df[emp_col].nunique()
-                            else:
-                                count_val = len(period_df)
-                            iteration_counts.append(int(count_val))
-                    # Persist to session
-                    st.session_state['iteration_counts'] = iteration_counts
-                    st.session_state['gaps_flag'] = gaps_flag
-                    st.sidebar.write(f"Debug: Iteration counts = {iteration_counts}, Gaps = {gaps_flag}")
-                except Exception as e:
-                    st.sidebar.write(f"Debug: Failed to compute iterations/gaps: {e}")
-            
-            # Monthly payments - determine which months are editable based on claims
-            monthly_payments = {
-                "April_2020": {"value": "", "editable": monthly_claims["April_2020"] != "N/A"},
-                "May_2020": {"value": "", "editable": monthly_claims["May_2020"] != "N/A"},
-                "June_2020": {"value": "", "editable": monthly_claims["June_2020"] != "N/A"},
-                "July_2020": {"value": "", "editable": monthly_claims["July_2020"] != "N/A"},
-                "Aug_2020": {"value": "", "editable": monthly_claims["Aug_2020"] != "N/A"},
-                "Sep_2020": {"value": "", "editable": monthly_claims["Sep_2020"] != "N/A"},
-                "Oct_2020": {"value": "", "editable": monthly_claims["Oct_2020"] != "N/A"},
-                "Nov_2020": {"value": "", "editable": monthly_claims["Nov_2020"] != "N/A"},
-                "Dec_2020": {"value": "", "editable": monthly_claims["Dec_2020"] != "N/A"},
-                "Jan_2021": {"value": "", "editable": monthly_claims["Jan_2021"] != "N/A"},
-                "Feb_2021": {"value": "", "editable": monthly_claims["Feb_2021"] != "N/A"},
-                "Mar_2021": {"value": "", "editable": monthly_claims["Mar_2021"] != "N/A"},
-                "Apr_2021": {"value": "", "editable": monthly_claims["Apr_2021"] != "N/A"},
-                "May_2021": {"value": "", "editable": monthly_claims["May_2021"] != "N/A"},
-                "Jun_2021": {"value": "", "editable": monthly_claims["Jun_2021"] != "N/A"},
-                "July_2021": {"value": "", "editable": monthly_claims["July_2021"] != "N/A"}
-            }
-            
-            # Set default values for non-editable months
-            for month, data in monthly_payments.items():
-                if not data["editable"]:
-                    data["value"] = "N/A"
-            
-            # Store monthly claims in form_data for progress tracking
-            for month, claim_amount in monthly_claims.items():
-                # Map month names to form field keys
-                month_to_field_mapping = {
-                    "April_2020": "April_2020_Indicate_NA_where_no_claim_",
-                    "May_2020": "May_2020",
-                    "June_2020": "June_2020", 
-                    "July_2020": "July_2020",
-                    "Aug_2020": "Aug_2020",
-                    "Sep_2020": "Sep_2020",
-                    "Oct_2020": "Oct_2020",
-                    "Nov_2020": "Nov_2020",
-                    "Dec_2020": "Dec_2020",
-                    "Jan_2021": "Jan_2021",
-                    "Feb_2021": "Feb_2021",
-                    "Mar_2021": "Mar_2021",
-                    "Apr_2021": "Apr_2021",
-                    "May_2021": "May_2021",
-                    "Jun_2021": "Jun_2021",
-                    "July_2021": "July_2021"
-                }
-                
-                if month in month_to_field_mapping:
-                    field_key = month_to_field_mapping[month]
-                    st.session_state.form_data[field_key] = claim_amount
-            
-            # Store monthly payments in form_data for progress tracking
-            for month, payment_data in monthly_payments.items():
-                # Map month names to payment field keys
-                month_to_payment_field_mapping = {
-                    "April_2020": "April_2020_Indicate_NA_where_no_paymen",
-                    "May_2020": "May_20201",
-                    "June_2020": "June_20201",
-                    "July_2020": "July_20201",
-                    "Aug_2020": "Aug_20201",
-                    "Sep_2020": "Sep_20201",
-                    "Oct_2020": "Oct_20201",
-                    "Nov_2020": "Nov_20201",
-                    "Dec_2020": "Dec_20201",
-                    "Jan_2021": "Jan_20211",
-                    "Feb_2021": "Feb_20211",
-                    "Mar_2021": "Mar_20211",
-                    "Apr_2021": "Apr_20211",
-                    "May_2021": "May_20211",
-                    "Jun_2021": "Jun_20211",
-                    "July_2021": "July_20211"
-                }
-                
-                if month in month_to_payment_field_mapping:
-                    field_key = month_to_payment_field_mapping[month]
-                    # Set payment value - if editable, use claim amount as default, otherwise use N/A
-                    if payment_data["editable"]:
-                        claim_amount = monthly_claims[month]
-                        if claim_amount != "N/A":
-                            # Extract amount from claim (remove "R " prefix)
-                            claim_amount_clean = claim_amount.replace("R ", "").replace(",", "")
-                            st.session_state.form_data[field_key] = f"R {claim_amount_clean}"
-                        else:
-                            st.session_state.form_data[field_key] = ""
-                    else:
-                        st.session_state.form_data[field_key] = "N/A"
-
-            # Populate form_data with comprehensive data
-            st.session_state.form_data.update({
-                "Name_of_Employer": name_of_employer,
-                "UIF_REG_Number": uif_reg_number,
-                "Industry": industry,
-                "Number_of_Employees": str(number_of_employees),
-                "Period_Claimed_For_Lockdown_Period": period_claimed,
-                "Location_Type_address_in_full": auto_address,  # Auto-populated from address book
-                "Province": auto_province,  # Auto-populated from address book
-                "Total_Amount_Verified": f"R {total_amount_verified:.2f}",
-                "Amount_Verified_as_Accurate": "",  # Leave blank for user input
-                "Amount_not_Disbursed": f"R {amount_not_disbursed:.2f}",
-                "Verified_Percentage": "0.00%",  # Will be calculated when user inputs amount verified as accurate
-                "Affected_Employees": "",  # Leave blank for user input
-                
-                # Amount Claimed fields (from monthly_claims)
-                "April_2020_Indicate_NA_where_no_claim_": monthly_claims["April_2020"],
-                "May_2020": monthly_claims["May_2020"],
-                "June_2020": monthly_claims["June_2020"],
-                "July_2020": monthly_claims["July_2020"],
-                "Aug_2020": monthly_claims["Aug_2020"],
-                "Sep_2020": monthly_claims["Sep_2020"],
-                "Oct_2020": monthly_claims["Oct_2020"],
-                "Nov_2020": monthly_claims["Nov_2020"],
-                "Dec_2020": monthly_claims["Dec_2020"],
-                "Jan_2021": monthly_claims["Jan_2021"],
-                "Feb_2021": monthly_claims["Feb_2021"],
-                "Mar_2021": monthly_claims["Mar_2021"],
-                "Apr_2021": monthly_claims["Apr_2021"],
-                "May_2021": monthly_claims["May_2021"],
-                "Jun_2021": monthly_claims["Jun_2021"],
-                "July_2021": monthly_claims["July_2021"],
-                
-                # Amount paid to beneficiaries fields (from monthly_payments)
-                "April_2020_Indicate_NA_where_no_paymen": monthly_payments["April_2020"]["value"],
-                "May_20201": monthly_payments["May_2020"]["value"],
-                "June_20201": monthly_payments["June_2020"]["value"],
-                "July_20201": monthly_payments["July_2020"]["value"],
-                "Aug_20201": monthly_payments["Aug_2020"]["value"],
-                "Sep_20201": monthly_payments["Sep_2020"]["value"],
-                "Oct_20201": monthly_payments["Oct_2020"]["value"],
-                "Nov_20201": monthly_payments["Nov_2020"]["value"],
-                "Dec_20201": monthly_payments["Dec_2020"]["value"],
-                "Jan_20211": monthly_payments["Jan_2021"]["value"],
-                "Feb_20211": monthly_payments["Feb_2021"]["value"],
-                "Mar_20211": monthly_payments["Mar_2021"]["value"],
-                "Apr_20211": monthly_payments["Apr_2021"]["value"],
-                "May_20211": monthly_payments["May_2021"]["value"],
-                "Jun_20211": monthly_payments["Jun_2021"]["value"],
-                "July_20211": monthly_payments["July_2021"]["value"]
-            })
+
+            # Populate form_data with company details, financials and monthly claims/payments
+            st.session_state.form_data.update(datafile_form_fields(summary, auto_address, auto_province))
             
             st.session_state.file_processed = True
-            # Bump widget version to force widget keys to refresh and take new defaults
+            # Bump widget version to force widget keys to refresh and take new defaults; the form
+            # sections and the progress are drawn below, so this same run already shows the data
             st.session_state.widget_version += 1
-            st.rerun()
             st.session_state.monthly_payments_saved = False  # Reset monthly payments saved status
             # Update progress tracking after file upload
             update_completion_status()
             st.sidebar.success("DataFile uploaded and all fields populated successfully!")
             
         except Exception as e:
+            diagnostics.error("Error processing %s: %r", uploaded_file.name, e)
             st.sidebar.error(f"Error processing file: {str(e)}")
             st.session_state.file_processed = False
 
-# Clear form button
-if st.sidebar.button("Clear Form"):
-    st.session_state.button_data = {
-        "main_findings": "",
-        "limitation_of_scope": "",
-        "compliance_comments": "",
-        "overall_outcomes": "",
-        "payment_verification_scope": "",
-        "employment_verification_scope": "",
-        "claims_validity_scope": "",
-        "objective_1_comment": "",
-        "objective_2_comment": "",
-        "objective_3_comment": "",
-        "objective_4_comment": "",
-        "objective_5_comment": ""
-    }
-    st.session_state.saved = {
-        "main_findings": False,
-        "limitation_of_scope": False,
-        "compliance_comments": False,
-        "overall_outcomes": False,
-        "payment_verification_scope": False,
-        "employment_verification_scope": False,
-        "claims_validity_scope": False,
-        "objective_1_comment": False,
-        "objective_2_comment": False,
-        "objective_3_comment": False,
-        "objective_4_comment": False,
-        "objective_5_comment": False
-    }
-    st.session_state.form_data = {}
-    st.session_state.findings = [
-        {
-            "description": "IRP5s, ID Copies and Employment contracts for the all the beneficiaries were not provided",
-            "rating": "Critical",
-            "page_ref": "TP.2"
-        },
-        {
-            "description": "The employer did not provide all the required bank statements detailing the funds they received from UIF.",
-            "rating": "Critical", 
-            "page_ref": "TP.3"
-        },
-        {
-            "description": "No payroll data or EMP501/201 documents were provided to confirm the employer's monthly UIF contributions/declarations.",
-            "rating": "Critical",
-            "page_ref": "TP.4"
-        }
-    ]
+# Sidebar: leveled diagnostics and timing spans in one table (shown only when DIAGNOSTICS_LEVEL is set)
+if st.session_state.diagnostics.enabled:
+    with st.sidebar.expander("🩺 Diagnostics"):
+        diagnostic_entries = st.session_state.diagnostics.entries()
+        if diagnostic_entries:
+            st.dataframe(
+                [
+                    {
+                        "time": datetime.fromtimestamp(entry["at"]).strftime("%H:%M:%S"),
+                        "level": entry["level"],
+                        "message": entry["message"],
+                        "ms": round(entry["seconds"] * 1000, 1) if entry["seconds"] is not None else None,
+                    }
+                    for entry in reversed(diagnostic_entries)
+                ],
+                hide_index=True,
+                use_container_width=True,
+            )
+            st.button("Clear Diagnostics", key="clear_diagnostics", on_click=st.session_state.diagnostics.clear)
+        else:
+            st.caption("No diagnostics recorded yet.")
+
+# Clear form button (a callback, so the run it triggers already starts from the empty form)
+def clear_form():
+    st.session_state.button_data = tracked_button_data({section: "" for section in HELPER_SECTIONS})
+    st.session_state.saved = {section: False for section in HELPER_SECTIONS}
+    st.session_state.helper_templates = {section: "" for section in HELPER_SECTIONS}
+    for section in HELPER_SECTIONS:
+        st.session_state.pop(helper_input_key(section), None)
+    st.session_state.form_data = tracked_form_data()
+    st.session_state.findings = [dict(finding) for finding in DEFAULT_FINDINGS]
     st.session_state.output_path = None
+    st.session_state.report_bytes = None
+    st.session_state.report_job_id = None
+    st.session_state.report_notices = []
     st.session_state.validation_errors = []
     st.session_state.file_processed = False
     st.session_state.current_file_name = None
     st.session_state.file_uploader_key += 1
-    # Update progress tracking after clearing form
-    update_completion_status()
-    st.rerun()
-
-# Functions to append text to each form's input
-def add_main_findings_positive():
-    """Add positive finding (underpayments) - replaces existing content with single finding"""
-    st.session_state.button_data["main_findings"] = get_finding_text("main_findings", "finding_1", st.session_state.form_data)
-    # Sync widget state so text_area reflects programmatic change
-    st.session_state["main_findings_input"] = st.session_state.button_data["main_findings"]
-    st.rerun()
-
-def add_main_findings_negative():
-    """Add negative finding (ineligible employees) - replaces existing content with single finding"""
-    st.session_state.button_data["main_findings"] = get_finding_text("main_findings", "finding_2", st.session_state.form_data)
-    st.session_state["main_findings_input"] = st.session_state.button_data["main_findings"]
-    st.rerun()
-
-def add_limitation_1():
-    st.session_state.button_data["limitation_of_scope"] += get_finding_text("limitations", "limitation_1") + "\n"
-    st.session_state["limitation_input"] = st.session_state.button_data["limitation_of_scope"]
-    st.rerun()
-
-def add_limitation_2():
-    st.session_state.button_data["limitation_of_scope"] += get_finding_text("limitations", "limitation_2") + "\n"
-    st.session_state["limitation_input"] = st.session_state.button_data["limitation_of_scope"]
-    st.rerun()
-
-def add_limitation_3():
-    st.session_state.button_data["limitation_of_scope"] += get_finding_text("limitations", "limitation_3") + "\n"
-    st.session_state["limitation_input"] = st.session_state.button_data["limitation_of_scope"]
-    st.rerun()
-
-def add_limitation_4():
-    st.session_state.button_data["limitation_of_scope"] += get_finding_text("limitations", "limitation_4") + "\n"
-    st.session_state["limitation_input"] = st.session_state.button_data["limitation_of_scope"]
-    st.rerun()
-
-def add_compliance_yes():
-    st.session_state.button_data["compliance_comments"] += get_compliance_text("ui_act_compliance", "yes") + "\n"
-    # Update progress tracking
-    update_completion_status()
-    st.session_state["compliance_input"] = st.session_state.button_data["compliance_comments"]
-    st.rerun()
-
-def add_compliance_no():
-    st.session_state.button_data["compliance_comments"] += get_compliance_text("ui_act_compliance", "no") + "\n"
-    # Update progress tracking
-    update_completion_status()
-    st.session_state["compliance_input"] = st.session_state.button_data["compliance_comments"]
-    st.rerun()
-
-def add_overall_outcomes_positive():
-    st.session_state.button_data["overall_outcomes"] += get_overall_outcome_text("positive", "payment_accuracy", st.session_state.form_data) + "\n"
-    st.session_state.button_data["overall_outcomes"] += get_overall_outcome_text("positive", "employment_verification", st.session_state.form_data) + "\n"
-    st.session_state.button_data["overall_outcomes"] += get_overall_outcome_text("positive", "documentation", st.session_state.form_data) + "\n"
-    # Update progress tracking
-    update_completion_status()
-    st.session_state["overall_outcomes_input"] = st.session_state.button_data["overall_outcomes"]
-    st.rerun()
-
-def add_overall_outcomes_negative():
-    st.session_state.button_data["overall_outcomes"] += get_overall_outcome_text("negative", "payment_accuracy", st.session_state.form_data) + "\n"
-    st.session_state.button_data["overall_outcomes"] += get_overall_outcome_text("negative", "employment_verification", st.session_state.form_data) + "\n"
-    st.session_state.button_data["overall_outcomes"] += get_overall_outcome_text("negative", "documentation", st.session_state.form_data) + "\n"
-    # Update progress tracking
-    update_completion_status()
-    st.session_state["overall_outcomes_input"] = st.session_state.button_data["overall_outcomes"]
-    st.rerun()
-
-def refresh_overall_outcomes():
-    """Refresh the overall outcomes text with current form data for template variable substitution"""
-    current_text = st.session_state.button_data.get("overall_outcomes", "")
-    if current_text:
-        # Apply template substitution to existing text
-        refreshed_text = substitute_template_variables(current_text, st.session_state.form_data)
-        st.session_state.button_data["overall_outcomes"] = refreshed_text
-
-def refresh_main_findings():
-    """Refresh the main findings text with current form data for template variable substitution"""
-    current_text = st.session_state.button_data.get("main_findings", "")
-    if current_text:
-        # Apply template substitution to existing text
-        refreshed_text = substitute_template_variables(current_text, st.session_state.form_data)
-        st.session_state.button_data["main_findings"] = refreshed_text
-
-
-
-def add_claims_validity_yes():
-    st.session_state.button_data["claims_validity_scope"] += get_verification_scope_text("claims_validity", "yes", form_data=st.session_state.form_data) + "\n"
-    # Update progress tracking
-    update_completion_status()
-    st.session_state["claims_validity_input"] = st.session_state.button_data["claims_validity_scope"]
-    st.rerun()
-
-def add_claims_validity_no():
-    st.session_state.button_data["claims_validity_scope"] += get_verification_scope_text("claims_validity", "no", form_data=st.session_state.form_data) + "\n"
-    # Update progress tracking
-    update_completion_status()
-    st.session_state["claims_validity_input"] = st.session_state.button_data["claims_validity_scope"]
-    st.rerun()
-
-def add_objective_1_yes():
-    st.session_state.button_data["objective_1_comment"] += get_objective_text("objective_1_employer_exists", "yes") + "\n"
-    # Update progress tracking
-    update_completion_status()
-    st.session_state["objective_1_input"] = st.session_state.button_data["objective_1_comment"]
-    st.rerun()
-
-def add_objective_1_no():
-    st.session_state.button_data["objective_1_comment"] += get_objective_text("objective_1_employer_exists", "no") + "\n"
-    # Update progress tracking
-    update_completion_status()
-    st.session_state["objective_1_input"] = st.session_state.button_data["objective_1_comment"]
-    st.rerun()
-
-def add_objective_2_yes():
-    st.session_state.button_data["objective_2_comment"] += get_objective_text("objective_2_employee_validity", "yes") + "\n"
-    # Update progress tracking
-    update_completion_status()
-    st.session_state["objective_2_input"] = st.session_state.button_data["objective_2_comment"]
-    st.rerun()
-
-def add_objective_2_no():
-    st.session_state.button_data["objective_2_comment"] += get_objective_text("objective_2_employee_validity", "no") + "\n"
-    # Update progress tracking
-    update_completion_status()
-    st.session_state["objective_2_input"] = st.session_state.button_data["objective_2_comment"]
-    st.rerun()
-
-def add_objective_3_yes():
-    st.session_state.button_data["objective_3_comment"] += get_objective_text("objective_3_payment_accuracy", "yes") + "\n"
-    # Update progress tracking
-    update_completion_status()
-    st.session_state["objective_3_input"] = st.session_state.button_data["objective_3_comment"]
-    st.rerun()
-
-def add_objective_3_no():
-    st.session_state.button_data["objective_3_comment"] += get_objective_text("objective_3_payment_accuracy", "no") + "\n"
-    # Update progress tracking
-    update_completion_status()
-    st.session_state["objective_3_input"] = st.session_state.button_data["objective_3_comment"]
-    st.rerun()
 
-def add_objective_4_yes():
-    st.session_state.button_data["objective_4_comment"] += get_objective_text("objective_4_funds_reached_beneficiaries", "yes") + "\n"
-    # Update progress tracking
-    update_completion_status()
-    st.session_state["objective_4_input"] = st.session_state.button_data["objective_4_comment"]
-    st.rerun()
+st.sidebar.button("Clear Form", on_click=clear_form)
 
-def add_objective_4_no():
-    st.session_state.button_data["objective_4_comment"] += get_objective_text("objective_4_funds_reached_beneficiaries", "no") + "\n"
-    # Update progress tracking
-    update_completion_status()
-    st.session_state["objective_4_input"] = st.session_state.button_data["objective_4_comment"]
-    st.rerun()
-
-def add_objective_5_yes():
-    st.session_state.button_data["objective_5_comment"] += get_objective_text("objective_5_information_validity", "yes") + "\n"
-    # Update progress tracking
-    update_completion_status()
-    st.session_state["objective_5_input"] = st.session_state.button_data["objective_5_comment"]
-    st.rerun()
-
-def add_objective_5_no():
-    st.session_state.button_data["objective_5_comment"] += get_objective_text("objective_5_information_validity", "no") + "\n"
-    # Update progress tracking
-    update_completion_status()
-    st.session_state["objective_5_input"] = st.session_state.button_data["objective_5_comment"]
-    st.rerun()
-    # Update progress tracking
-    update_completion_status()
-    st.session_state["objective_5_input"] = st.session_state.button_data["objective_5_comment"]
-    st.rerun()
+with progress_area:
+    progress_panel()
 
 # Function to auto-calculate financial fields (from original app.py)
 def auto_calculate_financials(amount_verified_accurate):
@@ -1172,247 +524,402 @@ def auto_calculate_financials(amount_verified_accurate):
         return False
     return False
 
-# ============================================================================
-# SECTION 1: COMPANY DETAILS
-# ============================================================================
-st.header("Company Details")
-wv = st.session_state.get('widget_version', 0)
-st.info("**Basic company information and details about the employer applying for TERS funds.**")
+# Form sections run as fragments: a click or edit inside a section reruns only that section,
+# not the sidebar, the upload handling and every other form on the page
+# Page and section runs kept for the server time panel
+SERVER_TIMINGS_KEPT = 50
+
+def page_run_in_progress():
+    """True while the whole page is running (False during a rerun of one or more sections).
+
+    Read from the run's own context rather than a flag in session state, so a run that ends
+    early (st.stop(), st.rerun() or an exception) cannot leave later section reruns looking
+    like page runs.
+    """
+    ctx = get_script_run_ctx()
+    return not (ctx is not None and ctx.fragment_ids_this_run)
+
+def record_server_time(scope, started):
+    """Keep how long this run of the page or of one section took, for the server time panel"""
+    st.session_state.server_timings = (
+        st.session_state.server_timings + [{"scope": scope, "seconds": time.perf_counter() - started}]
+    )[-SERVER_TIMINGS_KEPT:]
+    st.session_state.run_counts["page" if scope == "page" else "section"] += 1
+
+def rerun_page():
+    """Rerun the whole page; counted as an extra run, since no interaction asked for it"""
+    st.session_state.run_counts["extra"] += 1
+    st.rerun()
 
-with st.form(key="form_company_details"):
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        st.markdown("📝 **Name of Employer** (requires input)")
-        name_of_employer = st.text_input(
-            "Name of Employer", 
-            value=st.session_state.form_data.get("Name_of_Employer", ""),
-            key=f"name_of_employer_input_{wv}"
-        )
-        
-        st.markdown("📝 **UIF Registration Number** (requires input)")
-        uif_reg_number = st.text_input(
-            "UIF Registration Number", 
-            value=st.session_state.form_data.get("UIF_REG_Number", ""),
-            key=f"uif_reg_number_input_{wv}"
-        )
-        
-        st.markdown("📝 **Period Claimed For / Lockdown Period** (requires input)")
-        lockdown_period = st.text_input(
-            "Period Claimed For / Lockdown Period", 
-            value=st.session_state.form_data.get("Period_Claimed_For_Lockdown_Period", ""),
-            key=f"lockdown_period_input_{wv}"
-        )
-        
-        # Check if address was auto-populated
-        current_address = st.session_state.form_data.get("Location_Type_address_in_full", "")
-        address_auto_populated = bool(current_address and current_address.strip())
-        
-        if address_auto_populated:
-            st.markdown("📍 **Location (Full Address)** (auto-populated from address book - editable)")
-            st.info(f"✅ Auto-populated from address book for UIF {st.session_state.form_data.get('UIF_REG_Number', '')}")
-        else:
-            st.markdown("📝 **Location (Full Address)** (requires input)")
-        
-        location = st.text_input(
-            "Location (Full Address)", 
-            value=current_address,
-            key=f"location_input_{wv}",
-            help="This field is automatically populated from the address book when a data file is uploaded, but you can edit it if needed."
-        )
-    
-    with col2:
-        # Check if province was auto-populated
-        current_province = st.session_state.form_data.get("Province", "")
-        province_auto_populated = bool(current_province and current_province.strip())
-        
-        if province_auto_populated:
-            st.markdown("📍 **Province** (auto-populated from address book - editable)")
-            st.info(f"✅ Auto-populated from address book for UIF {st.session_state.form_data.get('UIF_REG_Number', '')}")
-        else:
-            st.markdown("📝 **Province** (requires input)")
-        
-        province_options = [
-            "",
-            "Eastern Cape",
-            "Free State", 
-            "Gauteng",
-            "KwaZulu-Natal",
-            "Limpopo",
-            "Mpumalanga",
-            "Northern Cape",
-            "North West",
-            "Western Cape"
-        ]
-        province = st.selectbox(
-            "Province", 
-            province_options, 
-            index=province_options.index(current_province) if current_province in province_options else 0,
-            key=f"province_input_{wv}",
-            help="This field is automatically populated from the address book when a data file is uploaded, but you can edit it if needed."
-        )
-        
-        st.markdown("📝 **Industry** (requires input)")
-        industry = st.text_input(
-            "Industry", 
-            value=st.session_state.form_data.get("Industry", ""),
-            key=f"industry_input_{wv}"
-        )
-        
-        st.markdown("📝 **Number of Employees** (requires input)")
-        number_of_employees = st.text_input(
-            "Number of Employees", 
-            value=st.session_state.form_data.get("Number_of_Employees", ""),
-            key=f"number_of_employees_input_{wv}"
-        )
-    
-    col_save_company, col_indicator_company = st.columns([3, 1])
-    with col_save_company:
-        if st.form_submit_button("Save Company Details"):
-            st.session_state.form_data.update({
-                "Name_of_Employer": name_of_employer,
-                "UIF_REG_Number": uif_reg_number,
-                "Period_Claimed_For_Lockdown_Period": lockdown_period,
-                "Location_Type_address_in_full": location,
-                "Province": province,
-                "Industry": industry,
-                "Number_of_Employees": number_of_employees
-            })
-            # Auto-refresh overall outcomes if they exist
-            if st.session_state.button_data.get("overall_outcomes"):
-                refresh_overall_outcomes()
-            # Auto-refresh main findings if they exist
-            if st.session_state.button_data.get("main_findings"):
-                refresh_main_findings()
-            # Update progress tracking
-            update_completion_status()
-            st.success("Company details saved!")
-    with col_indicator_company:
-        if all([
-            st.session_state.form_data.get("Name_of_Employer", ""),
-            st.session_state.form_data.get("UIF_REG_Number", ""),
-            st.session_state.form_data.get("Location_Type_address_in_full", ""),
-            st.session_state.form_data.get("Period_Claimed_For_Lockdown_Period", "")
-        ]):
-            st.success("(Saved)")
+def rerun_changed(section, *changed_sections):
+    """From a callback in section: rerun it together with whatever else the callback changed.
+
+    The sidebar progress is included when the form's completion moved, as are changed_sections
+    (other sections whose text the callback rewrote). With neither, the section's own rerun is
+    left as it is. Either way the interaction costs one script run.
+    """
+    update_completion_status()
+    keys = list(changed_sections)
+    if st.session_state.form_data["completion_status"] != st.session_state.get("progress_shown"):
+        keys.insert(0, "progress_panel")
+    if keys:
+        st.rerun([key for key in keys if key != section] + [section])
+
+def form_section(key):
+    """Decorator running a form section as its own fragment (see st.fragment) with its reruns timed.
+
+    Callbacks keep the sidebar progress current (see rerun_changed); when code in a section rerun
+    still changes the form's completion, the page reruns once to bring the sidebar up to date.
+    """
+    def decorate(section):
+        @functools.wraps(section)
+        def run_section():
+            section_rerun = not page_run_in_progress()
+            started = time.perf_counter()
+            section()
+            if section_rerun:
+                record_server_time(key, started)
+                update_completion_status()
+                if st.session_state.form_data["completion_status"] != st.session_state.get("progress_shown"):
+                    rerun_page()
+        return st.fragment(run_section, key=key)
+    return decorate
+
+# Helper-text sections (HELPER_SECTIONS): every button, refresh and save is a callback, so a
+# click costs the single rerun of its section instead of a rerun plus an st.rerun()
+def helper_input_key(section):
+    """Widget key of a helper section's text area"""
+    return f"{section}_input"
+
+def set_helper_text(section, text):
+    """Set a helper section's text and its text area (widget state is synced before it is drawn)"""
+    st.session_state.button_data[section] = text
+    st.session_state[helper_input_key(section)] = text
+
+def refresh_helper_text(section):
+    """Substitute the current form data into a section's text. Returns True when the text changed"""
+    current_text = st.session_state.button_data.get(section, "")
+    refreshed_text = substitute_template_variables(current_text, st.session_state.form_data)
+    if refreshed_text == current_text:
+        return False
+    set_helper_text(section, refreshed_text)
+    return True
+
+def refresh_texts_using_form_data():
+    """After company details or financials change: refresh the sections whose texts use them"""
+    return [section for section in ("overall_outcomes", "main_findings") if refresh_helper_text(section)]
+
+def add_helper_text(section, entry):
+    """on_click of a helper button: add the entry's text as a new line (replace "replace" sections).
+
+    The text is filled in with the form data; helper_templates keeps it with its {{variables}}, so
+    batch reports can fill it in for each employer instead.
+    """
+    text = get_section_text(section, entry, st.session_state.form_data)
+    template = get_section_text(section, entry)
+    if not HELPER_SECTIONS[section].get("replace"):
+        text = st.session_state.button_data[section] + text + "\n"
+        template = st.session_state.helper_templates[section] + template + "\n"
+    set_helper_text(section, text)
+    st.session_state.helper_templates[section] = template
+    rerun_changed(section)
+
+def refresh_helper_section(section):
+    """on_click of a section's refresh button"""
+    refresh_helper_text(section)
+    rerun_changed(section)
+
+def save_helper_text(section):
+    """on_click of a section's save button: keep the submitted text area (an edited text is used
+    as typed in batch reports too)"""
+    text = st.session_state[helper_input_key(section)]
+    if text != st.session_state.button_data[section]:
+        st.session_state.helper_templates[section] = text
+    st.session_state.button_data[section] = text
+    st.session_state.saved[section] = True
+    rerun_changed(section)
+
+def helper_text_section(section):
+    """Draw one HELPER_SECTIONS section: its buttons and the text area they fill"""
+    config = HELPER_SECTIONS[section]
+    name = config["name"]
+    input_key = helper_input_key(section)
+    st.header(config["title"])
+    st.info(config["description"])
+
+    if "refresh" in config:
+        refresh_key, refresh_label = config["refresh"]
+        if st.button(refresh_label, key=refresh_key, use_container_width=True,
+                     on_click=refresh_helper_section, args=(section,)):
+            st.success(f"{name.capitalize()} refreshed with current form data!")
+
+    # Button columns with consistent styling - full width and evenly distributed
+    for column, (heading, buttons) in zip(st.columns(len(config["columns"])), config["columns"]):
+        with column:
+            if heading:
+                st.write(heading)
+            for button_key, label, entry in buttons:
+                st.button(label, key=button_key, use_container_width=True,
+                          on_click=add_helper_text, args=(section, entry))
+
+    with st.form(key=f"form_{section}"):
+        if input_key not in st.session_state:
+            st.session_state[input_key] = st.session_state.button_data[section]
+        st.text_area(f"Edit {name}", height=120, key=input_key, placeholder=f"Enter {name.lower()} here...")
+
+        # Save button and status indicator
+        col_save, col_indicator = st.columns([3, 1])
+        with col_save:
+            if st.form_submit_button(f"💾 Save {name}", on_click=save_helper_text, args=(section,)):
+                st.success(f"{name.capitalize()} saved!")
+        with col_indicator:
+            if st.session_state.saved[section]:
+                st.success("✅ Saved")
+            else:
+                st.warning("⚠️ Unsaved")
+
+helper_sections = {
+    section: form_section(section)(functools.partial(helper_text_section, section))
+    for section in HELPER_SECTIONS
+}
 
 # ============================================================================
-# SECTION 2: FINANCIALS
+# SECTION 1: COMPANY DETAILS
 # ============================================================================
-st.header("Financials")
-st.info("**Financial verification details including amounts claimed, paid, and verification results.**")
-
-with st.form(key="form_financials"):
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        st.markdown("📝 **Total Amount Verified** (requires input)")
-        total_amount_verified = st.text_input(
-            "Total Amount Verified (e.g., R 32236.05)", 
-            value=st.session_state.form_data.get("Total_Amount_Verified", ""),
-            key=f"total_amount_verified_input_{wv}"
-        )
-        
-        st.markdown("📝 **Amount Verified as Accurate** (requires input)")
-        amount_verified_accurate = st.text_input(
-            "Amount Verified as Accurate (Sum of Monthly Amounts Paid)", 
-            value=st.session_state.form_data.get("Amount_Verified_as_Accurate", ""),
-            key=f"amount_verified_accurate_input_{wv}"
-        )
-        
-        st.markdown("📝 **Affected Employees** (requires input)")
-        affected_employees = st.text_input(
-            "Affected Employees (for underpayments)", 
-            value=st.session_state.form_data.get("Affected_Employees", ""),
-            key=f"affected_employees_input_{wv}"
-        )
-    
-    with col2:
-        st.markdown("📋 **Amount Not Disbursed** (auto-calculated)")
-        amount_not_disbursed = st.text_input(
-            "Amount Not Disbursed", 
-            value=st.session_state.form_data.get("Amount_not_Disbursed", ""),
-            disabled=True,
-            key=f"amount_not_disbursed_input_{wv}"
-        )
-        
-        # Show calculation status
-        if st.session_state.form_data.get("Amount_Verified_as_Accurate") and st.session_state.form_data.get("Total_Amount_Verified"):
-            st.info("💡 Auto-calculated based on your inputs above")
-        
-        st.markdown("📋 **Verified Percentage** (auto-calculated)")
-        verified_percentage = st.text_input(
-            "Verified Percentage", 
-            value=st.session_state.form_data.get("Verified_Percentage", ""),
-            disabled=True,
-            key=f"verified_percentage_input_{wv}"
-        )
-        
-        # Show calculation status
-        if st.session_state.form_data.get("Amount_Verified_as_Accurate") and st.session_state.form_data.get("Total_Amount_Verified"):
-            st.info("💡 Auto-calculated based on your inputs above")
-    
-    # Show real-time calculation preview
-    if total_amount_verified and amount_verified_accurate:
-        try:
-            # Extract numeric values for preview
-            total_str = total_amount_verified.replace("R ", "").replace(",", "")
-            accurate_str = amount_verified_accurate.replace("R ", "").replace(",", "")
-            
-            if total_str and accurate_str:
-                total_val = float(total_str)
-                accurate_val = float(accurate_str)
-                
-                if total_val > 0:
-                    not_disbursed = total_val - accurate_val
-                    percentage = (accurate_val / total_val) * 100
-                    
-                    st.info(f"📊 **Calculation Preview:** Amount Not Disbursed: R {not_disbursed:.2f}, Verified Percentage: {percentage:.2f}%")
-        except (ValueError, TypeError):
-            pass
-    
-    col_save_financials, col_indicator_financials = st.columns([3, 1])
-    with col_save_financials:
-        if st.form_submit_button("Save Financials"):
-            # Update form data first
-            st.session_state.form_data.update({
-                "Total_Amount_Verified": total_amount_verified,
-                "Amount_Verified_as_Accurate": amount_verified_accurate,
-                "Affected_Employees": affected_employees
-            })
-            
-            # Auto-calculate financial fields using the function
-            if auto_calculate_financials(amount_verified_accurate):
-                # Auto-refresh overall outcomes if they exist
-                if st.session_state.button_data.get("overall_outcomes"):
-                    refresh_overall_outcomes()
-                # Auto-refresh main findings if they exist
-                if st.session_state.button_data.get("main_findings"):
-                    refresh_main_findings()
-                # Update progress tracking
-                update_completion_status()
-                st.success("Financials saved and calculated!")
-                # Force a rerun to update the auto-calculated fields
-                st.rerun()
+def save_company_details(wv):
+    """on_click of Save Company Details: store the submitted fields before the section is drawn"""
+    st.session_state.form_data.update({
+        "Name_of_Employer": st.session_state[f"name_of_employer_input_{wv}"],
+        "UIF_REG_Number": st.session_state[f"uif_reg_number_input_{wv}"],
+        "Period_Claimed_For_Lockdown_Period": st.session_state[f"lockdown_period_input_{wv}"],
+        "Location_Type_address_in_full": st.session_state[f"location_input_{wv}"],
+        "Province": st.session_state[f"province_input_{wv}"],
+        "Industry": st.session_state[f"industry_input_{wv}"],
+        "Number_of_Employees": st.session_state[f"number_of_employees_input_{wv}"]
+    })
+    # Auto-refresh overall outcomes and main findings if they exist
+    rerun_changed("company_details", *refresh_texts_using_form_data())
+
+@form_section("company_details")
+def company_details_section():
+    st.header("Company Details")
+    wv = st.session_state.get('widget_version', 0)
+    st.info("**Basic company information and details about the employer applying for TERS funds.**")
+
+    with st.form(key="form_company_details"):
+        col1, col2 = st.columns(2)
+
+        with col1:
+            st.markdown("📝 **Name of Employer** (requires input)")
+            name_of_employer = st.text_input(
+                "Name of Employer", 
+                value=st.session_state.form_data.get("Name_of_Employer", ""),
+                key=f"name_of_employer_input_{wv}"
+            )
+
+            st.markdown("📝 **UIF Registration Number** (requires input)")
+            uif_reg_number = st.text_input(
+                "UIF Registration Number", 
+                value=st.session_state.form_data.get("UIF_REG_Number", ""),
+                key=f"uif_reg_number_input_{wv}"
+            )
+
+            st.markdown("📝 **Period Claimed For / Lockdown Period** (requires input)")
+            lockdown_period = st.text_input(
+                "Period Claimed For / Lockdown Period", 
+                value=st.session_state.form_data.get("Period_Claimed_For_Lockdown_Period", ""),
+                key=f"lockdown_period_input_{wv}"
+            )
+
+            # Check if address was auto-populated
+            current_address = st.session_state.form_data.get("Location_Type_address_in_full", "")
+            address_auto_populated = bool(current_address and current_address.strip())
+
+            if address_auto_populated:
+                st.markdown("📍 **Location (Full Address)** (auto-populated from address book - editable)")
+                st.info(f"✅ Auto-populated from address book for UIF {st.session_state.form_data.get('UIF_REG_Number', '')}")
             else:
-                st.warning("Could not calculate financial fields. Please ensure amounts are valid numbers.")
-                # Update progress tracking even if calculation fails
-                update_completion_status()
-                st.success("Financials saved!")
-    with col_indicator_financials:
-        if all([
-            st.session_state.form_data.get("Total_Amount_Verified", ""),
-            st.session_state.form_data.get("Amount_Verified_as_Accurate", ""),
-            st.session_state.form_data.get("Affected_Employees", "")
-        ]):
-            st.success("(Saved)")
+                st.markdown("📝 **Location (Full Address)** (requires input)")
+
+            location = st.text_input(
+                "Location (Full Address)", 
+                value=current_address,
+                key=f"location_input_{wv}",
+                help="This field is automatically populated from the address book when a data file is uploaded, but you can edit it if needed."
+            )
+
+        with col2:
+            # Check if province was auto-populated
+            current_province = st.session_state.form_data.get("Province", "")
+            province_auto_populated = bool(current_province and current_province.strip())
+
+            if province_auto_populated:
+                st.markdown("📍 **Province** (auto-populated from address book - editable)")
+                st.info(f"✅ Auto-populated from address book for UIF {st.session_state.form_data.get('UIF_REG_Number', '')}")
+            else:
+                st.markdown("📝 **Province** (requires input)")
+
+            province_options = [
+                "",
+                "Eastern Cape",
+                "Free State", 
+                "Gauteng",
+                "KwaZulu-Natal",
+                "Limpopo",
+                "Mpumalanga",
+                "Northern Cape",
+                "North West",
+                "Western Cape"
+            ]
+            province = st.selectbox(
+                "Province", 
+                province_options, 
+                index=province_options.index(current_province) if current_province in province_options else 0,
+                key=f"province_input_{wv}",
+                help="This field is automatically populated from the address book when a data file is uploaded, but you can edit it if needed."
+            )
+
+            st.markdown("📝 **Industry** (requires input)")
+            industry = st.text_input(
+                "Industry", 
+                value=st.session_state.form_data.get("Industry", ""),
+                key=f"industry_input_{wv}"
+            )
+
+            st.markdown("📝 **Number of Employees** (requires input)")
+            number_of_employees = st.text_input(
+                "Number of Employees", 
+                value=st.session_state.form_data.get("Number_of_Employees", ""),
+                key=f"number_of_employees_input_{wv}"
+            )
+
+        col_save_company, col_indicator_company = st.columns([3, 1])
+        with col_save_company:
+            if st.form_submit_button("Save Company Details", on_click=save_company_details, args=(wv,)):
+                st.success("Company details saved!")
+        with col_indicator_company:
+            if all([
+                st.session_state.form_data.get("Name_of_Employer", ""),
+                st.session_state.form_data.get("UIF_REG_Number", ""),
+                st.session_state.form_data.get("Location_Type_address_in_full", ""),
+                st.session_state.form_data.get("Period_Claimed_For_Lockdown_Period", "")
+            ]):
+                st.success("(Saved)")
+
+company_details_section()
 
 # ============================================================================
-# SECTION 3: MONTHLY CLAIMS & EMPLOYEE PAYMENTS
+# SECTION 2: FINANCIALS
 # ============================================================================
-st.header("📊 Monthly Claims & Employee Payments")
-st.info("**Monthly claims are automatically calculated from your uploaded datafile. The claimed amount (greyed out) shows what UIF paid, while the payment amount field is editable to show what the employer actually paid to employees.**")
-st.info("📊 **Progress Note**: Monthly data progress only counts months with actual claims (not N/A). Progress starts at 0% and updates to 100% only after you click 'Save All Monthly Payments' below.")
+def save_financials(wv):
+    """on_click of Save Financials: store and auto-calculate before the section is drawn, so the
+    calculated fields show without another rerun"""
+    amount_verified_accurate = st.session_state[f"amount_verified_accurate_input_{wv}"]
+    st.session_state.form_data.update({
+        "Total_Amount_Verified": st.session_state[f"total_amount_verified_input_{wv}"],
+        "Amount_Verified_as_Accurate": amount_verified_accurate,
+        "Affected_Employees": st.session_state[f"affected_employees_input_{wv}"]
+    })
+    # Auto-calculate financial fields using the function
+    st.session_state.financials_calculated = auto_calculate_financials(amount_verified_accurate)
+    changed_sections = []
+    if st.session_state.financials_calculated:
+        # Auto-refresh overall outcomes and main findings if they exist
+        changed_sections = refresh_texts_using_form_data()
+    rerun_changed("financials", *changed_sections)
+
+@form_section("financials")
+def financials_section():
+    st.header("Financials")
+    wv = st.session_state.get('widget_version', 0)
+    st.info("**Financial verification details including amounts claimed, paid, and verification results.**")
+
+    with st.form(key="form_financials"):
+        col1, col2 = st.columns(2)
+
+        with col1:
+            st.markdown("📝 **Total Amount Verified** (requires input)")
+            total_amount_verified = st.text_input(
+                "Total Amount Verified (e.g., R 32236.05)", 
+                value=st.session_state.form_data.get("Total_Amount_Verified", ""),
+                key=f"total_amount_verified_input_{wv}"
+            )
+
+            st.markdown("📝 **Amount Verified as Accurate** (requires input)")
+            amount_verified_accurate = st.text_input(
+                "Amount Verified as Accurate (Sum of Monthly Amounts Paid)", 
+                value=st.session_state.form_data.get("Amount_Verified_as_Accurate", ""),
+                key=f"amount_verified_accurate_input_{wv}"
+            )
+
+            st.markdown("📝 **Affected Employees** (requires input)")
+            affected_employees = st.text_input(
+                "Affected Employees (for underpayments)", 
+                value=st.session_state.form_data.get("Affected_Employees", ""),
+                key=f"affected_employees_input_{wv}"
+            )
+
+        with col2:
+            st.markdown("📋 **Amount Not Disbursed** (auto-calculated)")
+            amount_not_disbursed = st.text_input(
+                "Amount Not Disbursed", 
+                value=st.session_state.form_data.get("Amount_not_Disbursed", ""),
+                disabled=True,
+                key=f"amount_not_disbursed_input_{wv}"
+            )
+
+            # Show calculation status
+            if st.session_state.form_data.get("Amount_Verified_as_Accurate") and st.session_state.form_data.get("Total_Amount_Verified"):
+                st.info("💡 Auto-calculated based on your inputs above")
+
+            st.markdown("📋 **Verified Percentage** (auto-calculated)")
+            verified_percentage = st.text_input(
+                "Verified Percentage", 
+                value=st.session_state.form_data.get("Verified_Percentage", ""),
+                disabled=True,
+                key=f"verified_percentage_input_{wv}"
+            )
+
+            # Show calculation status
+            if st.session_state.form_data.get("Amount_Verified_as_Accurate") and st.session_state.form_data.get("Total_Amount_Verified"):
+                st.info("💡 Auto-calculated based on your inputs above")
+
+        # Show real-time calculation preview
+        if total_amount_verified and amount_verified_accurate:
+            try:
+                # Extract numeric values for preview
+                total_str = total_amount_verified.replace("R ", "").replace(",", "")
+                accurate_str = amount_verified_accurate.replace("R ", "").replace(",", "")
+
+                if total_str and accurate_str:
+                    total_val = float(total_str)
+                    accurate_val = float(accurate_str)
+
+                    if total_val > 0:
+                        not_disbursed = total_val - accurate_val
+                        percentage = (accurate_val / total_val) * 100
+
+                        st.info(f"📊 **Calculation Preview:** Amount Not Disbursed: R {not_disbursed:.2f}, Verified Percentage: {percentage:.2f}%")
+            except (ValueError, TypeError):
+                pass
+
+        col_save_financials, col_indicator_financials = st.columns([3, 1])
+        with col_save_financials:
+            if st.form_submit_button("Save Financials", on_click=save_financials, args=(wv,)):
+                if st.session_state.financials_calculated:
+                    st.success("Financials saved and calculated!")
+                else:
+                    st.warning("Could not calculate financial fields. Please ensure amounts are valid numbers.")
+                    st.success("Financials saved!")
+        with col_indicator_financials:
+            if all([
+                st.session_state.form_data.get("Total_Amount_Verified", ""),
+                st.session_state.form_data.get("Amount_Verified_as_Accurate", ""),
+                st.session_state.form_data.get("Affected_Employees", "")
+            ]):
+                st.success("(Saved)")
+
+financials_section()
 
 # Get active months with claims
 def get_active_months(session_state_data):
@@ -1473,900 +980,393 @@ def get_active_months(session_state_data):
     
     return active_months
 
-# Get active months with claims
-active_months = get_active_months(st.session_state.form_data)
+# ============================================================================
+# SECTION 3: MONTHLY CLAIMS & EMPLOYEE PAYMENTS
+# ============================================================================
+@form_section("monthly_payments")
+def monthly_payments_section():
+    st.header("📊 Monthly Claims & Employee Payments")
+    st.info("**Monthly claims are automatically calculated from your uploaded datafile. The claimed amount (greyed out) shows what UIF paid, while the payment amount field is editable to show what the employer actually paid to employees.**")
+    st.info("📊 **Progress Note**: Monthly data progress only counts months with actual claims (not N/A). Progress starts at 0% and updates to 100% only after you click 'Save All Monthly Payments' below.")
 
-if not active_months:
-    st.warning("⚠️ No monthly claims found. Please upload a datafile with claim information.")
-else:
-    st.success(f"✅ Found {len(active_months)} month(s) with claims")
-    st.info("💡 **Tip**: Payment amounts are auto-populated with claim amounts since employers typically pay employees what they received from UIF. You can adjust if needed.**")
-    
-    # Create a container for better organization
-    with st.container():
-        # Implementation pattern for monthly sections with perfect alignment
-        for month_data in active_months:
-            with st.expander(f"📅 {month_data['name']}", expanded=True):
-                # Create a clean row layout with both values side by side
-                col1, col2 = st.columns([1, 1])
-                
-                with col1:
-                    st.write("💰 **Amount Claimed from UIF:**")
-                    # Show claimed amount as read-only (greyed out)
-                    st.text_input(
-                        "Claimed Amount",
-                        value=month_data['claim_amount'],
-                        disabled=True,
-                        key=f"claimed_{month_data['claim_key']}",
-                        label_visibility="collapsed"
-                    )
-                
-                with col2:
-                    st.write("💳 **Payment to Employees:**")
-                    # Editable payment amount field
-                    current_payment = st.session_state.form_data.get(month_data['payment_key'], "")
-                    if not current_payment or current_payment == "":
-                        # Auto-populate with claim amount if empty
-                        claim_amount_clean = month_data['claim_amount'].replace("R ", "").replace(",", "")
-                        st.session_state.form_data[month_data['payment_key']] = f"R {claim_amount_clean}"
-                        current_payment = f"R {claim_amount_clean}"
-                    
-                    payment_amount = st.text_input(
-                        "Payment Amount",
-                        value=current_payment,
-                        key=f"payment_{month_data['payment_key']}",
-                        label_visibility="collapsed",
-                        placeholder="Enter payment amount..."
-                    )
-                    # Store the payment amount
-                    st.session_state.form_data[month_data['payment_key']] = payment_amount
-    
-    # Single save button for all monthly payments with improved styling
-    if active_months:
-        st.markdown("---")
-        
-        # Progress indicator
-        if st.session_state.get('monthly_payments_saved', False):
-            st.success("✅ Monthly payments have been saved - progress updated!")
-        else:
-            st.info("💡 **Click 'Save All Monthly Payments' below to update your form completion progress**")
-        
-        # Show current progress info
-        total_monthly_fields = count_total_fields('monthly_data')
-        if total_monthly_fields > 0:
-            st.info(f"📊 **Progress Info**: {len(active_months)} month(s) with claims found. Progress will be calculated based on actual claim months only.")
-        
-        # Full width save button
-        if st.button("💾 Save All Monthly Payments", key="save_all_monthly_payments", type="primary", use_container_width=True):
-            # Save all payment amounts
+    # Get active months with claims
+    active_months = get_active_months(st.session_state.form_data)
+
+    if not active_months:
+        st.warning("⚠️ No monthly claims found. Please upload a datafile with claim information.")
+    else:
+        st.success(f"✅ Found {len(active_months)} month(s) with claims")
+        st.info("💡 **Tip**: Payment amounts are auto-populated with claim amounts since employers typically pay employees what they received from UIF. You can adjust if needed.**")
+
+        # Create a container for better organization
+        with st.container():
+            # Implementation pattern for monthly sections with perfect alignment
             for month_data in active_months:
-                payment_key = month_data['payment_key']
-                payment_amount = st.session_state.form_data.get(payment_key, "")
-                st.session_state.form_data[payment_key] = payment_amount
-            
-            # Mark monthly payments as saved and update progress
-            st.session_state.monthly_payments_saved = True
-            update_completion_status()
-            
-            st.success(f"✅ All {len(active_months)} monthly payments saved successfully!")
-        
-        # Status indicator
-        all_saved = all(
-            st.session_state.form_data.get(month_data['payment_key'], "") and 
-            st.session_state.form_data.get(month_data['payment_key'], "") != ""
-            for month_data in active_months
-        )
-        
-        if all_saved:
-            st.success("✅ All Monthly Payments Saved")
-        else:
-            st.warning("⚠️ Some payments not saved")
+                with st.expander(f"📅 {month_data['name']}", expanded=True):
+                    # Create a clean row layout with both values side by side
+                    col1, col2 = st.columns([1, 1])
+
+                    with col1:
+                        st.write("💰 **Amount Claimed from UIF:**")
+                        # Show claimed amount as read-only (greyed out)
+                        st.text_input(
+                            "Claimed Amount",
+                            value=month_data['claim_amount'],
+                            disabled=True,
+                            key=f"claimed_{month_data['claim_key']}",
+                            label_visibility="collapsed"
+                        )
+
+                    with col2:
+                        st.write("💳 **Payment to Employees:**")
+                        # Editable payment amount field
+                        current_payment = st.session_state.form_data.get(month_data['payment_key'], "")
+                        if not current_payment or current_payment == "":
+                            # Auto-populate with claim amount if empty
+                            claim_amount_clean = month_data['claim_amount'].replace("R ", "").replace(",", "")
+                            st.session_state.form_data[month_data['payment_key']] = f"R {claim_amount_clean}"
+                            current_payment = f"R {claim_amount_clean}"
+
+                        payment_amount = st.text_input(
+                            "Payment Amount",
+                            value=current_payment,
+                            key=f"payment_{month_data['payment_key']}",
+                            label_visibility="collapsed",
+                            placeholder="Enter payment amount..."
+                        )
+                        # Store the payment amount
+                        st.session_state.form_data[month_data['payment_key']] = payment_amount
+
+        # Single save button for all monthly payments with improved styling
+        if active_months:
+            st.markdown("---")
+
+            # Progress indicator
+            if st.session_state.get('monthly_payments_saved', False):
+                st.success("✅ Monthly payments have been saved - progress updated!")
+            else:
+                st.info("💡 **Click 'Save All Monthly Payments' below to update your form completion progress**")
+
+            # Show current progress info
+            total_monthly_fields = count_total_fields('monthly_data')
+            if total_monthly_fields > 0:
+                st.info(f"📊 **Progress Info**: {len(active_months)} month(s) with claims found. Progress will be calculated based on actual claim months only.")
+
+            # Full width save button
+            if st.button("💾 Save All Monthly Payments", key="save_all_monthly_payments", type="primary", use_container_width=True):
+                # Save all payment amounts
+                for month_data in active_months:
+                    payment_key = month_data['payment_key']
+                    payment_amount = st.session_state.form_data.get(payment_key, "")
+                    st.session_state.form_data[payment_key] = payment_amount
+
+                # Mark monthly payments as saved and update progress
+                st.session_state.monthly_payments_saved = True
+                update_completion_status()
 
-# ============================================================================
-# SECTION 4: MAIN FINDINGS (Button Approach)
-# ============================================================================
-st.header("🔍 Main Findings")
-st.info("**Documents the key findings and issues discovered during the verification process.**")
+                st.success(f"✅ All {len(active_months)} monthly payments saved successfully!")
 
-# Add refresh button for main findings
-if st.button("🔄 Refresh Main Findings with Current Form Data", key="refresh_main_findings", use_container_width=True):
-    refresh_main_findings()
-    # Update progress tracking
-    update_completion_status()
-    st.success("Main findings refreshed with current form data!")
-    st.rerun()
+            # Status indicator
+            all_saved = all(
+                st.session_state.form_data.get(month_data['payment_key'], "") and 
+                st.session_state.form_data.get(month_data['payment_key'], "") != ""
+                for month_data in active_months
+            )
 
-# Button row with consistent styling - full width and evenly distributed
-col1, col2 = st.columns(2)
-with col1:
-    if st.button("💰 Underpayments", key="pos_finding", use_container_width=True):
-        add_main_findings_positive()
-        # Update progress tracking
-        update_completion_status()
-with col2:
-    if st.button("👥 Ineligible Employee(s)", key="neg_finding", use_container_width=True):
-        add_main_findings_negative()
-        # Update progress tracking
-        update_completion_status()
-
-with st.form(key="form_main_findings"):
-    if "main_findings_input" not in st.session_state:
-        st.session_state["main_findings_input"] = st.session_state.button_data["main_findings"]
-    st.session_state.button_data["main_findings"] = st.text_area(
-        "Edit Main Findings",
-        height=120,
-        key="main_findings_input",
-        placeholder="Enter your main findings here..."
-    )
-    
-    # Save button and status indicator
-    col_save1, col_indicator1 = st.columns([3, 1])
-    with col_save1:
-        if st.form_submit_button("💾 Save Main Findings"):
-            st.session_state.saved['main_findings'] = True
-            # Update progress tracking
-            update_completion_status()
-            st.success("Main findings saved!")
-    with col_indicator1:
-        if st.session_state.saved["main_findings"]:
-            st.success("✅ Saved")
-        else:
-            st.warning("⚠️ Unsaved")
+            if all_saved:
+                st.success("✅ All Monthly Payments Saved")
+            else:
+                st.warning("⚠️ Some payments not saved")
+
+monthly_payments_section()
 
-# Live preview section removed for cleaner interface
+# ============================================================================
+# SECTION 4: MAIN FINDINGS (Button Approach)
+# ============================================================================
+helper_sections["main_findings"]()
 
 # ============================================================================
 # SECTION 5: LIMITATION OF SCOPE (Button Approach)
 # ============================================================================
-st.header("⚠️ Limitation of Scope")
-st.info("**Documents any limitations or constraints that prevented complete verification of certain aspects.**")
-
-# Button row with consistent styling - full width and evenly distributed
-col3, col4, col5, col6 = st.columns(4)
-with col3:
-    if st.button("📋 No Bank Statements", key="lim1", use_container_width=True):
-        add_limitation_1()
-        # Update progress tracking
-        update_completion_status()
-with col4:
-    if st.button("📋 No Contracts/IRP5s/IDs", key="lim2", use_container_width=True):
-        add_limitation_2()
-        # Update progress tracking
-        update_completion_status()
-with col5:
-    if st.button("📋 No Payroll/Payslips", key="lim3", use_container_width=True):
-        add_limitation_3()
-        # Update progress tracking
-        update_completion_status()
-with col6:
-    if st.button("📋 No EMP501/201", key="lim4", use_container_width=True):
-        add_limitation_4()
-        # Update progress tracking
-        update_completion_status()
-
-with st.form(key="form_limitation"):
-    if "limitation_input" not in st.session_state:
-        st.session_state["limitation_input"] = st.session_state.button_data["limitation_of_scope"]
-    st.session_state.button_data["limitation_of_scope"] = st.text_area(
-        "Edit Limitation of Scope",
-        height=120,
-        key="limitation_input",
-        placeholder="Enter limitations of scope here..."
-    )
-    
-    # Save button and status indicator
-    col_save2, col_indicator2 = st.columns([3, 1])
-    with col_save2:
-        if st.form_submit_button("💾 Save Limitation of Scope"):
-            st.session_state.saved['limitation_of_scope'] = True
-            # Update progress tracking
-            update_completion_status()
-            st.success("Limitation of scope saved!")
-    with col_indicator2:
-        if st.session_state.saved["limitation_of_scope"]:
-            st.success("✅ Saved")
-        else:
-            st.warning("⚠️ Unsaved")
+helper_sections["limitation_of_scope"]()
 
 # ============================================================================
 # SECTION 6: INDIVIDUAL FINDINGS
 # ============================================================================
-st.header("📋 Individual Findings")
-st.info("**Document specific findings with ratings and page references for detailed reporting.**")
-
-# Individual findings management - each finding has its own remove button
-
-# Display findings with improved styling
-for i, finding in enumerate(st.session_state.findings):
-    # Define specific headings for the first 3 findings
-    if i == 0:
-        heading = "🔍 No IRP5s/IDs/Contracts"
-    elif i == 1:
-        heading = "🔍 No Bank Statements"
-    elif i == 2:
-        heading = "🔍 No EMP501/201"
-    else:
-        heading = f"🔍 Finding {i+1}"
-    
-    with st.expander(heading, expanded=True):
-        with st.form(key=f"form_finding_{i}"):
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                st.write("📝 **Description** *")
-                finding["description"] = st.text_area(
-                    f"Description {i+1}", 
-                    value=finding["description"], 
-                    key=f"desc_{i}",
-                    height=120,
-                    placeholder="Enter finding description here..."
-                )
-                
-                st.write("📊 **Rating** *")
-                finding["rating"] = st.selectbox(
-                    f"Rating {i+1}", 
-                    ["", "Critical", "Significant", "Minor", "Insignificant"], 
-                    index=["", "Critical", "Significant", "Minor", "Insignificant"].index(finding["rating"]) if finding["rating"] else 0, 
-                    key=f"rating_{i}"
-                )
-            
-            with col2:
-                st.write("📄 **Page Reference** *")
-                finding["page_ref"] = st.text_input(
-                    f"Page Reference {i+1}", 
-                    value=finding["page_ref"], 
-                    key=f"page_{i}",
-                    placeholder="e.g., TP.1, Page 5"
-                )
-            
-            # Save button and status indicator
-            col_save_finding, col_indicator_finding = st.columns([3, 1])
-            with col_save_finding:
-                if st.form_submit_button(f"💾 Save Finding {i+1}"):
-                    st.success(f"Finding {i+1} saved!")
-            with col_indicator_finding:
-                if finding["description"] and finding["rating"] and finding["page_ref"]:
-                    st.success("✅ Saved")
-                else:
-                    st.warning("⚠️ Unsaved")
-        
-        # Remove button at the bottom outside the form
-        col_remove_bottom = st.columns([3, 1])
-        with col_remove_bottom[1]:
-            # Remove button always visible
-            if st.button(f"🗑️ Remove Finding {i+1}", key=f"remove_finding_{i}", use_container_width=True):
-                st.session_state.findings.pop(i)
-                st.success(f"Finding {i+1} removed!")
-                st.rerun()
-
-# Add new finding button at the bottom
-st.markdown("---")  # Add a separator line
-if st.button("➕ Add New Finding", key="add_new_finding", use_container_width=True):
+def add_finding():
     st.session_state.findings.append({"description": "", "rating": "", "page_ref": ""})
-    st.rerun()
+
+def remove_finding(i):
+    st.session_state.findings.pop(i)
+
+@form_section("individual_findings")
+def individual_findings_section():
+    st.header("📋 Individual Findings")
+    st.info("**Document specific findings with ratings and page references for detailed reporting.**")
+
+    # Individual findings management - each finding has its own remove button
+
+    # Display findings with improved styling
+    for i, finding in enumerate(st.session_state.findings):
+        # Define specific headings for the first 3 findings
+        if i == 0:
+            heading = "🔍 No IRP5s/IDs/Contracts"
+        elif i == 1:
+            heading = "🔍 No Bank Statements"
+        elif i == 2:
+            heading = "🔍 No EMP501/201"
+        else:
+            heading = f"🔍 Finding {i+1}"
+
+        with st.expander(heading, expanded=True):
+            with st.form(key=f"form_finding_{i}"):
+                col1, col2 = st.columns(2)
+
+                with col1:
+                    st.write("📝 **Description** *")
+                    finding["description"] = st.text_area(
+                        f"Description {i+1}", 
+                        value=finding["description"], 
+                        key=f"desc_{i}",
+                        height=120,
+                        placeholder="Enter finding description here..."
+                    )
+
+                    st.write("📊 **Rating** *")
+                    finding["rating"] = st.selectbox(
+                        f"Rating {i+1}", 
+                        ["", "Critical", "Significant", "Minor", "Insignificant"], 
+                        index=["", "Critical", "Significant", "Minor", "Insignificant"].index(finding["rating"]) if finding["rating"] else 0, 
+                        key=f"rating_{i}"
+                    )
+
+                with col2:
+                    st.write("📄 **Page Reference** *")
+                    finding["page_ref"] = st.text_input(
+                        f"Page Reference {i+1}", 
+                        value=finding["page_ref"], 
+                        key=f"page_{i}",
+                        placeholder="e.g., TP.1, Page 5"
+                    )
+
+                # Save button and status indicator
+                col_save_finding, col_indicator_finding = st.columns([3, 1])
+                with col_save_finding:
+                    if st.form_submit_button(f"💾 Save Finding {i+1}"):
+                        st.success(f"Finding {i+1} saved!")
+                with col_indicator_finding:
+                    if finding["description"] and finding["rating"] and finding["page_ref"]:
+                        st.success("✅ Saved")
+                    else:
+                        st.warning("⚠️ Unsaved")
+
+            # Remove button at the bottom outside the form
+            col_remove_bottom = st.columns([3, 1])
+            with col_remove_bottom[1]:
+                # Remove button always visible
+                st.button(f"🗑️ Remove Finding {i+1}", key=f"remove_finding_{i}", use_container_width=True,
+                          on_click=remove_finding, args=(i,))
+
+    # Add new finding button at the bottom
+    st.markdown("---")  # Add a separator line
+    st.button("➕ Add New Finding", key="add_new_finding", use_container_width=True, on_click=add_finding)
+
+individual_findings_section()
 
 # ============================================================================
 # SECTION 6: COMPLIANCE WITH UI ACT
 # ============================================================================
-st.header("⚖️ Compliance with UI Act")
-st.info("**Tests whether the employer complied with UIF Act and Contributions Act requirements.**")
+@form_section("compliance_ui_act")
+def compliance_ui_act_section():
+    st.header("⚖️ Compliance with UI Act")
+    st.info("**Tests whether the employer complied with UIF Act and Contributions Act requirements.**")
 
-with st.form(key="form_compliance_ui_act"):
-    st.write("📝 **Does the employer comply with UI Act and Contributions Act** *")
-    
-    compliance_with_ui_act = st.selectbox(
-        "Select compliance status", 
-        ["", "Yes", "No"], 
-        index=["", "Yes", "No"].index(st.session_state.form_data.get("Compliance", "")) if st.session_state.form_data.get("Compliance", "") in ["", "Yes", "No"] else 0,
-        key="compliance_ui_act_input"
-    )
-    
-    # Auto-populate compliance comment based on selection
-    if compliance_with_ui_act == "Yes":
-        default_comment = "The necessary documents to confirm compliance with UI Act"
-    elif compliance_with_ui_act == "No":
-        default_comment = "The necessary documents to confirm compliance with UI Act were not provided"
-    else:
-        default_comment = st.session_state.form_data.get("Compliance_with_UI_Act_Provide_comments", "")
-    
-    st.write("📝 **Compliance Comment**")
-    compliance_comment = st.text_area(
-        "Provide detailed comment about compliance status",
-        value=default_comment,
-        key="compliance_comment_input",
-        placeholder="Enter detailed compliance comment here...",
-        height=100
-    )
-    
-    st.write("📋 **Compliance Documents List**")
-    
-    compliance_documents_list = st.text_input(
-        "Enter comma-separated list of compliance documents (e.g., IRP5s, payslips, contracts)",
-        value=st.session_state.form_data.get("Compliance_Documents_List", "N/A"),
-        key="compliance_documents_list_input",
-        placeholder="N/A"
-    )
-    
-    # Save button and status indicator
-    col_save_compliance_ui, col_indicator_compliance_ui = st.columns([3, 1])
-    with col_save_compliance_ui:
-        if st.form_submit_button("💾 Save Compliance with UI Act"):
-            st.session_state.form_data.update({
-                "Compliance": compliance_with_ui_act,  # Template expects {{Compliance}}
-                "Compliance_with_UI_Act_Provide_comments": compliance_comment,  # Template expects {{Compliance_with_UI_Act_Provide_comments}}
-                "Compliance_Documents_List": compliance_documents_list,  # Template expects {{Compliance_Documents_List}}
-            })
-            # Update progress tracking
-            update_completion_status()
-            st.success("Compliance with UI Act saved!")
-    with col_indicator_compliance_ui:
-        if st.session_state.form_data.get("Compliance"):
-            st.success("✅ Saved")
+    with st.form(key="form_compliance_ui_act"):
+        st.write("📝 **Does the employer comply with UI Act and Contributions Act** *")
+
+        compliance_with_ui_act = st.selectbox(
+            "Select compliance status", 
+            ["", "Yes", "No"], 
+            index=["", "Yes", "No"].index(st.session_state.form_data.get("Compliance", "")) if st.session_state.form_data.get("Compliance", "") in ["", "Yes", "No"] else 0,
+            key="compliance_ui_act_input"
+        )
+
+        # Auto-populate compliance comment based on selection
+        if compliance_with_ui_act == "Yes":
+            default_comment = "The necessary documents to confirm compliance with UI Act"
+        elif compliance_with_ui_act == "No":
+            default_comment = "The necessary documents to confirm compliance with UI Act were not provided"
         else:
-            st.warning("⚠️ Unsaved")
+            default_comment = st.session_state.form_data.get("Compliance_with_UI_Act_Provide_comments", "")
+
+        st.write("📝 **Compliance Comment**")
+        compliance_comment = st.text_area(
+            "Provide detailed comment about compliance status",
+            value=default_comment,
+            key="compliance_comment_input",
+            placeholder="Enter detailed compliance comment here...",
+            height=100
+        )
+
+        st.write("📋 **Compliance Documents List**")
+
+        compliance_documents_list = st.text_input(
+            "Enter comma-separated list of compliance documents (e.g., IRP5s, payslips, contracts)",
+            value=st.session_state.form_data.get("Compliance_Documents_List", "N/A"),
+            key="compliance_documents_list_input",
+            placeholder="N/A"
+        )
+
+        # Save button and status indicator
+        col_save_compliance_ui, col_indicator_compliance_ui = st.columns([3, 1])
+        with col_save_compliance_ui:
+            if st.form_submit_button("💾 Save Compliance with UI Act"):
+                st.session_state.form_data.update({
+                    "Compliance": compliance_with_ui_act,  # Template expects {{Compliance}}
+                    "Compliance_with_UI_Act_Provide_comments": compliance_comment,  # Template expects {{Compliance_with_UI_Act_Provide_comments}}
+                    "Compliance_Documents_List": compliance_documents_list,  # Template expects {{Compliance_Documents_List}}
+                })
+                # Update progress tracking
+                update_completion_status()
+                st.success("Compliance with UI Act saved!")
+        with col_indicator_compliance_ui:
+            if st.session_state.form_data.get("Compliance"):
+                st.success("✅ Saved")
+            else:
+                st.warning("⚠️ Unsaved")
+
+compliance_ui_act_section()
 
 # ============================================================================
 # SECTION 7: COMPLIANCE COMMENTS (Button Approach)
 # ============================================================================
-st.header("📝 Compliance Comments")
-st.info("**Tests whether the employer complied with UIF Act and Contributions Act requirements.**")
-
-# Button row with consistent styling - full width and evenly distributed
-col6, col7 = st.columns(2)
-with col6:
-    if st.button("✅ Add Compliance YES", key="comp_yes", use_container_width=True):
-        add_compliance_yes()
-with col7:
-    if st.button("❌ Add Compliance NO", key="comp_no", use_container_width=True):
-        add_compliance_no()
-
-with st.form(key="form_compliance"):
-    if "compliance_input" not in st.session_state:
-        st.session_state["compliance_input"] = st.session_state.button_data["compliance_comments"]
-    st.session_state.button_data["compliance_comments"] = st.text_area(
-        "Edit Compliance Comments",
-        height=120,
-        key="compliance_input",
-        placeholder="Enter compliance comments here..."
-    )
-    
-    # Save button and status indicator
-    col_save3, col_indicator3 = st.columns([3, 1])
-    with col_save3:
-        if st.form_submit_button("💾 Save Compliance Comments"):
-            st.session_state.saved['compliance_comments'] = True
-            # Update progress tracking
-            update_completion_status()
-            st.success("Compliance comments saved!")
-    with col_indicator3:
-        if st.session_state.saved["compliance_comments"]:
-            st.success("✅ Saved")
-        else:
-            st.warning("⚠️ Unsaved")
+helper_sections["compliance_comments"]()
 
 # ============================================================================
 # SECTION 8: FRAUD AND OVERPAYMENTS
 # ============================================================================
-st.header("🚨 Fraud and Overpayments")
-st.info("**Identifies potential fraud indicators and overpayments in the TERS claims.**")
-
-with st.form(key="form_fraud_overpayments"):
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        st.write("🚨 **Possible Fraud Indicators** *")
-        possible_fraud = st.selectbox(
-            "Select fraud indicator status", 
-            ["", "Yes", "No"], 
-            index=["", "Yes", "No"].index(st.session_state.form_data.get("Possible_Fraud_Fraud_Indicators_YesNo1", "")) if st.session_state.form_data.get("Possible_Fraud_Fraud_Indicators_YesNo1", "") in ["", "Yes", "No"] else 0,
-            key="possible_fraud_input"
-        )
-    
-    with col2:
-        st.write("💰 **Overpayments Identified** *")
-        overpayments_identified = st.selectbox(
-            "Select overpayment status", 
-            ["", "Yes", "No"], 
-            index=["", "Yes", "No"].index(st.session_state.form_data.get("Overpayments_Identified_YesNo1", "")) if st.session_state.form_data.get("Overpayments_Identified_YesNo1", "") in ["", "Yes", "No"] else 0,
-            key="overpayments_identified_input"
-        )
-    
-    # Save button and status indicator
-    col_save_fraud, col_indicator_fraud = st.columns([3, 1])
-    with col_save_fraud:
-        if st.form_submit_button("💾 Save Fraud and Overpayments"):
-            st.session_state.form_data.update({
-                "Possible_Fraud_Fraud_Indicators_YesNo1": possible_fraud,
-                "Overpayments_Identified_YesNo1": overpayments_identified
-            })
-            # Update progress tracking
-            update_completion_status()
-            st.success("Fraud and overpayments saved!")
-    with col_indicator_fraud:
-        if st.session_state.form_data.get("Possible_Fraud_Fraud_Indicators_YesNo1") and st.session_state.form_data.get("Overpayments_Identified_YesNo1"):
-            st.success("✅ Saved")
-        else:
-            st.warning("⚠️ Unsaved")
-
+@form_section("fraud_overpayments")
+def fraud_overpayments_section():
+    st.header("🚨 Fraud and Overpayments")
+    st.info("**Identifies potential fraud indicators and overpayments in the TERS claims.**")
+
+    with st.form(key="form_fraud_overpayments"):
+        col1, col2 = st.columns(2)
+
+        with col1:
+            st.write("🚨 **Possible Fraud Indicators** *")
+            possible_fraud = st.selectbox(
+                "Select fraud indicator status", 
+                ["", "Yes", "No"], 
+                index=["", "Yes", "No"].index(st.session_state.form_data.get("Possible_Fraud_Fraud_Indicators_YesNo1", "")) if st.session_state.form_data.get("Possible_Fraud_Fraud_Indicators_YesNo1", "") in ["", "Yes", "No"] else 0,
+                key="possible_fraud_input"
+            )
+
+        with col2:
+            st.write("💰 **Overpayments Identified** *")
+            overpayments_identified = st.selectbox(
+                "Select overpayment status", 
+                ["", "Yes", "No"], 
+                index=["", "Yes", "No"].index(st.session_state.form_data.get("Overpayments_Identified_YesNo1", "")) if st.session_state.form_data.get("Overpayments_Identified_YesNo1", "") in ["", "Yes", "No"] else 0,
+                key="overpayments_identified_input"
+            )
+
+        # Save button and status indicator
+        col_save_fraud, col_indicator_fraud = st.columns([3, 1])
+        with col_save_fraud:
+            if st.form_submit_button("💾 Save Fraud and Overpayments"):
+                st.session_state.form_data.update({
+                    "Possible_Fraud_Fraud_Indicators_YesNo1": possible_fraud,
+                    "Overpayments_Identified_YesNo1": overpayments_identified
+                })
+                # Update progress tracking
+                update_completion_status()
+                st.success("Fraud and overpayments saved!")
+        with col_indicator_fraud:
+            if st.session_state.form_data.get("Possible_Fraud_Fraud_Indicators_YesNo1") and st.session_state.form_data.get("Overpayments_Identified_YesNo1"):
+                st.success("✅ Saved")
+            else:
+                st.warning("⚠️ Unsaved")
 
+fraud_overpayments_section()
 
 # ============================================================================
 # SECTION 10: PAYMENT VERIFICATION SCOPE (Button Approach)
 # ============================================================================
-st.header("💳 Payment Verification Scope")
-st.info("**Tests whether the employer received and disbursed the correct amounts from UIF to employees.**")
-
-# Button layout - 2 rows with positive on left, negative on right
-col10, col11 = st.columns(2)
-
-with col10:
-    st.write("**Positive Comments:**")
-    if st.button("✅ Correctly Received", key="pay_ver_yes_1", use_container_width=True):
-        st.session_state.button_data["payment_verification_scope"] += get_verification_scope_text("payment_verification", "yes", 0, st.session_state.form_data) + "\n"
-        # Update progress tracking
-        update_completion_status()
-        st.session_state["payment_verification_input"] = st.session_state.button_data["payment_verification_scope"]
-        st.rerun()
-    if st.button("✅ Correctly Disbursed", key="pay_ver_yes_2", use_container_width=True):
-        st.session_state.button_data["payment_verification_scope"] += get_verification_scope_text("payment_verification", "yes", 1, st.session_state.form_data) + "\n"
-        # Update progress tracking
-        update_completion_status()
-        st.session_state["payment_verification_input"] = st.session_state.button_data["payment_verification_scope"]
-        st.rerun()
-
-with col11:
-    st.write("**Negative Comments:**")
-    if st.button("❌ Incorrectly Received", key="pay_ver_no_1", use_container_width=True):
-        st.session_state.button_data["payment_verification_scope"] += get_verification_scope_text("payment_verification", "no", 0, st.session_state.form_data) + "\n"
-        # Update progress tracking
-        update_completion_status()
-        st.session_state["payment_verification_input"] = st.session_state.button_data["payment_verification_scope"]
-        st.rerun()
-    if st.button("❌ Incorrectly Disbursed", key="pay_ver_no_2", use_container_width=True):
-        st.session_state.button_data["payment_verification_scope"] += get_verification_scope_text("payment_verification", "no", 1, st.session_state.form_data) + "\n"
-        # Update progress tracking
-        update_completion_status()
-        st.session_state["payment_verification_input"] = st.session_state.button_data["payment_verification_scope"]
-        st.rerun()
-
-with st.form(key="form_payment_verification"):
-    if "payment_verification_input" not in st.session_state:
-        st.session_state["payment_verification_input"] = st.session_state.button_data["payment_verification_scope"]
-    st.session_state.button_data["payment_verification_scope"] = st.text_area(
-        "Edit Payment Verification Scope",
-        height=120,
-        key="payment_verification_input",
-        placeholder="Enter payment verification scope here..."
-    )
-    
-    # Save button and status indicator
-    col_save5, col_indicator5 = st.columns([3, 1])
-    with col_save5:
-        if st.form_submit_button("💾 Save Payment Verification Scope"):
-            st.session_state.saved['payment_verification_scope'] = True
-            # Update progress tracking
-            update_completion_status()
-            st.success("Payment verification scope saved!")
-    with col_indicator5:
-        if st.session_state.saved["payment_verification_scope"]:
-            st.success("✅ Saved")
-        else:
-            st.warning("⚠️ Unsaved")
+helper_sections["payment_verification_scope"]()
 
 # ============================================================================
 # SECTION 11: EMPLOYMENT VERIFICATION SCOPE (Button Approach)
 # ============================================================================
-st.header("👥 Employment Verification Scope")
-st.info("**Tests whether the employees claimed for were actually employed and eligible for TERS benefits.**")
-
-# Button layout - 2 rows with positive on left, negative on right
-col14, col15 = st.columns(2)
-
-with col14:
-    st.write("**Positive Comments:**")
-    if st.button("✅ Employment Confirmed", key="emp_ver_yes_1", use_container_width=True):
-        st.session_state.button_data["employment_verification_scope"] += get_verification_scope_text("employment_verification", "yes", 0, st.session_state.form_data) + "\n"
-        # Update progress tracking
-        update_completion_status()
-        st.session_state["employment_verification_input"] = st.session_state.button_data["employment_verification_scope"]
-        st.rerun()
-    if st.button("✅ Pre-Lockdown Verified", key="emp_ver_yes_2", use_container_width=True):
-        st.session_state.button_data["employment_verification_scope"] += get_verification_scope_text("employment_verification", "yes", 1, st.session_state.form_data) + "\n"
-        # Update progress tracking
-        update_completion_status()
-        st.session_state["employment_verification_input"] = st.session_state.button_data["employment_verification_scope"]
-        st.rerun()
-
-with col15:
-    st.write("**Negative Comments:**")
-    if st.button("❌ Employment Not Confirmed", key="emp_ver_no_1", use_container_width=True):
-        st.session_state.button_data["employment_verification_scope"] += get_verification_scope_text("employment_verification", "no", 0, st.session_state.form_data) + "\n"
-        # Update progress tracking
-        update_completion_status()
-        st.session_state["employment_verification_input"] = st.session_state.button_data["employment_verification_scope"]
-        st.rerun()
-    if st.button("❌ Pre-Lockdown Not Verified", key="emp_ver_no_2", use_container_width=True):
-        st.session_state.button_data["employment_verification_scope"] += get_verification_scope_text("employment_verification", "no", 1, st.session_state.form_data) + "\n"
-        # Update progress tracking
-        update_completion_status()
-        st.session_state["employment_verification_input"] = st.session_state.button_data["employment_verification_scope"]
-        st.rerun()
-
-with st.form(key="form_employment_verification"):
-    if "employment_verification_input" not in st.session_state:
-        st.session_state["employment_verification_input"] = st.session_state.button_data["employment_verification_scope"]
-    st.session_state.button_data["employment_verification_scope"] = st.text_area(
-        "Edit Employment Verification Scope",
-        height=120,
-        key="employment_verification_input",
-        placeholder="Enter employment verification scope here..."
-    )
-    
-    # Save button and status indicator
-    col_save6, col_indicator6 = st.columns([3, 1])
-    with col_save6:
-        if st.form_submit_button("💾 Save Employment Verification Scope"):
-            st.session_state.saved['employment_verification_scope'] = True
-            # Update progress tracking
-            update_completion_status()
-            st.success("Employment verification scope saved!")
-    with col_indicator6:
-        if st.session_state.saved["employment_verification_scope"]:
-            st.success("✅ Saved")
-        else:
-            st.warning("⚠️ Unsaved")
+helper_sections["employment_verification_scope"]()
 
 # ============================================================================
 # SECTION 12: CLAIMS VALIDITY SCOPE (Button Approach)
 # ============================================================================
-st.header("📋 Claims Validity Scope")
-st.info("**Tests whether the UIF claims submitted were accurate and valid according to fund guidelines.**")
-
-# Button row with consistent styling - full width and evenly distributed
-col14, col15 = st.columns(2)
-with col14:
-    if st.button("✅ Claims Valid", key="claims_yes", use_container_width=True):
-        add_claims_validity_yes()
-with col15:
-    if st.button("❌ Claims Invalid", key="claims_no", use_container_width=True):
-        add_claims_validity_no()
-
-with st.form(key="form_claims_validity"):
-    if "claims_validity_input" not in st.session_state:
-        st.session_state["claims_validity_input"] = st.session_state.button_data["claims_validity_scope"]
-    st.session_state.button_data["claims_validity_scope"] = st.text_area(
-        "Edit Claims Validity Scope",
-        height=120,
-        key="claims_validity_input",
-        placeholder="Enter claims validity scope here..."
-    )
-    
-    # Save button and status indicator
-    col_save7, col_indicator7 = st.columns([3, 1])
-    with col_save7:
-        if st.form_submit_button("💾 Save Claims Validity Scope"):
-            st.session_state.saved['claims_validity_scope'] = True
-            # Update progress tracking
-            update_completion_status()
-            st.success("Claims validity scope saved!")
-    with col_indicator7:
-        if st.session_state.saved["claims_validity_scope"]:
-            st.success("✅ Saved")
-        else:
-            st.warning("⚠️ Unsaved")
+helper_sections["claims_validity_scope"]()
 
 # ============================================================================
 # SECTION 13: OBJECTIVE 1 - EMPLOYER EXISTS (Button Approach)
 # ============================================================================
-st.header("🎯 Objective 1 - Employer Exists")
-st.info("**Tests whether the employer who applied for COVID19 TERS funds actually exists as a business entity.**")
-
-# Button row with consistent styling - full width and evenly distributed
-col16, col17 = st.columns(2)
-with col16:
-    if st.button("✅ Add Objective 1 YES", key="obj1_yes", use_container_width=True):
-        add_objective_1_yes()
-with col17:
-    if st.button("❌ Add Objective 1 NO", key="obj1_no", use_container_width=True):
-        add_objective_1_no()
-
-with st.form(key="form_objective_1"):
-    if "objective_1_input" not in st.session_state:
-        st.session_state["objective_1_input"] = st.session_state.button_data["objective_1_comment"]
-    st.session_state.button_data["objective_1_comment"] = st.text_area(
-        "Edit Objective 1 Comment",
-        height=120,
-        key="objective_1_input",
-        placeholder="Enter Objective 1 comment here..."
-    )
-    
-    # Save button and status indicator
-    col_save8, col_indicator8 = st.columns([3, 1])
-    with col_save8:
-        if st.form_submit_button("💾 Save Objective 1"):
-            st.session_state.saved['objective_1_comment'] = True
-            # Update progress tracking
-            update_completion_status()
-            st.success("Objective 1 saved!")
-    with col_indicator8:
-        if st.session_state.saved["objective_1_comment"]:
-            st.success("✅ Saved")
-        else:
-            st.warning("⚠️ Unsaved")
+helper_sections["objective_1_comment"]()
 
 # ============================================================================
 # SECTION 14: OBJECTIVE 2 - EMPLOYEE VALIDITY (Button Approach)
 # ============================================================================
-st.header("🎯 Objective 2 - Employee Validity")
-st.info("**Tests whether the employment of the employees applied for was valid and legitimate.**")
-
-# Button row with consistent styling - full width and evenly distributed
-col18, col19 = st.columns(2)
-with col18:
-    if st.button("✅ Add Objective 2 YES", key="obj2_yes", use_container_width=True):
-        add_objective_2_yes()
-with col19:
-    if st.button("❌ Add Objective 2 NO", key="obj2_no", use_container_width=True):
-        add_objective_2_no()
-
-with st.form(key="form_objective_2"):
-    if "objective_2_input" not in st.session_state:
-        st.session_state["objective_2_input"] = st.session_state.button_data["objective_2_comment"]
-    st.session_state.button_data["objective_2_comment"] = st.text_area(
-        "Edit Objective 2 Comment",
-        height=120,
-        key="objective_2_input",
-        placeholder="Enter Objective 2 comment here..."
-    )
-    
-    # Save button and status indicator
-    col_save9, col_indicator9 = st.columns([3, 1])
-    with col_save9:
-        if st.form_submit_button("💾 Save Objective 2"):
-            st.session_state.saved['objective_2_comment'] = True
-            # Update progress tracking
-            update_completion_status()
-            st.success("Objective 2 saved!")
-    with col_indicator9:
-        if st.session_state.saved["objective_2_comment"]:
-            st.success("✅ Saved")
-        else:
-            st.warning("⚠️ Unsaved")
+helper_sections["objective_2_comment"]()
 
 # ============================================================================
 # SECTION 15: OBJECTIVE 3 - PAYMENT ACCURACY (Button Approach)
 # ============================================================================
-st.header("🎯 Objective 3 - Payment Accuracy")
-st.info("**Tests whether the accuracy of the payments made by the fund to the employer were correct.**")
-
-# Button row with consistent styling - full width and evenly distributed
-col20, col21 = st.columns(2)
-with col20:
-    if st.button("✅ Add Objective 3 YES", key="obj3_yes", use_container_width=True):
-        add_objective_3_yes()
-with col21:
-    if st.button("❌ Add Objective 3 NO", key="obj3_no", use_container_width=True):
-        add_objective_3_no()
-
-with st.form(key="form_objective_3"):
-    if "objective_3_input" not in st.session_state:
-        st.session_state["objective_3_input"] = st.session_state.button_data["objective_3_comment"]
-    st.session_state.button_data["objective_3_comment"] = st.text_area(
-        "Edit Objective 3 Comment",
-        height=120,
-        key="objective_3_input",
-        placeholder="Enter Objective 3 comment here..."
-    )
-    
-    # Save button and status indicator
-    col_save10, col_indicator10 = st.columns([3, 1])
-    with col_save10:
-        if st.form_submit_button("💾 Save Objective 3"):
-            st.session_state.saved['objective_3_comment'] = True
-            # Update progress tracking
-            update_completion_status()
-            st.success("Objective 3 saved!")
-    with col_indicator10:
-        if st.session_state.saved["objective_3_comment"]:
-            st.success("✅ Saved")
-        else:
-            st.warning("⚠️ Unsaved")
+helper_sections["objective_3_comment"]()
 
 # ============================================================================
 # SECTION 16: OBJECTIVE 4 - FUNDS REACHED BENEFICIARIES (Button Approach)
 # ============================================================================
-st.header("🎯 Objective 4 - Funds Reached Beneficiaries")
-st.info("**Tests whether the COVID19 TERS funds actually reached the intended employee beneficiaries.**")
-
-# Button row with consistent styling - full width and evenly distributed
-col22, col23 = st.columns(2)
-with col22:
-    if st.button("✅ Add Objective 4 YES", key="obj4_yes", use_container_width=True):
-        add_objective_4_yes()
-with col23:
-    if st.button("❌ Add Objective 4 NO", key="obj4_no", use_container_width=True):
-        add_objective_4_no()
-
-with st.form(key="form_objective_4"):
-    if "objective_4_input" not in st.session_state:
-        st.session_state["objective_4_input"] = st.session_state.button_data["objective_4_comment"]
-    st.session_state.button_data["objective_4_comment"] = st.text_area(
-        "Edit Objective 4 Comment",
-        height=120,
-        key="objective_4_input",
-        placeholder="Enter Objective 4 comment here..."
-    )
-    
-    # Save button and status indicator
-    col_save11, col_indicator11 = st.columns([3, 1])
-    with col_save11:
-        if st.form_submit_button("💾 Save Objective 4"):
-            st.session_state.saved['objective_4_comment'] = True
-            # Update progress tracking
-            update_completion_status()
-            st.success("Objective 4 saved!")
-    with col_indicator11:
-        if st.session_state.saved["objective_4_comment"]:
-            st.success("✅ Saved")
-        else:
-            st.warning("⚠️ Unsaved")
+helper_sections["objective_4_comment"]()
 
 # ============================================================================
 # SECTION 17: OBJECTIVE 5 - INFORMATION VALIDITY (Button Approach)
 # ============================================================================
-st.header("🎯 Objective 5 - Information Validity")
-st.info("**Tests whether the information submitted to the fund was accurate and valid according to MOA guidelines.**")
-
-# Button row with consistent styling - full width and evenly distributed
-col24, col25 = st.columns(2)
-with col24:
-    if st.button("✅ Add Objective 5 YES", key="obj5_yes", use_container_width=True):
-        add_objective_5_yes()
-with col25:
-    if st.button("❌ Add Objective 5 NO", key="obj5_no", use_container_width=True):
-        add_objective_5_no()
-
-with st.form(key="form_objective_5"):
-    if "objective_5_input" not in st.session_state:
-        st.session_state["objective_5_input"] = st.session_state.button_data["objective_5_comment"]
-    st.session_state.button_data["objective_5_comment"] = st.text_area(
-        "Edit Objective 5 Comment",
-        height=120,
-        key="objective_5_input",
-        placeholder="Enter Objective 5 comment here..."
-    )
-    
-    # Save button and status indicator
-    col_save12, col_indicator12 = st.columns([3, 1])
-    with col_save12:
-        if st.form_submit_button("💾 Save Objective 5"):
-            st.session_state.saved['objective_5_comment'] = True
-            # Update progress tracking
-            update_completion_status()
-            st.success("Objective 5 saved!")
-    with col_indicator12:
-        if st.session_state.saved["objective_5_comment"]:
-            st.success("✅ Saved")
-        else:
-            st.warning("⚠️ Unsaved")
+helper_sections["objective_5_comment"]()
 
 # ============================================================================
 # SECTION 18: OVERALL OUTCOMES (Button Approach)
 # ============================================================================
-st.header("📊 Overall Outcomes")
-st.info("**Summarizes the overall results of the verification process and whether the employer met all requirements.**")
+helper_sections["overall_outcomes"]()
 
+# Preview section removed for cleaner interface
 
+# Sections that are not employer specific: helper-text sections and individual findings
+def get_shared_report_fields():
+    """Button-approach sections and findings as template fields (shared by single and batch reports)"""
+    fields = {field: st.session_state.button_data[section] for section, field in BUTTON_DATA_FIELDS.items()}
+    fields.update(findings_fields(st.session_state.findings))
+    return fields
+
+def get_batch_shared_fields():
+    """Sections applied to every batch report: the helper texts with their {{variables}} left for
+    each employer's own values (see build_employer_context), the findings and the form's other
+    non-employer fields"""
+    fields = {key: st.session_state.form_data.get(key, default) for key, default in DEFAULT_SHARED_FIELDS.items()}
+    fields.update({field: st.session_state.helper_templates[section] for section, field in BUTTON_DATA_FIELDS.items()})
+    fields.update(findings_fields(st.session_state.findings))
+    return fields
+
+# Reports are kept in memory for download; saving a copy on the server is opt-in
+save_report_to_disk = st.checkbox(
+    "Also save a copy to generated_reports/",
+    value=os.environ.get("SAVE_REPORTS_TO_DISK", "").lower() in ("1", "true", "yes"),
+    key="save_report_to_disk",
+)
 
-# Add refresh button
-if st.button("🔄 Refresh with Current Form Data", key="refresh_outcomes", use_container_width=True):
-    refresh_overall_outcomes()
-    # Update progress tracking
-    update_completion_status()
-    st.success("Overall outcomes refreshed with current form data!")
-    st.rerun()
-
-# Button grid layout - 3 positive buttons on left, 3 negative buttons on right
-col8, col9 = st.columns(2)
-
-with col8:
-    st.write("**Positive Outcomes:**")
-    if st.button("✅ Payment Accuracy - Positive", key="outcomes_payment_pos", use_container_width=True):
-        st.session_state.button_data["overall_outcomes"] += get_overall_outcome_text("positive", "payment_accuracy", st.session_state.form_data) + "\n"
-        # Update progress tracking
-        update_completion_status()
-        st.session_state["overall_outcomes_input"] = st.session_state.button_data["overall_outcomes"]
-        st.rerun()
-    
-    if st.button("✅ Employment Verification - Positive", key="outcomes_employment_pos", use_container_width=True):
-        st.session_state.button_data["overall_outcomes"] += get_overall_outcome_text("positive", "employment_verification", st.session_state.form_data) + "\n"
-        # Update progress tracking
-        update_completion_status()
-        st.session_state["overall_outcomes_input"] = st.session_state.button_data["overall_outcomes"]
-        st.rerun()
-    
-    if st.button("✅ Documentation - Positive", key="outcomes_documentation_pos", use_container_width=True):
-        st.session_state.button_data["overall_outcomes"] += get_overall_outcome_text("positive", "documentation", st.session_state.form_data) + "\n"
-        # Update progress tracking
-        update_completion_status()
-        st.session_state["overall_outcomes_input"] = st.session_state.button_data["overall_outcomes"]
-        st.rerun()
-
-with col9:
-    st.write("**Negative Outcomes:**")
-    if st.button("❌ Payment Accuracy - Negative", key="outcomes_payment_neg", use_container_width=True):
-        st.session_state.button_data["overall_outcomes"] += get_overall_outcome_text("negative", "payment_accuracy", st.session_state.form_data) + "\n"
-        # Update progress tracking
-        update_completion_status()
-        st.session_state["overall_outcomes_input"] = st.session_state.button_data["overall_outcomes"]
-        st.rerun()
-    
-    if st.button("❌ Employment Verification - Negative", key="outcomes_employment_neg", use_container_width=True):
-        st.session_state.button_data["overall_outcomes"] += get_overall_outcome_text("negative", "employment_verification", st.session_state.form_data) + "\n"
-        # Update progress tracking
-        update_completion_status()
-        st.session_state["overall_outcomes_input"] = st.session_state.button_data["overall_outcomes"]
-        st.rerun()
-    
-    if st.button("❌ Documentation - Negative", key="outcomes_documentation_neg", use_container_width=True):
-        st.session_state.button_data["overall_outcomes"] += get_overall_outcome_text("negative", "documentation", st.session_state.form_data) + "\n"
-        # Update progress tracking
-        update_completion_status()
-        st.session_state["overall_outcomes_input"] = st.session_state.button_data["overall_outcomes"]
-        st.rerun()
-
-with st.form(key="form_overall_outcomes"):
-    if "overall_outcomes_input" not in st.session_state:
-        st.session_state["overall_outcomes_input"] = st.session_state.button_data["overall_outcomes"]
-    st.session_state.button_data["overall_outcomes"] = st.text_area(
-        "Edit Overall Outcomes",
-        height=120,
-        key="overall_outcomes_input",
-        placeholder="Enter overall outcomes here..."
-    )
-    
-    # Save button and status indicator
-    col_save4, col_indicator4 = st.columns([3, 1])
-    with col_save4:
-        if st.form_submit_button("💾 Save Overall Outcomes"):
-            st.session_state.saved['overall_outcomes'] = True
-            # Update progress tracking
-            update_completion_status()
-            st.success("Overall outcomes saved!")
-    with col_indicator4:
-        if st.session_state.saved["overall_outcomes"]:
-            st.success("✅ Saved")
-        else:
-            st.warning("⚠️ Unsaved")
-
-# Preview section removed for cleaner interface
+# Number of recent generations shown in the sidebar timing panel
+REPORT_TIMINGS_SHOWN = 10
 
 # Final submission to join all forms
 if st.button("Final Submit"):
-    # Combine all the button data into the form_data structure
-    combined_data = {
-        "Main_Findings": st.session_state.button_data["main_findings"],
-        "Limitation_of_scope": st.session_state.button_data["limitation_of_scope"],
-        "Compliance_Comments": st.session_state.button_data["compliance_comments"],
-        "Overall_Outcomes": st.session_state.button_data["overall_outcomes"],
-        "Payment_Verification_Scope": st.session_state.button_data["payment_verification_scope"],
-        "Employment_Verification_Scope": st.session_state.button_data["employment_verification_scope"],
-        "Claims_Validity_Scope": st.session_state.button_data["claims_validity_scope"],
-        "Objective_1_Comment": st.session_state.button_data["objective_1_comment"],
-        "Objective_2_Comment": st.session_state.button_data["objective_2_comment"],
-        "Objective_3_Comment": st.session_state.button_data["objective_3_comment"],
-        "Objective_4_Comment": st.session_state.button_data["objective_4_comment"],
-        "Objective_5_Comment": st.session_state.button_data["objective_5_comment"]
-    }
-    
-    # Update form_data with combined data
-    st.session_state.form_data.update(combined_data)
-    
-    # Handle findings
-    for i, finding in enumerate(st.session_state.findings, 1):
-        st.session_state.form_data[f"Finding_{i}"] = finding["description"]
-        st.session_state.form_data[f"Finding_{i}_Rating"] = finding["rating"]
-        st.session_state.form_data[f"Finding_{i}_Page"] = finding["page_ref"] or f"TP.{i+1}"
+    # Combine all the button data and findings into the form_data structure
+    st.session_state.form_data.update(get_shared_report_fields())
     
     # Add all monthly data fields
     monthly_claim_fields = {
@@ -2426,13 +1426,10 @@ if st.button("Final Submit"):
         st.session_state.form_data["Compliance"] = "Yes" if "accurate" in st.session_state.form_data["Compliance_Comments"].lower() else "No"
     
     # Populate Iteration_* fields, Iteration_total, and Gaps for template
-    iteration_counts = st.session_state.get('iteration_counts', [])
-    # Map iterations 1..16
-    for idx in range(16):
-        key = f"Iteration_{idx+1}"
-        st.session_state.form_data[key] = str(iteration_counts[idx]) if idx < len(iteration_counts) else "0"
-    st.session_state.form_data["Iteration_total"] = str(sum(iteration_counts)) if iteration_counts else "0"
-    st.session_state.form_data["Gaps"] = st.session_state.get('gaps_flag', "No")
+    st.session_state.form_data.update(iteration_fields(
+        st.session_state.get('iteration_counts', []),
+        st.session_state.get('gaps_flag', "No"),
+    ))
 
     # Ensure Finding_3 and Finding_3_Rating exist (template expects them)
     if "Finding_3" not in st.session_state.form_data:
@@ -2481,23 +1478,269 @@ if st.button("Final Submit"):
         st.subheader("Combined Data for Template")
         st.json(st.session_state.form_data)
 
-        generator = ReportGenerator(template_path)
-        output_path = generator.generate_report(st.session_state.form_data)
-        st.session_state.output_path = output_path
-        st.success(f"Report generated: {output_path}")
+        # Rendering runs on the shared background pool so this script run returns immediately;
+        # the status panel below polls the job and enables the download when it is done
+        st.session_state.report_job_id = get_report_jobs(template_path).submit(
+            st.session_state.form_data, save_to_disk=save_report_to_disk, session_id=st.session_state.session_id
+        )
+        st.session_state.report_bytes = None
+        st.session_state.output_path = None
+        st.session_state.report_notices = []
     except Exception as e:
         st.error(f"Error generating report: {str(e)}")
         st.session_state.output_path = None
+        st.session_state.report_bytes = None
+
+@st.fragment(run_every=1.0)
+def show_report_job_status():
+    """Poll the submitted report job; once finished, keep its result and rerun the page to show the download"""
+    job = get_report_jobs(template_path).status(st.session_state.report_job_id)
+    if job is not None and job["finished_at"] is None:
+        st.info(f"⏳ Generating report ({job['status']}, {time.time() - job['submitted_at']:.0f}s)...")
+        return
+
+    st.session_state.report_job_id = None
+    if job is None:
+        st.session_state.report_notices = [("error", "Report job expired before it finished - please submit again")]
+    elif job["status"] == FAILED:
+        st.session_state.report_notices = [("error", f"Error generating report: {job['error']}")]
+    else:
+        result = job["result"]
+        st.session_state.report_bytes = result["report_bytes"]
+        st.session_state.output_path = result["output_path"]
+        timings = dict(result["timings"], queued=job["started_at"] - job["submitted_at"])
+        st.session_state.generation_timings = (st.session_state.generation_timings + [timings])[-REPORT_TIMINGS_SHOWN:]
+        if result["output_path"]:
+            notices = [("success", f"Report generated: {result['output_path']}")]
+        else:
+            notices = [("success", f"Report generated ({len(result['report_bytes']) / 1024:.0f} KB) - ready to download")]
+        if result["reused"]:
+            notices.append(("info", "Nothing changed since the last generation - the previous report was reused"))
+        stripped_fields = result["sanitize_stats"].get("values_stripped", 0)
+        if stripped_fields:
+            notices.append(("warning", f"Removed invisible control characters (usually pasted from Excel) from {stripped_fields} field(s)"))
+        st.session_state.report_notices = notices
+    rerun_page()
+
+if st.session_state.report_job_id:
+    show_report_job_status()
+
+for level, message in st.session_state.report_notices:
+    getattr(st, level)(message)
 
 # Download button
-if st.session_state.output_path and os.path.exists(st.session_state.output_path):
-    with open(st.session_state.output_path, "rb") as file:
-        st.download_button(
-            label="Download Report",
-            data=file,
-            file_name=f"{st.session_state.form_data.get('Name_of_Employer', 'report').replace(' ', '_')}_report.docx",
-            mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+if st.session_state.report_bytes:
+    st.download_button(
+        label="Download Report",
+        data=st.session_state.report_bytes,
+        file_name=f"{st.session_state.form_data.get('Name_of_Employer', 'report').replace(' ', '_')}_report.docx",
+        mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+    )
+
+# Sidebar: Latency breakdown of this session's recent generations (after Final Submit so it includes this run)
+with st.sidebar.expander("⏱️ Report Timings"):
+    if st.session_state.generation_timings:
+        st.dataframe(
+            [
+                {
+                    "queued": f"{timings.get('queued', 0) * 1000:.1f} ms",
+                    **{phase: f"{timings[phase] * 1000:.1f} ms" for phase in TIMING_PHASES},
+                    "total": f"{timings['total'] * 1000:.1f} ms",
+                    "reused": "yes" if timings["reused"] else "",
+                }
+                for timings in reversed(st.session_state.generation_timings)
+            ],
+            hide_index=True,
+            use_container_width=True,
+        )
+        st.caption(f"Newest first; last {REPORT_TIMINGS_SHOWN} generations in this session")
+    else:
+        st.caption("No reports generated yet in this session.")
+
+# Sidebar: Server time of recent whole-page runs and single-section reruns in this session
+@st.fragment
+def show_server_times():
+    """Server time per interaction, newest first (a fragment, so Refresh reruns only this panel)"""
+    with st.expander("⚡ Server Time per Interaction"):
+        st.button("🔄 Refresh", key="refresh_server_times", use_container_width=True)
+        # Every interaction should cost exactly one run: extra runs are reruns the app asked for itself
+        run_counts = st.session_state.run_counts
+        st.caption(
+            f"Runs this session: {run_counts['page']} whole page, {run_counts['section']} single section, "
+            f"{run_counts['extra']} extra"
+        )
+        server_timings = st.session_state.server_timings
+        if not server_timings:
+            st.caption("No interactions timed yet.")
+            return
+        for label, runs in (
+            ("Whole page", [t["seconds"] for t in server_timings if t["scope"] == "page"]),
+            ("Single section", [t["seconds"] for t in server_timings if t["scope"] != "page"]),
+        ):
+            if runs:
+                st.caption(f"{label}: {sum(runs) / len(runs) * 1000:.1f} ms average over {len(runs)} runs")
+        st.dataframe(
+            [
+                {
+                    "run": "Whole page" if t["scope"] == "page" else t["scope"].replace("_", " ").capitalize(),
+                    "server time": f"{t['seconds'] * 1000:.1f} ms",
+                }
+                for t in reversed(server_timings)
+            ],
+            hide_index=True,
+            use_container_width=True,
+        )
+
+with st.sidebar:
+    show_server_times()
+
+# Sidebar: Saved report storage and retention counters
+with st.sidebar.expander("🗂️ Saved Reports"):
+    report_retention = get_report_retention()
+    if st.button("🧹 Clean Up Now", key="sweep_generated_reports", use_container_width=True):
+        report_retention.sweep()
+    retention_stats = report_retention.stats()
+    st.caption(
+        f"{retention_stats['total_files']} reports, {retention_stats['total_bytes'] / (1024 * 1024):.1f} MB "
+        f"in {report_retention.reports_dir}/"
+    )
+    st.caption(
+        f"Evicted {retention_stats['files_evicted']} files, reclaimed "
+        f"{retention_stats['bytes_reclaimed'] / (1024 * 1024):.1f} MB over {retention_stats['sweeps']} sweeps"
+    )
+    limits = []
+    if report_retention.max_bytes:
+        limits.append(f"max {report_retention.max_bytes / (1024 * 1024):.0f} MB")
+    if report_retention.max_age_seconds:
+        limits.append(f"max age {report_retention.max_age_seconds / 86400:g} days")
+    if report_retention.keep_per_employer:
+        limits.append(f"keep last {report_retention.keep_per_employer} per employer")
+    st.caption("Limits: " + (", ".join(limits) if limits else "none"))
+
+# Sidebar: One ZIP download of many saved reports
+with st.sidebar.expander("🗜️ Export Reports ZIP"):
+    bundle_folders = bundle_sources(report_retention.reports_dir)
+    if not bundle_folders:
+        st.caption("No saved reports yet.")
+    else:
+        bundle_folder = st.selectbox(
+            "Reports to include",
+            bundle_folders,
+            format_func=lambda folder: "All saved reports" if folder == report_retention.reports_dir
+            else os.path.relpath(folder, report_retention.reports_dir),
+            key="bundle_folder",
         )
+        bundle_today_only = st.checkbox("Only reports from today", key="bundle_today_only")
+        if st.button("🗜️ Build ZIP", key="build_report_bundle", use_container_width=True):
+            since = datetime.combine(date.today(), datetime.min.time()) if bundle_today_only else None
+            bundle_entries = folder_report_entries(bundle_folder, since=since)
+            if not bundle_entries:
+                st.warning("No reports match this selection.")
+            else:
+                # Streamed to a file a chunk at a time; only the click on Download reads it back. The
+                # session's previous bundle is replaced, and the retention sweep removes bundles that
+                # outlive their session (STALE_BUNDLE_SECONDS)
+                previous_bundle = st.session_state.get("report_bundle")
+                if previous_bundle and os.path.exists(previous_bundle["path"]):
+                    os.remove(previous_bundle["path"])
+                bundles_folder = bundle_dir(report_retention.reports_dir)
+                os.makedirs(bundles_folder, exist_ok=True)
+                bundle_label = "reports" if bundle_folder == report_retention.reports_dir else os.path.basename(bundle_folder)
+                bundle_name = bundle_filename(bundle_label)
+                bundle_path = os.path.join(bundles_folder, f"{st.session_state.session_id}_{bundle_name}")
+                started = time.perf_counter()
+                bundle_size = write_zip_bundle(bundle_entries, bundle_path)
+                st.session_state.report_bundle = {
+                    "path": bundle_path,
+                    "file_name": bundle_name,
+                    "reports": len(bundle_entries),
+                    "bytes": bundle_size,
+                    "seconds": time.perf_counter() - started,
+                }
 
-def add_objective_5_no():
-    st.session_state.button_data["objective_5_comment"] += get_objective_text("objective_5_information_validity", "no") + "\n"
+        report_bundle = st.session_state.get("report_bundle")
+        if report_bundle and os.path.exists(report_bundle["path"]):
+            st.caption(
+                f"{report_bundle['reports']} reports, {report_bundle['bytes'] / (1024 * 1024):.1f} MB "
+                f"(built in {report_bundle['seconds']:.1f}s)"
+            )
+            st.download_button(
+                label="📥 Download ZIP",
+                data=lambda bundle_path=report_bundle["path"]: read_bundle(bundle_path),
+                file_name=report_bundle["file_name"],
+                mime="application/zip",
+                key="download_report_bundle",
+                use_container_width=True,
+            )
+
+# Sidebar: Batch generation for multi-employer DataFiles
+with st.sidebar.expander("📦 Batch Reports"):
+    st.caption(
+        "Generates one report per UIF reference in a multi-employer DataFile. "
+        "Findings, scope, objective and compliance sections from this form are applied to every employer, "
+        "with their {{variables}} filled in from each employer's own data."
+    )
+    batch_file = st.file_uploader("Upload multi-employer DataFile", type=["xlsx"], key="batch_datafile")
+    batch_running = st.session_state.get("batch_job_id") is not None
+    if batch_file is not None and st.button("⚙️ Generate All Reports", key="generate_batch_reports",
+                                            use_container_width=True, disabled=batch_running):
+        try:
+            # One streamed read and one grouped aggregation pass for every employer in the file
+            batch_df, batch_columns = read_datafile(io.BytesIO(batch_file.getvalue()))
+            employer_summaries, skipped_rows = summarize_employers(batch_df, batch_columns)
+            if skipped_rows:
+                st.warning(f"{skipped_rows} rows without a UIF reference were skipped")
+
+            # Each employer's context fills the shared helper texts with its own fields; the reports
+            # render on the shared worker pool, so the page stays responsive while they are written
+            address_book = get_shared_address_book()
+            batch_shared_fields = get_batch_shared_fields()
+            batch_dir = batch_output_dir()
+            batch_reports = []
+            for summary in employer_summaries:
+                address, province = address_book.lookup(summary["uif_reg_number"])
+                batch_reports.append((
+                    build_employer_context(summary, address, province, batch_shared_fields),
+                    employer_report_path(batch_dir, summary),
+                ))
+            st.session_state.batch_job_id = get_report_jobs(template_path).submit_batch(batch_reports, batch_dir)
+            st.session_state.batch_result = None
+        except Exception as e:
+            st.error(f"Error generating batch reports: {str(e)}")
+            st.session_state.batch_result = None
+
+    @st.fragment(run_every=1.0)
+    def show_batch_job_status():
+        """Poll the running batch; once every report is written, keep the results and rerun the page"""
+        batch = get_report_jobs(template_path).batch_status(st.session_state.batch_job_id)
+        if batch is not None and batch["finished_at"] is None:
+            last_result = batch["results"][-1] if batch["results"] else None
+            st.progress(
+                batch["done"] / batch["total"],
+                text=f"{batch['done']}/{batch['total']}"
+                + (f": {last_result['name_of_employer'] or last_result['uif_reg_number']}" if last_result else ""),
+            )
+            return
+        st.session_state.batch_job_id = None
+        st.session_state.batch_result = batch
+        rerun_page()
+
+    if st.session_state.get("batch_job_id") is not None:
+        show_batch_job_status()
+
+    batch_result = st.session_state.get("batch_result")
+    if batch_result:
+        batch_stats = batch_result["stats"]
+        st.success(
+            f"Generated {batch_stats['reports']} reports in {batch_stats['seconds']:.1f}s "
+            f"({batch_stats['reports_per_minute']:.0f} reports/min)"
+        )
+        st.caption(f"Saved to {batch_stats['output_dir']}")
+        failed_reports = [result for result in batch_result["results"] if result["error"]]
+        if failed_reports:
+            st.error(f"{len(failed_reports)} employers failed")
+            for result in failed_reports:
+                st.caption(f"{result['name_of_employer'] or result['uif_reg_number']}: {result['error']}")
+
+# End of a whole-page run: time it for the server time panel
+record_server_time("page", page_run_started)
@@ -0,0 +1,89 @@
+"""Measure how report throughput scales with the number of render worker processes.
+
+Usage:
+    python benchmark_report_workers.py DATAFILE [--reports N] [--workers 1,2,4] [--template PATH]
+
+Builds one context per employer in DATAFILE (cycled up to --reports, each made unique so nothing
+is served from a render cache), renders them in-process as a single-threaded baseline, then
+through a warm ReportJobQueue for each pool size and prints reports/second and the speedup.
+"""
+import argparse
+import os
+import sys
+import time
+
+from utils.batch import summarize_datafile_path
+from utils.report_context import build_employer_context
+from utils.report_generator import ReportGenerator
+from utils.report_jobs import ReportJobQueue
+
+
+def benchmark_contexts(datafile, reports):
+    summaries, _, _ = summarize_datafile_path(datafile)
+    if not summaries:
+        raise SystemExit(f"No employers found in {datafile}")
+    contexts = []
+    for i in range(reports):
+        context = build_employer_context(summaries[i % len(summaries)])
+        context["Affected_Employees"] = str(i)
+        contexts.append(context)
+    return contexts
+
+
+def run_pool(template_path, workers, contexts):
+    """Seconds for a warm pool of workers to render every context."""
+    report_jobs = ReportJobQueue(template_path, workers=workers)
+    try:
+        for future in report_jobs.warm():
+            future.result()
+        started = time.perf_counter()
+        job_ids = [report_jobs.submit(context) for context in contexts]
+        while any(report_jobs.status(job_id)["finished_at"] is None for job_id in job_ids):
+            time.sleep(0.01)
+        elapsed = time.perf_counter() - started
+        failed = sum(1 for job_id in job_ids if report_jobs.status(job_id)["status"] != "done")
+    finally:
+        report_jobs.shutdown()
+    if failed:
+        raise SystemExit(f"{failed} reports failed with {workers} workers")
+    return elapsed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark report rendering across worker pool sizes.")
+    parser.add_argument("datafile", help="DataFile .xlsx supplying the employers to render")
+    parser.add_argument("--reports", type=int, default=48, help="Reports rendered per pool size (default: 48)")
+    parser.add_argument("--workers", default=None,
+                        help="Comma-separated pool sizes (default: 1, 2, 4, ... up to the number of CPUs)")
+    parser.add_argument("--template", default="templates/UIF_Template.docx", help="Report template")
+    args = parser.parse_args(argv)
+
+    if args.workers:
+        pool_sizes = [int(size) for size in args.workers.split(",")]
+    else:
+        cpus = os.cpu_count() or 1
+        pool_sizes = [1]
+        while pool_sizes[-1] * 2 <= cpus:
+            pool_sizes.append(pool_sizes[-1] * 2)
+        if pool_sizes[-1] != cpus:
+            pool_sizes.append(cpus)
+
+    contexts = benchmark_contexts(args.datafile, args.reports)
+    print(f"{len(contexts)} reports per run, {os.cpu_count()} CPUs")
+
+    generator = ReportGenerator(args.template)
+    generator.render_report(dict(contexts[0], Affected_Employees="warm-up"))
+    started = time.perf_counter()
+    for context in contexts:
+        generator.render_report(dict(context))
+    baseline = time.perf_counter() - started
+    print(f"{'in-process':>12}: {len(contexts) / baseline:6.1f} reports/s")
+
+    for workers in pool_sizes:
+        elapsed = run_pool(args.template, workers, contexts)
+        print(f"{workers:>4} workers: {len(contexts) / elapsed:6.1f} reports/s  ({baseline / elapsed:.2f}x in-process)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
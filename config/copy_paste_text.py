@@ -14,8 +14,19 @@ Structure:
 - VERIFICATION_SCOPES: Text for various verification scopes
 - OBJECTIVES: Text for the 5 main objectives
 - MONTHLY_AMOUNTS: Helper text for monthly amounts
+- BATCH_DEFAULTS: Helper texts used for reports generated without the form (batch runs)
+- HELPER_SECTIONS: The form's helper-text sections and the buttons that add each text
+- TEMPLATE_VARIABLES: The {{variable}} placeholders texts may use and the form fields they take
+
+Texts are split into literal and {{variable}} segments once when this module loads; a
+{{...}} token that is not in TEMPLATE_VARIABLES is logged as a warning and left as typed.
 """
 
+import logging
+import re
+
+logger = logging.getLogger(__name__)
+
 # =============================================================================
 # MAIN FINDINGS SECTION
 # =============================================================================
@@ -162,14 +173,279 @@ UI_TEXT = {
     }
 }
 
+# =============================================================================
+# BATCH REPORT DEFAULTS
+# =============================================================================
+
+# Helper texts filled into each section when reports are generated without the form
+# (headless batch runs). Each entry names a text above as (group, option) or, for the
+# verification scope lists, (group, option, index). Sections left empty stay blank.
+BATCH_DEFAULTS = {
+    "main_findings": [],
+    "limitation_of_scope": [],
+    "compliance_comments": [
+        ("ui_act_compliance", "yes"),
+    ],
+    "overall_outcomes": [
+        ("positive", "payment_accuracy"),
+        ("positive", "employment_verification"),
+        ("positive", "documentation"),
+    ],
+    "payment_verification_scope": [
+        ("payment_verification", "yes", 0),
+        ("payment_verification", "yes", 1),
+    ],
+    "employment_verification_scope": [
+        ("employment_verification", "yes", 0),
+        ("employment_verification", "yes", 1),
+    ],
+    "claims_validity_scope": [
+        ("claims_validity", "yes"),
+    ],
+    "objective_1_comment": [("objective_1_employer_exists", "yes")],
+    "objective_2_comment": [("objective_2_employee_validity", "yes")],
+    "objective_3_comment": [("objective_3_payment_accuracy", "yes")],
+    "objective_4_comment": [("objective_4_funds_reached_beneficiaries", "yes")],
+    "objective_5_comment": [("objective_5_information_validity", "yes")]
+}
+
+# =============================================================================
+# FORM HELPER SECTIONS
+# =============================================================================
+
+# Every helper-text section of the form, in page order. The app draws each one from here: a
+# header, a description, optional refresh button, then columns of buttons (optionally headed)
+# and the text area they fill. A button is (widget key, label, entry), where entry names its
+# text exactly like the BATCH_DEFAULTS entries. Sections marked "replace" set the text to the
+# button's text instead of adding a line.
+HELPER_SECTIONS = {
+    "main_findings": {
+        "title": "🔍 Main Findings",
+        "description": "**Documents the key findings and issues discovered during the verification process.**",
+        "name": "Main Findings",
+        "replace": True,
+        "refresh": ("refresh_main_findings", "🔄 Refresh Main Findings with Current Form Data"),
+        "columns": [
+            (None, [("pos_finding", "💰 Underpayments", ("finding_1",))]),
+            (None, [("neg_finding", "👥 Ineligible Employee(s)", ("finding_2",))]),
+        ],
+    },
+    "limitation_of_scope": {
+        "title": "⚠️ Limitation of Scope",
+        "description": "**Documents any limitations or constraints that prevented complete verification of certain aspects.**",
+        "name": "Limitation of Scope",
+        "columns": [
+            (None, [("lim1", "📋 No Bank Statements", ("limitation_1",))]),
+            (None, [("lim2", "📋 No Contracts/IRP5s/IDs", ("limitation_2",))]),
+            (None, [("lim3", "📋 No Payroll/Payslips", ("limitation_3",))]),
+            (None, [("lim4", "📋 No EMP501/201", ("limitation_4",))]),
+        ],
+    },
+    "compliance_comments": {
+        "title": "📝 Compliance Comments",
+        "description": "**Tests whether the employer complied with UIF Act and Contributions Act requirements.**",
+        "name": "Compliance Comments",
+        "columns": [
+            (None, [("comp_yes", "✅ Add Compliance YES", ("ui_act_compliance", "yes"))]),
+            (None, [("comp_no", "❌ Add Compliance NO", ("ui_act_compliance", "no"))]),
+        ],
+    },
+    "payment_verification_scope": {
+        "title": "💳 Payment Verification Scope",
+        "description": "**Tests whether the employer received and disbursed the correct amounts from UIF to employees.**",
+        "name": "Payment Verification Scope",
+        "columns": [
+            ("**Positive Comments:**", [
+                ("pay_ver_yes_1", "✅ Correctly Received", ("payment_verification", "yes", 0)),
+                ("pay_ver_yes_2", "✅ Correctly Disbursed", ("payment_verification", "yes", 1)),
+            ]),
+            ("**Negative Comments:**", [
+                ("pay_ver_no_1", "❌ Incorrectly Received", ("payment_verification", "no", 0)),
+                ("pay_ver_no_2", "❌ Incorrectly Disbursed", ("payment_verification", "no", 1)),
+            ]),
+        ],
+    },
+    "employment_verification_scope": {
+        "title": "👥 Employment Verification Scope",
+        "description": "**Tests whether the employees claimed for were actually employed and eligible for TERS benefits.**",
+        "name": "Employment Verification Scope",
+        "columns": [
+            ("**Positive Comments:**", [
+                ("emp_ver_yes_1", "✅ Employment Confirmed", ("employment_verification", "yes", 0)),
+                ("emp_ver_yes_2", "✅ Pre-Lockdown Verified", ("employment_verification", "yes", 1)),
+            ]),
+            ("**Negative Comments:**", [
+                ("emp_ver_no_1", "❌ Employment Not Confirmed", ("employment_verification", "no", 0)),
+                ("emp_ver_no_2", "❌ Pre-Lockdown Not Verified", ("employment_verification", "no", 1)),
+            ]),
+        ],
+    },
+    "claims_validity_scope": {
+        "title": "📋 Claims Validity Scope",
+        "description": "**Tests whether the UIF claims submitted were accurate and valid according to fund guidelines.**",
+        "name": "Claims Validity Scope",
+        "columns": [
+            (None, [("claims_yes", "✅ Claims Valid", ("claims_validity", "yes"))]),
+            (None, [("claims_no", "❌ Claims Invalid", ("claims_validity", "no"))]),
+        ],
+    },
+    "objective_1_comment": {
+        "title": "🎯 Objective 1 - Employer Exists",
+        "description": "**Tests whether the employer who applied for COVID19 TERS funds actually exists as a business entity.**",
+        "name": "Objective 1 Comment",
+        "columns": [
+            (None, [("obj1_yes", "✅ Add Objective 1 YES", ("objective_1_employer_exists", "yes"))]),
+            (None, [("obj1_no", "❌ Add Objective 1 NO", ("objective_1_employer_exists", "no"))]),
+        ],
+    },
+    "objective_2_comment": {
+        "title": "🎯 Objective 2 - Employee Validity",
+        "description": "**Tests whether the employment of the employees applied for was valid and legitimate.**",
+        "name": "Objective 2 Comment",
+        "columns": [
+            (None, [("obj2_yes", "✅ Add Objective 2 YES", ("objective_2_employee_validity", "yes"))]),
+            (None, [("obj2_no", "❌ Add Objective 2 NO", ("objective_2_employee_validity", "no"))]),
+        ],
+    },
+    "objective_3_comment": {
+        "title": "🎯 Objective 3 - Payment Accuracy",
+        "description": "**Tests whether the accuracy of the payments made by the fund to the employer were correct.**",
+        "name": "Objective 3 Comment",
+        "columns": [
+            (None, [("obj3_yes", "✅ Add Objective 3 YES", ("objective_3_payment_accuracy", "yes"))]),
+            (None, [("obj3_no", "❌ Add Objective 3 NO", ("objective_3_payment_accuracy", "no"))]),
+        ],
+    },
+    "objective_4_comment": {
+        "title": "🎯 Objective 4 - Funds Reached Beneficiaries",
+        "description": "**Tests whether the COVID19 TERS funds actually reached the intended employee beneficiaries.**",
+        "name": "Objective 4 Comment",
+        "columns": [
+            (None, [("obj4_yes", "✅ Add Objective 4 YES", ("objective_4_funds_reached_beneficiaries", "yes"))]),
+            (None, [("obj4_no", "❌ Add Objective 4 NO", ("objective_4_funds_reached_beneficiaries", "no"))]),
+        ],
+    },
+    "objective_5_comment": {
+        "title": "🎯 Objective 5 - Information Validity",
+        "description": "**Tests whether the information submitted to the fund was accurate and valid according to MOA guidelines.**",
+        "name": "Objective 5 Comment",
+        "columns": [
+            (None, [("obj5_yes", "✅ Add Objective 5 YES", ("objective_5_information_validity", "yes"))]),
+            (None, [("obj5_no", "❌ Add Objective 5 NO", ("objective_5_information_validity", "no"))]),
+        ],
+    },
+    "overall_outcomes": {
+        "title": "📊 Overall Outcomes",
+        "description": "**Summarizes the overall results of the verification process and whether the employer met all requirements.**",
+        "name": "Overall Outcomes",
+        "refresh": ("refresh_outcomes", "🔄 Refresh with Current Form Data"),
+        "columns": [
+            ("**Positive Outcomes:**", [
+                ("outcomes_payment_pos", "✅ Payment Accuracy - Positive", ("positive", "payment_accuracy")),
+                ("outcomes_employment_pos", "✅ Employment Verification - Positive", ("positive", "employment_verification")),
+                ("outcomes_documentation_pos", "✅ Documentation - Positive", ("positive", "documentation")),
+            ]),
+            ("**Negative Outcomes:**", [
+                ("outcomes_payment_neg", "❌ Payment Accuracy - Negative", ("negative", "payment_accuracy")),
+                ("outcomes_employment_neg", "❌ Employment Verification - Negative", ("negative", "employment_verification")),
+                ("outcomes_documentation_neg", "❌ Documentation - Negative", ("negative", "documentation")),
+            ]),
+        ],
+    },
+}
+
 # =============================================================================
 # HELPER FUNCTIONS
 # =============================================================================
 
+# Placeholder -> (form_data field, value used when the field is missing)
+TEMPLATE_VARIABLES = {
+    "employee_count": ("Number_of_Employees", "XX"),
+    "total_amount": ("Amount_Verified_as_Accurate", "RXXXXX"),  # Backward compatibility
+    "affected_employees": ("Affected_Employees", "XX"),
+    "company_name": ("Name_of_Employer", "Company"),
+    "uif_number": ("UIF_REG_Number", "XXXXX"),
+    "period": ("Period_Claimed_For_Lockdown_Period", "period"),
+    "industry": ("Industry", "industry"),
+    "province": ("Province", "province"),
+    "total_verified": ("Total_Amount_Verified", "RXXXXX"),
+    "verified_amount": ("Amount_Verified_as_Accurate", "RXXXXX"),
+    "amount_not_disbursed": ("Amount_not_Disbursed", "RXXXXX"),
+    "verified_percentage": ("Verified_Percentage", "XX%"),
+    "Compliance_Documents_List": ("Compliance_Documents_List", "N/A"),
+    "compliance_documents_list": ("Compliance_Documents_List", "N/A"),  # Alternative format
+    "Compliance": ("Compliance_with_UI_Act_Provide_comments", "N/A"),
+    "compliance": ("Compliance_with_UI_Act_Provide_comments", "N/A"),  # Alternative format
+}
+
+_VARIABLE_PATTERN = re.compile(r"\{\{(\w+)\}\}")
+_TOKEN_PATTERN = re.compile(r"\{\{.*?\}\}")
+
+def compile_template(text):
+    """
+    Split text into its literal and {{variable}} segments.
+    
+    Args:
+        text (str): Text containing template variables like {{variable_name}}
+    
+    Returns:
+        tuple: (literals, fields) with one more literal than fields; fields are the
+        TEMPLATE_VARIABLES (form_data field, default) pairs found between the literals.
+        Tokens that are not template variables stay in the literals unchanged.
+    """
+    literals = []
+    fields = []
+    literal = ""
+    position = 0
+    for match in _VARIABLE_PATTERN.finditer(text):
+        field = TEMPLATE_VARIABLES.get(match.group(1))
+        literal += text[position:match.start()]
+        if field is None:
+            literal += match.group(0)
+        else:
+            literals.append(literal)
+            fields.append(field)
+            literal = ""
+        position = match.end()
+    literals.append(literal + text[position:])
+    return tuple(literals), tuple(fields)
+
+def _walk_texts(value, path):
+    """Yield (path, text) for every string in a nested dict/list of texts."""
+    if isinstance(value, str):
+        yield path, value
+    elif isinstance(value, dict):
+        for key, item in value.items():
+            yield from _walk_texts(item, f"{path}[{key!r}]")
+    elif isinstance(value, (list, tuple)):
+        for index, item in enumerate(value):
+            yield from _walk_texts(item, f"{path}[{index}]")
+
+def _compile_config_texts():
+    """Pre-split every text in the copy-paste sections, warning about unknown {{...}} tokens."""
+    compiled = {}
+    sections = {
+        "FINDINGS": FINDINGS, "COMPLIANCE": COMPLIANCE, "OVERALL_OUTCOMES": OVERALL_OUTCOMES,
+        "VERIFICATION_SCOPES": VERIFICATION_SCOPES, "OBJECTIVES": OBJECTIVES,
+    }
+    for name, section in sections.items():
+        for path, text in _walk_texts(section, name):
+            for token in _TOKEN_PATTERN.findall(text):
+                if token[2:-2] not in TEMPLATE_VARIABLES:
+                    logger.warning("Unknown template variable %s in %s; it will be left as typed", token, path)
+            compiled[text] = compile_template(text)
+    return compiled
+
+# Every copy-paste text, split into literal and variable segments
+_COMPILED_TEXTS = _compile_config_texts()
+
 def substitute_template_variables(text, form_data):
     """
     Substitute template variables in text with actual values from form data.
     
+    Texts from this file are split into segments once at import, so substituting
+    one is a single join; any other text (e.g. edited by the user) is split first.
+    
     Args:
         text (str): Text containing template variables like {{variable_name}}
         form_data (dict): Dictionary containing form data with actual values
@@ -180,32 +456,18 @@ def substitute_template_variables(text, form_data):
     if not text or not form_data:
         return text
     
-    # Define the template variable mappings
-    template_mappings = {
-        "{{employee_count}}": form_data.get("Number_of_Employees", "XX"),
-        "{{total_amount}}": form_data.get("Amount_Verified_as_Accurate", "RXXXXX"),  # Backward compatibility
-        "{{affected_employees}}": form_data.get("Affected_Employees", "XX"),
-        "{{company_name}}": form_data.get("Name_of_Employer", "Company"),
-        "{{uif_number}}": form_data.get("UIF_REG_Number", "XXXXX"),
-        "{{period}}": form_data.get("Period_Claimed_For_Lockdown_Period", "period"),
-        "{{industry}}": form_data.get("Industry", "industry"),
-        "{{province}}": form_data.get("Province", "province"),
-        "{{total_verified}}": form_data.get("Total_Amount_Verified", "RXXXXX"),
-        "{{verified_amount}}": form_data.get("Amount_Verified_as_Accurate", "RXXXXX"),
-        "{{amount_not_disbursed}}": form_data.get("Amount_not_Disbursed", "RXXXXX"),
-        "{{verified_percentage}}": form_data.get("Verified_Percentage", "XX%"),
-        "{{Compliance_Documents_List}}": form_data.get("Compliance_Documents_List", "N/A"),
-        "{{compliance_documents_list}}": form_data.get("Compliance_Documents_List", "N/A"),  # Alternative format
-        "{{Compliance}}": form_data.get("Compliance_with_UI_Act_Provide_comments", "N/A"),
-        "{{compliance}}": form_data.get("Compliance_with_UI_Act_Provide_comments", "N/A")  # Alternative format
-    }
-    
-    # Replace all template variables
-    substituted_text = text
-    for placeholder, value in template_mappings.items():
-        substituted_text = substituted_text.replace(placeholder, str(value))
+    compiled = _COMPILED_TEXTS.get(text)
+    if compiled is None:
+        compiled = compile_template(text)
+    literals, fields = compiled
+    if not fields:
+        return text
     
-    return substituted_text
+    segments = [literals[0]]
+    for (field, default), literal in zip(fields, literals[1:]):
+        segments.append(str(form_data.get(field, default)))
+        segments.append(literal)
+    return "".join(segments)
 
 def get_finding_text(finding_type, option=None, form_data=None):
     """
@@ -319,3 +581,44 @@ def get_monthly_amount_helper_text(amount):
     if amount and amount != MONTHLY_AMOUNTS["no_claim_text"]:
         return MONTHLY_AMOUNTS["helper_text"].format(amount=amount)
     return ""
+
+# Text lookup per section for BATCH_DEFAULTS / HELPER_SECTIONS entries (objective sections use get_objective_text)
+_SECTION_TEXT_GETTERS = {
+    "main_findings": lambda entry, form_data: get_finding_text("main_findings", entry[0], form_data),
+    "limitation_of_scope": lambda entry, form_data: get_finding_text("limitations", entry[0]),
+    "compliance_comments": lambda entry, form_data: get_compliance_text(*entry),
+    "overall_outcomes": lambda entry, form_data: get_overall_outcome_text(*entry, form_data=form_data),
+    "payment_verification_scope": lambda entry, form_data: get_verification_scope_text(*entry, form_data=form_data),
+    "employment_verification_scope": lambda entry, form_data: get_verification_scope_text(*entry, form_data=form_data),
+    "claims_validity_scope": lambda entry, form_data: get_verification_scope_text(*entry, form_data=form_data),
+}
+
+def get_section_text(section, entry, form_data=None):
+    """
+    Get the helper text one entry names for a section.
+    
+    Args:
+        section (str): Section name (a key of BATCH_DEFAULTS / HELPER_SECTIONS)
+        entry (tuple): (group, option) or, for the verification scope lists, (group, option, index)
+        form_data (dict): Optional form data for template variable substitution
+    
+    Returns:
+        str: The requested text
+    """
+    get_text = _SECTION_TEXT_GETTERS.get(section, lambda entry, form_data: get_objective_text(*entry))
+    return get_text(entry, form_data)
+
+def get_batch_default_texts(form_data=None):
+    """
+    Get the default helper text for every section, as configured in BATCH_DEFAULTS.
+    
+    Args:
+        form_data (dict): Optional form data for template variable substitution
+    
+    Returns:
+        dict: Section name -> text, one line per configured helper text (as the form buttons add them)
+    """
+    return {
+        section: "".join(get_section_text(section, entry, form_data) + "\n" for entry in entries)
+        for section, entries in BATCH_DEFAULTS.items()
+    }
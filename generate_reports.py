@@ -0,0 +1,102 @@
+"""Generate UIF reports for every employer in a folder of DataFiles, without Streamlit.
+
+Usage:
+    python generate_reports.py INPUT_DIR [--output-dir DIR] [--workers N] [--template PATH]
+                               [--no-address-book] [--no-manifest] [--log-timings]
+
+Each DataFile may hold one or many employers (grouped by UIF reference). Employers are rendered
+in parallel on a process pool; helper-text sections are filled from BATCH_DEFAULTS in
+config/copy_paste_text.py.
+
+Progress is checkpointed in <output-dir>/manifest.sqlite. Running again with the same
+--output-dir resumes: unchanged DataFiles and reports that already completed are skipped and only
+failed or changed work is redone.
+"""
+import argparse
+import logging
+import os
+import sys
+
+from utils.address_book import AddressBook
+from utils.batch import batch_output_dir, generate_folder_reports
+from utils.manifest import BatchManifest
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate UIF reports for a folder of DataFiles.")
+    parser.add_argument("input_dir", help="Folder containing DataFile .xlsx files")
+    parser.add_argument("--output-dir", help="Where to write reports (default: generated_reports/batch_<timestamp>)")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: number of CPUs)")
+    parser.add_argument("--template", default="templates/UIF_Template.docx", help="Report template")
+    parser.add_argument("--no-address-book", action="store_true", help="Skip address and province lookup")
+    parser.add_argument("--no-manifest", action="store_true",
+                        help="Do not checkpoint progress; every report is rendered again")
+    parser.add_argument("--log-timings", action="store_true",
+                        help="Write one JSON line per report with its phase timings to stderr")
+    args = parser.parse_args(argv)
+
+    if not os.path.isdir(args.input_dir):
+        parser.error(f"{args.input_dir} is not a folder")
+    if not os.path.exists(args.template):
+        parser.error(f"Template not found at {args.template}")
+    if args.log_timings:
+        # Forked worker processes inherit this configuration
+        logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    address_book = None
+    if not args.no_address_book:
+        address_book = AddressBook()
+        if address_book.status == "ok":
+            print(f"Address book: {len(address_book)} UIF references ({address_book.stats.get('source')})")
+        else:
+            print(f"Address book not loaded ({address_book.status}); continuing without address enrichment")
+            address_book = None
+
+    def report_file(result):
+        name = os.path.basename(result["path"])
+        if result["errors"] and not result["employers"]:
+            print(f"{name}: FAILED - {result['errors'][0]}")
+            return
+        failed = f", {result['failed']} failed" if result["failed"] else ""
+        skipped = f", {result['skipped']} already done" if result["skipped"] else ""
+        print(
+            f"{name}: {result['reports']}/{result['employers']} reports{failed}{skipped}"
+            f" | read {result['read_seconds']:.2f}s, render {result['render_seconds']:.2f}s"
+            f" | done at {result['seconds']:.1f}s"
+        )
+        if result["skipped_rows"]:
+            print(f"  {result['skipped_rows']} rows without a UIF reference skipped")
+        for error in result["errors"]:
+            print(f"  error: {error}")
+
+    output_dir = args.output_dir or batch_output_dir()
+    manifest = None if args.no_manifest else BatchManifest.for_output_dir(output_dir)
+    try:
+        _, stats = generate_folder_reports(
+            args.input_dir, args.template, output_dir=output_dir, workers=args.workers,
+            address_book=address_book, on_file_done=report_file, manifest=manifest,
+        )
+    finally:
+        if manifest is not None:
+            manifest.close()
+    print(
+        f"Generated {stats['reports']} reports for {stats['employers']} employers from {stats['files']} DataFiles "
+        f"in {stats['seconds']:.1f}s ({stats['reports_per_minute']:.0f} reports/min) -> {stats['output_dir']}"
+    )
+    if stats["reports"]:
+        phases = ", ".join(
+            f"{phase} {seconds / stats['reports'] * 1000:.0f}ms" for phase, seconds in stats["phase_seconds"].items()
+        )
+        print(f"Average per report: {phases}")
+    if stats["skipped"]:
+        print(f"{stats['skipped']} reports already done in an earlier run were skipped")
+    if stats["failed"] or stats["unreadable_files"]:
+        print(f"{stats['failed']} reports failed, {stats['unreadable_files']} DataFiles could not be read")
+        if manifest is not None:
+            print(f"Re-run with --output-dir {output_dir} to retry only the failures")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
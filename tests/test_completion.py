@@ -0,0 +1,150 @@
+import copy
+import pickle
+import random
+
+import pytest
+
+from utils.completion import COMPANY_FIELDS, FINANCIAL_FIELDS, tracked_button_data, tracked_form_data
+
+
+def recount_fields(form_data, fields):
+    """The full recount the sidebar did before form_data counted its own fields."""
+    filled_count = 0
+    for field in fields:
+        field_value = form_data.get(field, "")
+        if field_value and str(field_value).strip() and field_value != "N/A":
+            filled_count += 1
+    percentage = (filled_count / len(fields) * 100) if len(fields) > 0 else 0
+    return {"filled": filled_count, "total": len(fields), "percentage": round(percentage, 1)}
+
+
+def recount_button_data(button_data):
+    filled_count = sum(1 for value in button_data.values() if value and str(value).strip())
+    total_count = len(button_data)
+    percentage = (filled_count / total_count * 100) if total_count > 0 else 0
+    return {"filled": filled_count, "total": total_count, "percentage": round(percentage, 1)}
+
+
+def recount_monthly_data(form_data):
+    if "monthly_data" not in form_data:
+        return {"filled": 0, "total": 0, "percentage": 0}
+    monthly_data = form_data["monthly_data"]
+    filled_months = 0
+    total_months = 0
+    for month_key in monthly_data.keys():
+        if month_key.endswith("_claim") or month_key.endswith("_payment"):
+            month_base = month_key.replace("_claim", "").replace("_payment", "")
+            if month_base not in [key.replace("_claim", "").replace("_payment", "") for key in monthly_data.keys() if key != month_key]:
+                continue
+            claim_key = f"{month_base}_claim"
+            payment_key = f"{month_base}_payment"
+            if claim_key in monthly_data and payment_key in monthly_data:
+                total_months += 1
+                if monthly_data[claim_key] and monthly_data[payment_key]:
+                    filled_months += 1
+    percentage = (filled_months / total_months * 100) if total_months > 0 else 0
+    return {"filled": filled_months, "total": total_months, "percentage": percentage}
+
+
+def assert_form_data_matches(form_data):
+    assert form_data.completion("company_details") == recount_fields(form_data, COMPANY_FIELDS)
+    assert form_data.completion("financials") == recount_fields(form_data, FINANCIAL_FIELDS)
+    assert form_data.completion("monthly_data") == recount_monthly_data(form_data)
+
+
+def assert_button_data_matches(button_data):
+    assert button_data.completion("findings") == recount_button_data(button_data)
+
+
+FORM_KEYS = COMPANY_FIELDS + FINANCIAL_FIELDS + ("Other_Field", "completion_status")
+BUTTON_KEYS = ("Main_Findings", "Limitations", "Compliance", "Objectives", "Outcomes", "Extra")
+VALUES = ("", "   ", "N/A", None, 0, "0", 12, "Acme & Sons", "x", [], ["a"])
+
+
+def random_monthly_data(rng):
+    monthly_data = {}
+    for month in ("2020_04", "2020_05", "2020_06"):
+        for suffix in rng.sample(("_claim", "_payment"), rng.randrange(3)):
+            monthly_data[month + suffix] = rng.choice((0, 0.0, "", 100.5, 250))
+    return monthly_data
+
+
+def random_operation(rng, data, keys, values):
+    operation = rng.randrange(9)
+    key = rng.choice(keys)
+    if operation <= 2:
+        data[key] = values(rng, key)
+    elif operation == 3:
+        if key in data:
+            del data[key]
+    elif operation == 4:
+        data.update({key: values(rng, key) for key in rng.sample(keys, rng.randrange(4))})
+    elif operation == 5:
+        data |= {key: values(rng, key)}
+    elif operation == 6:
+        data.setdefault(key, values(rng, key))
+    elif operation == 7:
+        data.pop(key, None)
+    elif data and rng.random() < 0.5:
+        data.popitem()
+    elif rng.random() < 0.1:
+        data.clear()
+
+
+def random_form_value(rng, key=None):
+    if key == "monthly_data":
+        # Always a dict in the app
+        return random_monthly_data(rng)
+    return rng.choice(VALUES)
+
+
+def test_form_data_counters_match_full_recount():
+    rng = random.Random(23)
+    keys = FORM_KEYS + ("monthly_data",)
+    for _ in range(50):
+        form_data = tracked_form_data({key: random_form_value(rng, key)
+                                       for key in rng.sample(keys, rng.randrange(len(keys)))})
+        assert_form_data_matches(form_data)
+        for _ in range(200):
+            random_operation(rng, form_data, keys, random_form_value)
+            assert_form_data_matches(form_data)
+
+
+def test_button_data_counters_match_full_recount():
+    rng = random.Random(25)
+    for _ in range(50):
+        button_data = tracked_button_data({section: "" for section in BUTTON_KEYS[:5]})
+        assert_button_data_matches(button_data)
+        for _ in range(200):
+            random_operation(rng, button_data, BUTTON_KEYS, random_form_value)
+            assert_button_data_matches(button_data)
+
+
+def test_empty_sections():
+    form_data = tracked_form_data()
+    assert_form_data_matches(form_data)
+    button_data = tracked_button_data()
+    assert button_data.completion("findings") == {"filled": 0, "total": 0, "percentage": 0}
+    assert_button_data_matches(button_data)
+
+
+def test_pop_missing_key():
+    form_data = tracked_form_data({"Industry": "Retail"})
+    assert form_data.pop("Province", "default") == "default"
+    with pytest.raises(KeyError):
+        form_data.pop("Province")
+    assert form_data.completion("company_details")["filled"] == 1
+
+
+@pytest.mark.parametrize("copier", [copy.deepcopy, copy.copy, lambda data: pickle.loads(pickle.dumps(data))])
+def test_copies_keep_counting(copier):
+    form_data = tracked_form_data({"Industry": "Retail", "Province": "N/A", "Total_Amount_Verified": 10,
+                                   "monthly_data": {"2020_04_claim": 1, "2020_04_payment": 2}})
+    copied = copier(form_data)
+    assert copied == form_data
+    assert_form_data_matches(copied)
+    copied["Province"] = "Gauteng"
+    copied["monthly_data"] = {}
+    assert_form_data_matches(copied)
+    assert_form_data_matches(form_data)
+    assert form_data.completion("company_details")["filled"] == 1
@@ -0,0 +1,123 @@
+import logging
+import random
+
+import pytest
+
+from config import copy_paste_text
+from config.copy_paste_text import (
+    TEMPLATE_VARIABLES, _COMPILED_TEXTS, _compile_config_texts, compile_template,
+    get_batch_default_texts, substitute_template_variables,
+)
+
+
+def replace_template_variables(text, form_data):
+    """The str.replace substitution used before texts were compiled."""
+    if not text or not form_data:
+        return text
+    template_mappings = {
+        "{{employee_count}}": form_data.get("Number_of_Employees", "XX"),
+        "{{total_amount}}": form_data.get("Amount_Verified_as_Accurate", "RXXXXX"),
+        "{{affected_employees}}": form_data.get("Affected_Employees", "XX"),
+        "{{company_name}}": form_data.get("Name_of_Employer", "Company"),
+        "{{uif_number}}": form_data.get("UIF_REG_Number", "XXXXX"),
+        "{{period}}": form_data.get("Period_Claimed_For_Lockdown_Period", "period"),
+        "{{industry}}": form_data.get("Industry", "industry"),
+        "{{province}}": form_data.get("Province", "province"),
+        "{{total_verified}}": form_data.get("Total_Amount_Verified", "RXXXXX"),
+        "{{verified_amount}}": form_data.get("Amount_Verified_as_Accurate", "RXXXXX"),
+        "{{amount_not_disbursed}}": form_data.get("Amount_not_Disbursed", "RXXXXX"),
+        "{{verified_percentage}}": form_data.get("Verified_Percentage", "XX%"),
+        "{{Compliance_Documents_List}}": form_data.get("Compliance_Documents_List", "N/A"),
+        "{{compliance_documents_list}}": form_data.get("Compliance_Documents_List", "N/A"),
+        "{{Compliance}}": form_data.get("Compliance_with_UI_Act_Provide_comments", "N/A"),
+        "{{compliance}}": form_data.get("Compliance_with_UI_Act_Provide_comments", "N/A"),
+    }
+    substituted_text = text
+    for placeholder, value in template_mappings.items():
+        substituted_text = substituted_text.replace(placeholder, str(value))
+    return substituted_text
+
+
+FIELDS = sorted({field for field, _ in TEMPLATE_VARIABLES.values()})
+# Form values never contain braces here: the old function could expand a value (or a value joined
+# with the text after it) as another placeholder, see test_form_values_are_not_expanded_again
+VALUES = ("", "Acme & Sons (Pty) Ltd", "R 1,234.50", 0, 42, None, "N/A", "Gauteng", "line one\nline two")
+TOKENS = ["{{%s}}" % name for name in TEMPLATE_VARIABLES] + [
+    "{{unknown}}", "{{ company_name }}", "{{company_name}", "{company_name}}", "{{}}", "{{{company_name}}}",
+    "{{Company_Name}}", "{{company-name}}", "{{", "}}",
+]
+
+
+def random_form_data(rng):
+    return {field: rng.choice(VALUES) for field in rng.sample(FIELDS, rng.randrange(len(FIELDS) + 1))}
+
+
+def random_text(rng):
+    pieces = []
+    for _ in range(rng.randrange(12)):
+        pieces.append(rng.choice(TOKENS) if rng.random() < 0.5 else rng.choice(("", " ", "the ", "R", "\n", "{", "}")))
+    return "".join(pieces)
+
+
+def test_config_texts_match_str_replace():
+    assert len(_COMPILED_TEXTS) > 30
+    rng = random.Random(25)
+    form_datas = [{}, None] + [random_form_data(rng) for _ in range(40)]
+    for text in _COMPILED_TEXTS:
+        for form_data in form_datas:
+            assert substitute_template_variables(text, form_data) == replace_template_variables(text, form_data)
+
+
+def test_free_text_matches_str_replace():
+    rng = random.Random(2025)
+    for _ in range(5000):
+        text = random_text(rng)
+        form_data = random_form_data(rng)
+        assert substitute_template_variables(text, form_data) == replace_template_variables(text, form_data), text
+
+
+@pytest.mark.parametrize("text", ["", None, "no variables", "{{company_name}}"])
+def test_empty_text_or_form_data_is_returned_as_is(text):
+    for form_data in ({}, None):
+        assert substitute_template_variables(text, form_data) is text
+
+
+def test_form_values_are_not_expanded_again():
+    form_data = {"Name_of_Employer": "{{industry}}", "Industry": "Retail"}
+    assert substitute_template_variables("{{company_name}} in {{industry}}", form_data) == "{{industry}} in Retail"
+
+
+def test_compile_template_segments():
+    assert compile_template("a {{company_name}} b {{unknown}} c {{province}}") == (
+        ("a ", " b {{unknown}} c ", ""),
+        (("Name_of_Employer", "Company"), ("Province", "province")),
+    )
+    assert compile_template("") == (("",), ())
+
+
+def test_unknown_config_tokens_are_logged(monkeypatch, caplog):
+    monkeypatch.setitem(copy_paste_text.FINDINGS, "test_text", "For {{company_name}} in {{region}} and {{ province }}")
+    with caplog.at_level(logging.WARNING, logger=copy_paste_text.logger.name):
+        compiled = _compile_config_texts()
+    messages = [record.getMessage() for record in caplog.records]
+    assert messages == [
+        "Unknown template variable {{region}} in FINDINGS['test_text']; it will be left as typed",
+        "Unknown template variable {{ province }} in FINDINGS['test_text']; it will be left as typed",
+    ]
+    text = copy_paste_text.FINDINGS["test_text"]
+    assert substitute_template_variables(text, {"Name_of_Employer": "Acme"}) == "For Acme in {{region}} and {{ province }}"
+    assert compiled[text] == compile_template(text)
+
+
+def test_shipped_config_texts_have_no_unknown_tokens(caplog):
+    with caplog.at_level(logging.WARNING, logger=copy_paste_text.logger.name):
+        _compile_config_texts()
+    assert caplog.records == []
+
+
+def test_batch_default_texts_match_str_replace(monkeypatch):
+    rng = random.Random(8)
+    form_datas = [None, {}] + [random_form_data(rng) for _ in range(10)]
+    compiled = [get_batch_default_texts(form_data) for form_data in form_datas]
+    monkeypatch.setattr(copy_paste_text, "substitute_template_variables", replace_template_variables)
+    assert compiled == [get_batch_default_texts(form_data) for form_data in form_datas]
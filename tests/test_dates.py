@@ -0,0 +1,93 @@
+import random
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+from utils.dates import excel_serial_to_datetime, to_datetime_column, to_month_period
+
+
+def serial_to_date(serial):
+    """The per-cell conversion the upload handler used before to_datetime_column()."""
+    if pd.isna(serial):
+        return None
+    if isinstance(serial, (pd.Timestamp, datetime)):
+        return serial
+    try:
+        base = datetime(1899, 12, 30)
+        return base + timedelta(days=int(float(serial)))
+    except (ValueError, TypeError):
+        try:
+            return pd.to_datetime(serial)
+        except Exception:
+            return None
+
+
+def assert_matches_per_cell(values):
+    series = pd.Series(values, index=range(10, 10 + len(values)))
+    converted = to_datetime_column(series)
+    assert converted.dtype == "datetime64[ns]"
+    assert list(converted.index) == list(series.index)
+    for value, result in zip(series, converted):
+        expected = serial_to_date(value)
+        if expected is None or pd.isna(expected):
+            assert pd.isna(result), value
+        else:
+            assert result == pd.Timestamp(expected), value
+
+
+def random_cell(rng):
+    kind = rng.randrange(9)
+    serial = rng.uniform(40000, 46000)
+    day = datetime(2020, 3, 27) + timedelta(days=rng.randrange(500), hours=rng.randrange(24))
+    if kind == 0:
+        return serial
+    if kind == 1:
+        return int(serial)
+    if kind == 2:
+        return str(int(serial))
+    if kind == 3:
+        return f"{serial:.3f}"
+    if kind == 4:
+        return day.strftime(rng.choice(["%Y-%m-%d", "%d %B %Y", "%Y/%m/%d %H:%M"]))
+    if kind == 5:
+        return pd.Timestamp(day)
+    if kind == 6:
+        return day
+    if kind == 7:
+        return rng.choice([None, np.nan, pd.NaT])
+    return rng.choice(["not a date", "N/A", "", "31/31/2020"])
+
+
+def test_numeric_serials_match_per_cell_conversion():
+    rng = random.Random(2)
+    floats = [rng.uniform(-1000, 60000) for _ in range(500)] + [np.nan, 0.0, 60.0, 61.0, 43951.999]
+    assert_matches_per_cell(floats)
+    assert_matches_per_cell([rng.randrange(1, 60000) for _ in range(500)])
+
+
+def test_mixed_object_columns_match_per_cell_conversion():
+    rng = random.Random(3)
+    for _ in range(50):
+        assert_matches_per_cell([random_cell(rng) for _ in range(rng.randrange(1, 80))])
+
+
+def test_datetime_columns_pass_through():
+    days = pd.Series(pd.date_range("2020-03-27", periods=40, freq="13h"))
+    assert_matches_per_cell(list(days))
+    converted = to_datetime_column(days.dt.tz_localize("Africa/Johannesburg"))
+    assert converted.dt.tz is None
+    assert (converted == days).all()
+
+
+def test_out_of_range_serials_become_nat():
+    # The per-cell conversion raised OverflowError for these
+    converted = to_datetime_column(pd.Series([1e12, -1e12, 43951.0]))
+    assert converted.isna().tolist() == [True, True, False]
+    assert pd.isna(excel_serial_to_datetime([np.inf])[0])
+
+
+def test_to_month_period():
+    periods = to_month_period(pd.Series([43951, "2020-05-31", None]))
+    assert periods.tolist()[:2] == [pd.Period("2020-04", "M"), pd.Period("2020-05", "M")]
+    assert pd.isna(periods.iloc[2])
@@ -0,0 +1,87 @@
+import io
+import zipfile
+
+import docx
+import pytest
+from docxtpl import DocxTemplate
+from jinja2 import TemplateError
+
+from utils.datafile import MONTHLY_CLAIM_KEYS
+from utils.docx_template import CompiledTemplate
+from utils.report_context import build_employer_context
+from utils.report_generator import sanitize_for_xml
+
+TEMPLATE_PATH = "templates/UIF_Template.docx"
+
+
+def employer_context():
+    monthly_claims = {month: "N/A" for month in MONTHLY_CLAIM_KEYS}
+    monthly_claims.update({"April_2020": "R 1200.5", "May_2020": "R 980.0", "Aug_2020": "R 450.25"})
+    summary = {
+        "name_of_employer": "Acme & Sons <Pty> Ltd",
+        "uif_reg_number": "1234567/8",
+        "industry": "Retail",
+        "number_of_employees": 12,
+        "period_claimed": "27 March 2020 to 30 April 2020, 1 May 2020 to 31 May 2020",
+        "total_amount_verified": 2630.75,
+        "monthly_claims": monthly_claims,
+        "iteration_counts": [10, 11, 9],
+        "gaps_flag": "Yes",
+    }
+    context = build_employer_context(summary, "1 Main Road, Cape Town", "Western Cape")
+    context["monthly_amounts"] = [
+        {"month": "April 2020", "amount": "R 1200.5", "payment": "R 1200.5"},
+        {"month": "May 2020", "amount": "R 980.0", "payment": ""},
+    ]
+    return sanitize_for_xml(context)[0]
+
+
+def rendered_parts(document):
+    buffer = io.BytesIO()
+    document.save(buffer)
+    with zipfile.ZipFile(buffer) as archive:
+        return {name: archive.read(name) for name in archive.namelist()}
+
+
+def test_clone_renders_same_parts_as_docxtpl():
+    context = employer_context()
+    stock = DocxTemplate(TEMPLATE_PATH)
+    stock.render(dict(context))
+    clone = CompiledTemplate(TEMPLATE_PATH).clone()
+    clone.render(dict(context))
+
+    expected = rendered_parts(stock)
+    actual = rendered_parts(clone)
+    assert sorted(actual) == sorted(expected)
+    for name in expected:
+        assert actual[name] == expected[name], name
+
+
+def test_clone_can_render_repeatedly():
+    compiled = CompiledTemplate(TEMPLATE_PATH)
+    context = employer_context()
+    first = compiled.clone()
+    first.render(dict(context))
+    second = compiled.clone()
+    second.render(dict(context, Name_of_Employer="Other Employer"))
+    assert rendered_parts(first) != rendered_parts(second)
+    again = compiled.clone()
+    again.render(dict(context))
+    assert rendered_parts(again) == rendered_parts(first)
+
+
+def test_template_errors_carry_docx_context(tmp_path):
+    path = tmp_path / "broken.docx"
+    document = docx.Document()
+    document.add_paragraph("Before the error")
+    document.add_paragraph("Employer: {{ Name_of_Employer | }}")
+    document.add_paragraph("After the error")
+    document.save(path)
+
+    with pytest.raises(TemplateError) as stock_error:
+        DocxTemplate(str(path)).render({})
+    with pytest.raises(TemplateError) as clone_error:
+        CompiledTemplate(str(path)).clone().render({})
+
+    assert list(clone_error.value.docx_context) == list(stock_error.value.docx_context)
+    assert any("Name_of_Employer" in line for line in clone_error.value.docx_context)
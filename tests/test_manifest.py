@@ -0,0 +1,240 @@
+import os
+import sqlite3
+
+import pandas as pd
+import pytest
+
+from utils import batch
+from utils.batch import generate_folder_reports
+from utils.manifest import DONE, FAILED, PARTIAL, BatchManifest
+
+TEMPLATE_PATH = os.path.join(os.path.dirname(__file__), os.pardir, "templates", "UIF_Template.docx")
+
+
+@pytest.fixture
+def manifest(tmp_path):
+    manifest = BatchManifest.for_output_dir(str(tmp_path / "out"))
+    yield manifest
+    manifest.close()
+
+
+def write_report(tmp_path, name):
+    path = tmp_path / name
+    path.write_bytes(b"report")
+    return str(path)
+
+
+def record_done_file(manifest, tmp_path, datafile="a.xlsx", file_hash="h1", uifs=("U1", "U2")):
+    paths = {}
+    for uif in uifs:
+        paths[uif] = write_report(tmp_path, f"{datafile}_{uif}.docx")
+        manifest.record_report(datafile, uif, f"in-{uif}", DONE, paths[uif], 0.1)
+    manifest.record_datafile(datafile, file_hash, DONE, len(uifs), 0.2)
+    return paths
+
+
+def test_datafile_complete(manifest, tmp_path):
+    assert manifest.datafile_complete("a.xlsx", "h1") is None
+    paths = record_done_file(manifest, tmp_path)
+    assert manifest.datafile_complete("a.xlsx", "h1") == 2
+    # Changed content
+    assert manifest.datafile_complete("a.xlsx", "h2") is None
+    # Report file deleted since
+    os.remove(paths["U2"])
+    assert manifest.datafile_complete("a.xlsx", "h1") is None
+
+
+@pytest.mark.parametrize("status", [PARTIAL, FAILED])
+def test_datafile_not_done_is_not_complete(manifest, tmp_path, status):
+    record_done_file(manifest, tmp_path)
+    manifest.record_datafile("a.xlsx", "h1", status, 2)
+    assert manifest.datafile_complete("a.xlsx", "h1") is None
+
+
+def test_datafile_with_failed_or_missing_report_is_not_complete(manifest, tmp_path):
+    record_done_file(manifest, tmp_path)
+    manifest.record_report("a.xlsx", "U2", "in-U2", FAILED, None, 0.0, "boom")
+    assert manifest.datafile_complete("a.xlsx", "h1") is None
+    record_done_file(manifest, tmp_path)
+    manifest.forget_missing_reports("a.xlsx", ["U1"])
+    assert manifest.datafile_complete("a.xlsx", "h1") is None
+
+
+def test_completed_report(manifest, tmp_path):
+    paths = record_done_file(manifest, tmp_path)
+    assert manifest.completed_report("a.xlsx", "U1", "in-U1") == paths["U1"]
+    assert manifest.completed_report("a.xlsx", "U1", "changed") is None
+    assert manifest.completed_report("b.xlsx", "U1", "in-U1") is None
+    assert manifest.completed_report("a.xlsx", "U3", "in-U3") is None
+    manifest.record_report("a.xlsx", "U1", "in-U1", FAILED, None, 0.0, "boom")
+    assert manifest.completed_report("a.xlsx", "U1", "in-U1") is None
+    os.remove(paths["U2"])
+    assert manifest.completed_report("a.xlsx", "U2", "in-U2") is None
+
+
+def test_forget_missing_reports_and_completed_outputs(manifest, tmp_path):
+    a_paths = record_done_file(manifest, tmp_path, "a.xlsx", uifs=("U1", "U2", "U3"))
+    b_paths = record_done_file(manifest, tmp_path, "b.xlsx", uifs=("U1",))
+    manifest.forget_missing_reports("a.xlsx", ["U1", "U3"])
+    assert manifest.completed_report("a.xlsx", "U2", "in-U2") is None
+    assert manifest.completed_report("b.xlsx", "U1", "in-U1") == b_paths["U1"]
+    os.remove(a_paths["U3"])
+    assert manifest.completed_outputs() == [a_paths["U1"], b_paths["U1"]]
+
+
+def test_rows_survive_reopening(tmp_path):
+    manifest = BatchManifest.for_output_dir(str(tmp_path))
+    record_done_file(manifest, tmp_path)
+    manifest.close()
+    manifest = BatchManifest.for_output_dir(str(tmp_path))
+    try:
+        assert manifest.datafile_complete("a.xlsx", "h1") == 2
+    finally:
+        manifest.close()
+
+
+def write_datafile(path, employers, amount=1000.0):
+    rows = []
+    for number in employers:
+        for employee in range(3):
+            rows.append({
+                "TRADENAME": f"Employer {number}", "UIFREFERENCENUMBER": 1000000 + number,
+                "INDUSTRYSECTOR": "Retail", "ID_NUMBER": number * 10 + employee,
+                "SHUTDOWN_FROM": 44054, "SHUTDOWN_TILL": 44074, "BANK_PAY_AMOUNT": amount + employee,
+                "PAYMENT_STATUS": 3, "PAYMENT_MEDIUM": 1,
+            })
+    pd.DataFrame(rows).to_excel(path, index=False)
+
+
+def run_folder(input_dir, output_dir, with_manifest=True):
+    manifest = BatchManifest.for_output_dir(output_dir) if with_manifest else None
+    try:
+        file_results, stats = generate_folder_reports(
+            input_dir, TEMPLATE_PATH, output_dir=output_dir, workers=2, manifest=manifest,
+        )
+    finally:
+        if manifest is not None:
+            manifest.close()
+    return {os.path.basename(result["path"]): result for result in file_results}, stats
+
+
+def report_files(output_dir):
+    return sorted(
+        os.path.relpath(os.path.join(root, name), output_dir)
+        for root, _, names in os.walk(output_dir) for name in names if name.endswith(".docx")
+    )
+
+
+def test_folder_run_resumes_only_changed_work(tmp_path):
+    input_dir = tmp_path / "in"
+    input_dir.mkdir()
+    write_datafile(input_dir / "a.xlsx", [1, 2, 3])
+    write_datafile(input_dir / "b.xlsx", [4, 5])
+    output_dir = str(tmp_path / "out")
+    plain_dir = str(tmp_path / "plain")
+
+    results, stats = run_folder(str(input_dir), output_dir)
+    assert (stats["reports"], stats["skipped"], stats["failed"]) == (5, 0, 0)
+    # Same reports as a run without a manifest
+    _, plain_stats = run_folder(str(input_dir), plain_dir, with_manifest=False)
+    assert plain_stats["reports"] == 5
+    assert report_files(output_dir) == report_files(plain_dir)
+
+    # Nothing changed: both DataFiles are skipped without being read
+    results, stats = run_folder(str(input_dir), output_dir)
+    assert (stats["reports"], stats["skipped"]) == (0, 5)
+    assert all(result["read_seconds"] == 0.0 for result in results.values())
+
+    # A deleted report is rendered again, the rest of its DataFile is skipped
+    os.remove(os.path.join(output_dir, "a", "Employer_2_1000002.docx"))
+    results, stats = run_folder(str(input_dir), output_dir)
+    assert (results["a.xlsx"]["reports"], results["a.xlsx"]["skipped"]) == (1, 2)
+    assert (results["b.xlsx"]["reports"], results["b.xlsx"]["skipped"]) == (0, 2)
+    assert report_files(output_dir) == report_files(plain_dir)
+
+    # Changed inputs for one employer and a dropped employer: only the changed report renders
+    write_datafile(input_dir / "b.xlsx", [4], amount=2000.0)
+    write_datafile(input_dir / "a.xlsx", [1, 2])
+    results, stats = run_folder(str(input_dir), output_dir)
+    assert (results["a.xlsx"]["reports"], results["a.xlsx"]["skipped"]) == (0, 2)
+    assert (results["b.xlsx"]["reports"], results["b.xlsx"]["skipped"]) == (1, 0)
+    results, stats = run_folder(str(input_dir), output_dir)
+    assert (stats["reports"], stats["skipped"]) == (0, 3)
+
+
+def test_unreadable_datafile_is_retried(tmp_path):
+    input_dir = tmp_path / "in"
+    input_dir.mkdir()
+    (input_dir / "broken.xlsx").write_bytes(b"not a workbook")
+    output_dir = str(tmp_path / "out")
+    results, stats = run_folder(str(input_dir), output_dir)
+    assert stats["unreadable_files"] == 1
+    write_datafile(input_dir / "broken.xlsx", [7])
+    results, stats = run_folder(str(input_dir), output_dir)
+    assert (stats["unreadable_files"], stats["reports"]) == (0, 1)
+
+
+def test_malformed_summary_fails_only_its_report(tmp_path, monkeypatch):
+    def build_employer_context(summary, *args):
+        if summary["uif_reg_number"] == "1000002":
+            raise KeyError("monthly_claims")
+        return real_build_employer_context(summary, *args)
+
+    real_build_employer_context = batch.build_employer_context
+    monkeypatch.setattr(batch, "build_employer_context", build_employer_context)
+    input_dir = tmp_path / "in"
+    input_dir.mkdir()
+    write_datafile(input_dir / "a.xlsx", [1, 2, 3])
+    output_dir = str(tmp_path / "out")
+    results, stats = run_folder(str(input_dir), output_dir)
+    assert (stats["reports"], stats["failed"]) == (2, 1)
+    assert results["a.xlsx"]["errors"] == ["Employer 2: 'monthly_claims'"]
+    assert report_files(output_dir) == ["a/Employer_1_1000001.docx", "a/Employer_3_1000003.docx"]
+
+    # The failed employer is retried on the next run, the others are skipped
+    monkeypatch.setattr(batch, "build_employer_context", real_build_employer_context)
+    results, stats = run_folder(str(input_dir), output_dir)
+    assert (stats["reports"], stats["skipped"], stats["failed"]) == (1, 2, 0)
+
+
+class LockedManifest(BatchManifest):
+    """Manifest whose writes and lookups for one employer fail like a locked database."""
+
+    locked_uif = "1000002"
+
+    def completed_report(self, datafile, uif_reg_number, input_hash):
+        if uif_reg_number == self.locked_uif:
+            raise sqlite3.OperationalError("database is locked")
+        return super().completed_report(datafile, uif_reg_number, input_hash)
+
+    def record_report(self, datafile, uif_reg_number, *args, **kwargs):
+        if uif_reg_number == self.locked_uif:
+            raise sqlite3.OperationalError("database is locked")
+        return super().record_report(datafile, uif_reg_number, *args, **kwargs)
+
+
+def test_manifest_errors_fail_only_their_report(tmp_path, caplog):
+    input_dir = tmp_path / "in"
+    input_dir.mkdir()
+    write_datafile(input_dir / "a.xlsx", [1, 2, 3])
+    write_datafile(input_dir / "b.xlsx", [4])
+    output_dir = str(tmp_path / "out")
+    manifest = LockedManifest(os.path.join(output_dir, "manifest.sqlite"))
+    try:
+        file_results, stats = generate_folder_reports(
+            str(input_dir), TEMPLATE_PATH, output_dir=output_dir, workers=2, manifest=manifest,
+        )
+    finally:
+        manifest.close()
+    results = {os.path.basename(result["path"]): result for result in file_results}
+    # The report was written but not recorded, so it counts as failed and the file as partial
+    assert (stats["reports"], stats["failed"]) == (3, 1)
+    assert results["a.xlsx"]["errors"] == ["Employer 2: Could not record in the manifest: database is locked"]
+    assert len(report_files(output_dir)) == 4
+    assert "database is locked" in caplog.text
+
+    results, stats = run_folder(str(input_dir), output_dir)
+    assert (results["a.xlsx"]["reports"], results["a.xlsx"]["skipped"]) == (1, 2)
+    assert (results["b.xlsx"]["reports"], results["b.xlsx"]["skipped"]) == (0, 1)
+    results, stats = run_folder(str(input_dir), output_dir)
+    assert (stats["reports"], stats["skipped"]) == (0, 4)
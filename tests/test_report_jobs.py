@@ -0,0 +1,61 @@
+import os
+import signal
+import threading
+import time
+from concurrent.futures.process import BrokenProcessPool
+
+from utils.report_jobs import DONE, ReportJobQueue
+
+TEMPLATE_PATH = os.path.join(os.path.dirname(__file__), os.pardir, "templates", "UIF_Template.docx")
+
+
+def wait_for(queue, job_id, timeout=60):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        status = queue.status(job_id)
+        if status["finished_at"] is not None:
+            return status
+        time.sleep(0.05)
+    raise AssertionError(f"job {job_id} did not finish")
+
+
+def test_broken_pool_is_replaced_once_by_concurrent_submits():
+    queue = ReportJobQueue(TEMPLATE_PATH, workers=1)
+    try:
+        pid = queue.warm()[0].result(timeout=60)
+        broken = queue._executor
+        shutdowns = []
+        broken.shutdown = lambda *args, **kwargs: shutdowns.append(kwargs)
+        probe = broken.submit(time.sleep, 30)
+        os.kill(pid, signal.SIGKILL)
+        assert isinstance(probe.exception(timeout=30), BrokenProcessPool)
+
+        created = []
+        new_executor = queue._new_executor
+
+        def counting_new_executor():
+            # Slow enough that every thread finds the broken pool before it is replaced
+            time.sleep(0.2)
+            created.append(new_executor())
+            return created[-1]
+
+        queue._new_executor = counting_new_executor
+        barrier = threading.Barrier(8)
+        job_ids = []
+
+        def submit(number):
+            barrier.wait()
+            job_ids.append(queue.submit({"Name_of_Employer": f"Employer {number}", "UIF_REG_Number": str(number)}))
+
+        threads = [threading.Thread(target=submit, args=(number,)) for number in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(created) == 1
+        assert queue._executor is created[0]
+        assert shutdowns == [{"wait": False}]
+        assert [wait_for(queue, job_id)["status"] for job_id in job_ids] == [DONE] * 8
+    finally:
+        queue.shutdown()
@@ -0,0 +1,295 @@
+import hashlib
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from collections.abc import Mapping
+from pathlib import Path
+
+import pandas as pd
+
+# Header aliases accepted for the combined address book (normalized: upper-case, spaces -> "_")
+UIF_ALIASES = ("UIFREFERENCENUMBER", "UIF_REFERENCE_NUMBER", "UIF_REF_NUMBER", "UIF_NUMBER", "UIFREF", "UIF_REF")
+ADDRESS_ALIASES = ("ADDRESS", "ADDRESS_LINE", "ADDRESS1", "LOCATION", "ADDRESS_IN_FULL")
+PROVINCE_ALIASES = ("PROVINCE", "PROV", "STATE")
+
+# Compiled index written next to the xlsx; bump the version when the stored layout changes
+INDEX_SUFFIX = ".index.sqlite"
+INDEX_FORMAT_VERSION = "1"
+
+
+class AddressBookFormatError(ValueError):
+    """Raised when the address book has no recognizable UIF reference column."""
+
+
+def resolve_address_book_path():
+    """Resolve path from ENV or common filename variants to survive case-sensitive prod."""
+    candidate_paths = []
+    env_path = os.environ.get("ADDRESS_BOOK_PATH")
+    if env_path:
+        candidate_paths.append(env_path)
+    candidate_paths += [
+        os.path.join("data", "combined_address_book.xlsx"),
+        os.path.join("data", "Combined_Address_Book.xlsx"),
+        os.path.join("data", "COMBINED_ADDRESS_BOOK.xlsx"),
+    ]
+    for p in candidate_paths:
+        if os.path.exists(p):
+            return p
+    return None
+
+
+def pick_column(columns, *aliases):
+    """Return the first original column whose normalized header matches one of aliases, else None."""
+    col_map = {str(c).strip().upper().replace(" ", "_"): c for c in columns}
+    for a in aliases:
+        if a in col_map:
+            return col_map[a]
+    return None
+
+
+def normalize_uif_key(value):
+    """Normalize a single UIF reference for lookup, tolerating Excel numeric-like strings such as '123.0'"""
+    key = str(value).strip()
+    if key.endswith('.0'):
+        try:
+            key = str(int(float(key)))
+        except Exception:
+            pass
+    return key
+
+
+def normalize_uif_column(values):
+    """Vectorized normalize_uif_key over a Series (missing values must already be dropped)."""
+    keys = values.astype(str).str.strip()
+    float_like = keys.str.endswith('.0')
+    if float_like.any():
+        numeric = pd.to_numeric(keys[float_like], errors='coerce')
+        fits_int64 = numeric.notna() & (numeric.abs() < 2 ** 63)
+        keys.loc[fits_int64[fits_int64].index] = numeric[fits_int64].astype('int64').astype(str)
+        # Huge/odd values take the scalar path so results stay identical to normalize_uif_key
+        leftover = fits_int64[~fits_int64].index
+        if len(leftover):
+            keys.loc[leftover] = keys.loc[leftover].map(normalize_uif_key)
+    return keys
+
+
+def _clean_text_column(df, col, index):
+    """Stripped strings for col aligned to index; missing column or missing values -> ""."""
+    if not col or col not in df.columns:
+        return pd.Series("", index=index, dtype=object)
+    values = df.loc[index, col]
+    cleaned = values.astype(str).str.strip()
+    return cleaned.where(values.notna(), "")
+
+
+def build_address_lookup(df, uif_col, addr_col=None, prov_col=None):
+    """Build the UIF -> (ADDRESS, PROVINCE) lookup from address book columns.
+
+    Returns (lookup, stats) where stats holds the number of entries produced and the build time.
+    Later rows win when a UIF reference appears more than once.
+    """
+    started = time.perf_counter()
+    uif_values = df[uif_col].dropna()
+    keys = normalize_uif_column(uif_values)
+    addresses = _clean_text_column(df, addr_col, uif_values.index)
+    provinces = _clean_text_column(df, prov_col, uif_values.index)
+
+    has_key = keys != ""
+    address_lookup = dict(zip(
+        keys[has_key].tolist(),
+        zip(addresses[has_key].tolist(), provinces[has_key].tolist()),
+    ))
+    stats = {
+        "rows": len(address_lookup),
+        "seconds": time.perf_counter() - started,
+    }
+    return address_lookup, stats
+
+
+def index_path_for(source_path):
+    """Location of the compiled index for an address book file."""
+    return os.path.splitext(source_path)[0] + INDEX_SUFFIX
+
+
+def file_sha256(path):
+    """Hex sha256 of a file's contents, read in 1 MiB chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def source_fingerprint(source_path):
+    """Identity of an address book file: absolute path, mtime, size and content hash."""
+    st_result = os.stat(source_path)
+    return {
+        "format_version": INDEX_FORMAT_VERSION,
+        "source_path": os.path.abspath(source_path),
+        "mtime_ns": str(st_result.st_mtime_ns),
+        "size": str(st_result.st_size),
+        "sha256": file_sha256(source_path),
+    }
+
+
+def read_address_book_xlsx(source_path):
+    """Parse the address book workbook into (lookup, stats). Raises AddressBookFormatError."""
+    df = pd.read_excel(source_path)
+
+    # Normalize column names and support common aliases
+    uif_col = pick_column(df.columns, *UIF_ALIASES)
+    addr_col = pick_column(df.columns, *ADDRESS_ALIASES)
+    prov_col = pick_column(df.columns, *PROVINCE_ALIASES)
+    if not uif_col:
+        raise AddressBookFormatError("UIF reference column was not found in the address book")
+    return build_address_lookup(df, uif_col, addr_col, prov_col)
+
+
+def _read_index(index_path, fingerprint):
+    """Load the lookup from a compiled index, or None if it is missing, stale or unreadable."""
+    if not os.path.exists(index_path):
+        return None
+    try:
+        conn = sqlite3.connect(Path(index_path).resolve().as_uri() + "?mode=ro", uri=True)
+        try:
+            stored = dict(conn.execute("SELECT key, value FROM meta"))
+            if stored != fingerprint:
+                return None
+            rows = conn.execute("SELECT uif, address, province FROM entries")
+            return {uif: (address, province) for uif, address, province in rows}
+        finally:
+            conn.close()
+    except sqlite3.Error:
+        return None
+
+
+def _write_index(index_path, fingerprint, address_lookup):
+    """Write the compiled index atomically (temp file + rename) so readers never see a partial file."""
+    fd, tmp_path = tempfile.mkstemp(
+        prefix=os.path.basename(index_path) + ".", suffix=".tmp", dir=os.path.dirname(index_path) or "."
+    )
+    os.close(fd)
+    try:
+        conn = sqlite3.connect(tmp_path)
+        try:
+            conn.execute("CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+            conn.execute(
+                "CREATE TABLE entries (uif TEXT PRIMARY KEY, address TEXT NOT NULL, province TEXT NOT NULL) WITHOUT ROWID"
+            )
+            conn.executemany("INSERT INTO meta VALUES (?, ?)", fingerprint.items())
+            conn.executemany(
+                "INSERT INTO entries VALUES (?, ?, ?)",
+                ((uif, address, province) for uif, (address, province) in sorted(address_lookup.items())),
+            )
+            conn.commit()
+        finally:
+            conn.close()
+        os.replace(tmp_path, index_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def load_address_lookup(source_path):
+    """Return (lookup, stats) for an address book, served from its compiled index when current.
+
+    The index is rebuilt from the workbook whenever the source path, mtime, size or content hash
+    differs from what the index was built from. stats["source"] is "index" or "xlsx". Failing to
+    write the index (e.g. read-only data dir) is not fatal; the parsed lookup is still returned.
+    """
+    started = time.perf_counter()
+    index_path = index_path_for(source_path)
+    fingerprint = source_fingerprint(source_path)
+
+    address_lookup = _read_index(index_path, fingerprint)
+    if address_lookup is not None:
+        return address_lookup, {
+            "rows": len(address_lookup),
+            "seconds": time.perf_counter() - started,
+            "source": "index",
+            "index_path": index_path,
+        }
+
+    address_lookup, stats = read_address_book_xlsx(source_path)
+    try:
+        _write_index(index_path, fingerprint, address_lookup)
+    except (OSError, sqlite3.Error):
+        index_path = None
+    stats.update({
+        "seconds": time.perf_counter() - started,
+        "source": "xlsx",
+        "index_path": index_path,
+    })
+    return address_lookup, stats
+
+
+class AddressBook(Mapping):
+    """Read-only UIF -> (address, province) lookup meant to be shared by every session in the process.
+
+    Loading never raises: status is "ok", "missing" (no address book file), "no_uif_column" or
+    "error" (see .error). reload() re-resolves the path and swaps in a fresh lookup atomically, so
+    readers on other threads always see either the old or the new map, never a partial one.
+    """
+
+    def __init__(self):
+        self._reload_lock = threading.Lock()
+        self._lookup = {}
+        self._memory_bytes = None
+        self.path = None
+        self.status = "missing"
+        self.error = None
+        self.stats = {}
+        self.loaded_at = None
+        self.reload()
+
+    def reload(self):
+        """Re-read the address book (via its compiled index when current). Returns self."""
+        with self._reload_lock:
+            path = resolve_address_book_path()
+            lookup, stats, status, error = {}, {}, "missing", None
+            if path:
+                try:
+                    lookup, stats = load_address_lookup(path)
+                    status = "ok"
+                except AddressBookFormatError as e:
+                    status, error = "no_uif_column", str(e)
+                except Exception as e:
+                    status, error = "error", str(e)
+            self._lookup = lookup
+            self._memory_bytes = None
+            self.path, self.stats, self.status, self.error = path, stats, status, error
+            self.loaded_at = time.time()
+        return self
+
+    def __getitem__(self, key):
+        return self._lookup[key]
+
+    def __iter__(self):
+        return iter(self._lookup)
+
+    def __len__(self):
+        return len(self._lookup)
+
+    def lookup(self, uif_ref_number):
+        """Address and province for a UIF reference number, ("", "") when unknown."""
+        if not uif_ref_number:
+            return "", ""
+        return self._lookup.get(normalize_uif_key(uif_ref_number), ("", ""))
+
+    def memory_bytes(self):
+        """Approximate resident size of the lookup: dict, keys, value tuples and strings."""
+        if self._memory_bytes is None:
+            lookup = self._lookup
+            seen = set()
+            total = sys.getsizeof(lookup)
+            for key, value in lookup.items():
+                for obj in (key, value, *value):
+                    if id(obj) not in seen:
+                        seen.add(id(obj))
+                        total += sys.getsizeof(obj)
+            self._memory_bytes = total
+        return self._memory_bytes
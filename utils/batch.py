@@ -0,0 +1,225 @@
+import logging
+import os
+import sqlite3
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import datetime
+
+from utils.address_book import file_sha256
+from utils.datafile import read_datafile, summarize_employers
+from utils.manifest import DONE, FAILED, PARTIAL
+from utils.report_context import build_employer_context
+from utils.report_generator import TIMING_PHASES, ReportGenerator, context_hash, safe_filename
+
+logger = logging.getLogger(__name__)
+
+
+def batch_output_dir(base_dir="generated_reports"):
+    """Fresh per-run folder for batch output, e.g. generated_reports/batch_20240115_093000."""
+    return os.path.join(base_dir, "batch_" + datetime.now().strftime("%Y%m%d_%H%M%S"))
+
+
+def employer_report_path(output_dir, summary):
+    """Report file for one employer; the UIF reference keeps employers sharing a trade name apart."""
+    employer_name = safe_filename(summary["name_of_employer"] or "report")
+    uif_reg_number = safe_filename(summary["uif_reg_number"])
+    return os.path.join(output_dir, f"{employer_name}_{uif_reg_number}.docx")
+
+
+def list_datafiles(input_dir):
+    """DataFiles (.xlsx) directly inside input_dir, sorted by name; Excel lock files are skipped."""
+    return sorted(
+        os.path.join(input_dir, name) for name in os.listdir(input_dir)
+        if name.lower().endswith(".xlsx") and not name.startswith("~$")
+    )
+
+
+def summarize_datafile_path(path):
+    """Process-pool task: read a DataFile and summarize every employer in it.
+
+    Returns (summaries, skipped_rows, seconds).
+    """
+    started = time.perf_counter()
+    df, columns = read_datafile(path)
+    summaries, skipped_rows = summarize_employers(df, columns)
+    return summaries, skipped_rows, time.perf_counter() - started
+
+
+def render_employer_report(template_path, context, output_path):
+    """Process-pool task: render one employer's report to output_path. Returns its phase timings.
+
+    Each worker process parses the template once and reuses it for every report it renders.
+    """
+    generator = ReportGenerator(template_path)
+    generator.generate_report(context, output_path)
+    return generator.last_timings
+
+
+def generate_folder_reports(input_dir, template_path, output_dir=None, workers=None, address_book=None,
+                            on_file_done=None, manifest=None):
+    """Generate a report for every employer in every DataFile in input_dir using a process pool.
+
+    DataFiles are read and summarized in the pool, and each employer is rendered as its own pool
+    task, so one large provincial extract spreads over all workers. Reports for <name>.xlsx go to
+    <output_dir>/<name>/. Helper texts are the configured batch defaults. on_file_done(file_result)
+    is called as each DataFile finishes.
+
+    With a BatchManifest every DataFile and report is checkpointed as it finishes, and work the
+    manifest already records as done for the same inputs is skipped (see BatchManifest). A manifest
+    error (e.g. a locked database) is logged and does not stop the run: a lookup that fails is
+    treated as not done, and a report that cannot be recorded counts as failed so a later run
+    renders it again.
+
+    Returns (file_results, stats). A file result holds path, employers, reports, failed, skipped
+    (reports already done in an earlier run), skipped_rows, read_seconds, render_seconds (summed
+    worker time), seconds (wall time from the start of the run until the file finished) and errors
+    (list of messages). stats["phase_seconds"] sums the reports' timings per TIMING_PHASES phase.
+    """
+    output_dir = output_dir or batch_output_dir()
+    template_hash = file_sha256(template_path) if manifest is not None else None
+    started = time.perf_counter()
+    file_results = {}
+    file_hashes = {}
+    phase_seconds = dict.fromkeys(TIMING_PHASES, 0.0)
+    pending = {}
+
+    def checkpoint(method, *args):
+        """Call a manifest method; on a sqlite error log it and return None."""
+        try:
+            return getattr(manifest, method)(*args)
+        except sqlite3.Error as e:
+            logger.warning("Batch manifest %s%r failed: %s", method, args[:2], e)
+            return None
+
+    def finish(file_result):
+        file_result["seconds"] = time.perf_counter() - started
+        if manifest is not None and not file_result["resumed"]:
+            if file_result["errors"] and not file_result["employers"]:
+                status = FAILED
+            else:
+                status = PARTIAL if file_result["failed"] else DONE
+            checkpoint(
+                "record_datafile", os.path.basename(file_result["path"]), file_hashes[file_result["path"]],
+                status, file_result["employers"], file_result["read_seconds"],
+            )
+        if on_file_done is not None:
+            on_file_done(file_result)
+
+    def record_report(file_result, summary, input_hash, output_path, seconds, error):
+        if manifest is not None:
+            try:
+                manifest.record_report(
+                    os.path.basename(file_result["path"]), summary["uif_reg_number"], input_hash or "",
+                    FAILED if error else DONE, None if error else output_path, seconds, error,
+                )
+            except sqlite3.Error as e:
+                logger.warning("Batch manifest could not record %s: %s", summary["uif_reg_number"], e)
+                error = error or f"Could not record in the manifest: {e}"
+        if error is None:
+            file_result["reports"] += 1
+        else:
+            file_result["failed"] += 1
+            file_result["errors"].append(f"{summary['name_of_employer'] or summary['uif_reg_number']}: {error}")
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for path in list_datafiles(input_dir):
+            file_result = file_results[path] = {
+                "path": path,
+                "employers": 0,
+                "reports": 0,
+                "failed": 0,
+                "skipped": 0,
+                "skipped_rows": 0,
+                "read_seconds": 0.0,
+                "render_seconds": 0.0,
+                "seconds": 0.0,
+                "errors": [],
+                "remaining": 0,
+                "resumed": False,
+            }
+            if manifest is not None:
+                file_hashes[path] = file_sha256(path)
+                employers = checkpoint("datafile_complete", os.path.basename(path), file_hashes[path])
+                if employers is not None:
+                    file_result.update(employers=employers, skipped=employers, resumed=True)
+                    finish(file_result)
+                    continue
+            pending[pool.submit(summarize_datafile_path, path)] = (path, None)
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                path, task = pending.pop(future)
+                file_result = file_results[path]
+                datafile = os.path.basename(path)
+
+                if task is None:
+                    # DataFile read: fan its employers out as render tasks
+                    try:
+                        summaries, skipped_rows, read_seconds = future.result()
+                    except Exception as e:
+                        file_result["errors"].append(f"Could not read DataFile: {e}")
+                        finish(file_result)
+                        continue
+                    file_result.update(employers=len(summaries), skipped_rows=skipped_rows,
+                                       read_seconds=read_seconds)
+                    if manifest is not None:
+                        checkpoint("forget_missing_reports", datafile, [summary["uif_reg_number"] for summary in summaries])
+                    file_output_dir = os.path.join(output_dir, os.path.splitext(datafile)[0])
+                    for employer_summary in summaries:
+                        input_hash = None
+                        try:
+                            address, province = ("", "")
+                            if address_book is not None:
+                                address, province = address_book.lookup(employer_summary["uif_reg_number"])
+                            context = build_employer_context(employer_summary, address, province)
+                            if manifest is not None:
+                                input_hash = context_hash(context, template_hash)
+                        except Exception as e:
+                            # A malformed summary fails its own report, not the run
+                            record_report(file_result, employer_summary, input_hash, None, 0.0, str(e))
+                            continue
+                        if manifest is not None and checkpoint(
+                                "completed_report", datafile, employer_summary["uif_reg_number"], input_hash):
+                            file_result["skipped"] += 1
+                            continue
+                        output_path = employer_report_path(file_output_dir, employer_summary)
+                        render_future = pool.submit(render_employer_report, template_path, context, output_path)
+                        pending[render_future] = (path, (employer_summary, input_hash, output_path))
+                        file_result["remaining"] += 1
+                    if not file_result["remaining"]:
+                        finish(file_result)
+                    continue
+
+                summary, input_hash, output_path = task
+                try:
+                    timings = future.result()
+                    seconds = timings["total"]
+                    error = None
+                    file_result["render_seconds"] += seconds
+                    for phase in TIMING_PHASES:
+                        phase_seconds[phase] += timings[phase]
+                except Exception as e:
+                    seconds = 0.0
+                    error = str(e)
+                record_report(file_result, summary, input_hash, output_path, seconds, error)
+                file_result["remaining"] -= 1
+                if file_result["remaining"] == 0:
+                    finish(file_result)
+
+    elapsed = time.perf_counter() - started
+    file_results = list(file_results.values())
+    generated = sum(result["reports"] for result in file_results)
+    stats = {
+        "files": len(file_results),
+        "employers": sum(result["employers"] for result in file_results),
+        "reports": generated,
+        "failed": sum(result["failed"] for result in file_results),
+        "skipped": sum(result["skipped"] for result in file_results),
+        "unreadable_files": sum(1 for result in file_results if result["errors"] and not result["employers"]),
+        "seconds": elapsed,
+        "reports_per_minute": generated * 60 / elapsed if elapsed > 0 else 0.0,
+        "phase_seconds": phase_seconds,
+        "output_dir": output_dir,
+    }
+    return file_results, stats
@@ -0,0 +1,156 @@
+# Fields counted by the Company Details and Financials progress bars
+COMPANY_FIELDS = (
+    "Name_of_Employer", "UIF_REG_Number", "Location_Type_address_in_full",
+    "Period_Claimed_For_Lockdown_Period", "Industry", "Number_of_Employees", "Province",
+)
+FINANCIAL_FIELDS = ("Total_Amount_Verified", "Amount_Verified_as_Accurate", "Affected_Employees")
+
+
+def is_filled(value):
+    """A form field counts as filled when it is not blank and not N/A."""
+    return bool(value and str(value).strip() and value != "N/A")
+
+
+def is_written(value):
+    """A helper-text section counts as filled when it is not blank."""
+    return bool(value and str(value).strip())
+
+
+def section_completion(filled, total):
+    percentage = (filled / total * 100) if total > 0 else 0
+    return {"filled": filled, "total": total, "percentage": round(percentage, 1)}
+
+
+def monthly_data_completion(monthly_data):
+    """Completion of the nested monthly_data dict: months with both a claim and a payment entered."""
+    if monthly_data is None:
+        return {"filled": 0, "total": 0, "percentage": 0}
+
+    filled_months = 0
+    total_months = 0
+    # Count months with both claim and payment data
+    for month_key in monthly_data.keys():
+        if month_key.endswith("_claim") or month_key.endswith("_payment"):
+            month_base = month_key.replace("_claim", "").replace("_payment", "")
+            if month_base not in [key.replace("_claim", "").replace("_payment", "") for key in monthly_data.keys() if key != month_key]:
+                continue
+
+            claim_key = f"{month_base}_claim"
+            payment_key = f"{month_base}_payment"
+
+            if claim_key in monthly_data and payment_key in monthly_data:
+                total_months += 1
+                if monthly_data[claim_key] and monthly_data[payment_key]:
+                    filled_months += 1
+
+    percentage = (filled_months / total_months * 100) if total_months > 0 else 0
+    return {"filled": filled_months, "total": total_months, "percentage": percentage}
+
+
+class CompletionDict(dict):
+    """dict that keeps per-section counts of its filled fields as they are set.
+
+    sections maps a section name to (fields, is_filled); fields None means every key of the
+    dict, whose total is then the dict's size. Every write (item assignment, update, pop, ...)
+    checks the one field it touches and adjusts its section's counter only when the field flips
+    between filled and empty, so completion(section) is a read of a counter rather than a walk
+    over the fields. derived maps a key to a function computing its section's completion from
+    that key's value (None while absent), recomputed when the key is assigned; values under
+    such a key are treated as immutable and must be replaced, not changed in place.
+    """
+
+    def __init__(self, sections, derived=None, data=()):
+        super().__init__()
+        self._sections = sections
+        self._derived = derived or {}
+        self._section_of = {}
+        self._all_keys_section = None
+        for section, (fields, _) in sections.items():
+            if fields is None:
+                self._all_keys_section = section
+            else:
+                self._section_of.update(dict.fromkeys(fields, section))
+        self._filled = set()
+        self._counts = dict.fromkeys(sections, 0)
+        self._derived_completion = {key: compute(None) for key, compute in self._derived.items()}
+        self.update(data)
+
+    def _track(self, key, value, present=True):
+        if key in self._derived:
+            self._derived_completion[key] = self._derived[key](value if present else None)
+        section = self._section_of.get(key, self._all_keys_section)
+        if section is None:
+            return
+        filled = present and self._sections[section][1](value)
+        if filled != (key in self._filled):
+            if filled:
+                self._filled.add(key)
+                self._counts[section] += 1
+            else:
+                self._filled.discard(key)
+                self._counts[section] -= 1
+
+    def completion(self, section):
+        """{'filled', 'total', 'percentage'} for a section (or a derived key)."""
+        if section in self._derived_completion:
+            return dict(self._derived_completion[section])
+        fields = self._sections[section][0]
+        return section_completion(self._counts[section], len(self) if fields is None else len(fields))
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self._track(key, value)
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._track(key, None, present=False)
+
+    def update(self, *args, **kwargs):
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    _missing = object()
+
+    def pop(self, key, default=_missing):
+        if key not in self:
+            if default is self._missing:
+                raise KeyError(key)
+            return default
+        value = self[key]
+        del self[key]
+        return value
+
+    def popitem(self):
+        key, value = super().popitem()
+        self._track(key, None, present=False)
+        return key, value
+
+    def clear(self):
+        for key in list(self):
+            del self[key]
+
+    def __reduce__(self):
+        return type(self), (self._sections, self._derived, dict(self))
+
+
+def tracked_form_data(data=()):
+    """form_data with the Company Details, Financials and Monthly Data progress kept as it is written."""
+    return CompletionDict(
+        {"company_details": (COMPANY_FIELDS, is_filled), "financials": (FINANCIAL_FIELDS, is_filled)},
+        derived={"monthly_data": monthly_data_completion},
+        data=data,
+    )
+
+
+def tracked_button_data(data=()):
+    """button_data (helper-text sections) with the Findings & Compliance progress kept as it is written."""
+    return CompletionDict({"findings": (None, is_written)}, data=data)
@@ -0,0 +1,388 @@
+import logging
+
+import numpy as np
+import pandas as pd
+from openpyxl import load_workbook
+from pandas.io.parsers import TextParser
+
+from utils.address_book import normalize_uif_column, normalize_uif_key, pick_column
+from utils.dates import to_datetime_column, to_month_period
+from utils.diagnostics import DISABLED
+
+# DataFile header aliases (normalized: upper-case, spaces -> "_")
+NAME_ALIASES = ('TRADENAME', 'TRADE_NAME', 'EMPLOYER_NAME', 'NAME_OF_EMPLOYER', 'NAME', 'COMPANY', 'TRADING_NAME')
+UIF_ALIASES = ('UIFREFERENCENUMBER', 'UIF_REFERENCE_NUMBER', 'UIF_REF_NUMBER', 'UIF_NUMBER', 'UIFREF', 'UIF_REF', 'UIF_REG_NUMBER')
+INDUSTRY_ALIASES = ('INDUSTRYSECTOR', 'INDUSTRY_SECTOR', 'INDUSTRY', 'SECTOR')
+
+# Columns used under their exact DataFile names
+SHUTDOWN_COLUMNS = ('SHUTDOWN_FROM', 'SHUTDOWN_TILL')
+AMOUNT_COLUMNS = ('PAYMENT_ITR_1', 'PAYMENT_ITR_2', 'PAYMENT_ITR_3', 'BANK_PAY_AMOUNT')
+
+# Error cells come back as these strings in values-only mode; pd.read_excel turns them into NaN
+EXCEL_ERROR_VALUES = frozenset(('#N/A', '#REF!', '#VALUE!', '#DIV/0!', '#NAME?', '#NUM!', '#NULL!'))
+
+
+def resolve_datafile_columns(columns):
+    """Map each role the upload aggregation needs to the matching DataFile header (or None).
+
+    Roles: name, uif, industry (alias lookup), employee_id (first header containing ID/EMPLOYEE),
+    payment_status / payment_medium (last header containing PAYMENT plus STATUS / MEDIUM) and the
+    exact-name shutdown and amount columns.
+    """
+    columns = list(columns)
+    resolved = {
+        'name': pick_column(columns, *NAME_ALIASES),
+        'uif': pick_column(columns, *UIF_ALIASES),
+        'industry': pick_column(columns, *INDUSTRY_ALIASES),
+        'employee_id': None,
+        'payment_status': None,
+        'payment_medium': None,
+    }
+    for col in columns:
+        if 'ID' in col.upper() or 'EMPLOYEE' in col.upper():
+            resolved['employee_id'] = col
+            break
+    for col in columns:
+        if 'STATUS' in col.upper() and 'PAYMENT' in col.upper():
+            resolved['payment_status'] = col
+        elif 'MEDIUM' in col.upper() and 'PAYMENT' in col.upper():
+            resolved['payment_medium'] = col
+    for col in SHUTDOWN_COLUMNS + AMOUNT_COLUMNS:
+        resolved[col] = col if col in columns else None
+    return resolved
+
+
+def _dedupe_headers(header):
+    """Column names as pd.read_excel would produce them: blanks -> 'Unnamed: i', repeats -> 'X.1'."""
+    names = []
+    seen = {}
+    for i, value in enumerate(header):
+        name = f"Unnamed: {i}" if value is None or value == "" else value
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        else:
+            seen[name] = 0
+        names.append(name)
+    return names
+
+
+def _convert_cell(value):
+    """Same cell normalization pandas applies to openpyxl values (None -> "", 3.0 -> 3)."""
+    if value is None:
+        return ""
+    if isinstance(value, float):
+        if value.is_integer():
+            return int(value)
+        return value
+    if isinstance(value, str) and value in EXCEL_ERROR_VALUES:
+        return np.nan
+    return value
+
+
+def read_datafile(file):
+    """Stream an uploaded DataFile and materialize only the columns the aggregation uses.
+
+    The first sheet is read in openpyxl read-only mode. The header row is resolved through
+    resolve_datafile_columns() and only those columns are kept from the remaining rows, so unused
+    columns never become Python objects. Values go through pandas' own TextParser, so the dtypes
+    match what pd.read_excel would give for the same columns.
+    Returns (df, columns) where columns is the role -> header map.
+    """
+    workbook = load_workbook(file, read_only=True, data_only=True, keep_links=False)
+    try:
+        sheet = workbook.worksheets[0]
+        sheet.reset_dimensions()
+        rows = sheet.iter_rows(values_only=True)
+
+        header = next(rows, None)
+        if header is None:
+            return pd.DataFrame(), resolve_datafile_columns([])
+        header = list(header)
+        while header and header[-1] in (None, ""):
+            header.pop()
+        names = _dedupe_headers(header)
+        columns = resolve_datafile_columns([n for n in names if isinstance(n, str)])
+
+        wanted = list(dict.fromkeys(col for col in columns.values() if col is not None))
+        positions = [names.index(col) for col in wanted]
+
+        data = [wanted]
+        last_row_with_data = 0
+        for row in rows:
+            if any(value is not None and value != "" for value in row):
+                last_row_with_data = len(data)
+            width = len(row)
+            data.append([_convert_cell(row[i]) if i < width else "" for i in positions])
+    finally:
+        workbook.close()
+
+    # Trim trailing empty rows (judged on the full row, like pd.read_excel)
+    del data[last_row_with_data + 1:]
+    if not wanted:
+        return pd.DataFrame(index=range(len(data) - 1)), columns
+
+    df = TextParser(data, header=0, skip_blank_lines=False).read()
+    return df, columns
+
+
+# Bump whenever summarize_datafile() output changes so cached summaries are not reused
+SUMMARY_VERSION = "2"
+
+# Claim months shown on the report, in template order
+MONTHLY_CLAIM_KEYS = (
+    "April_2020", "May_2020", "June_2020", "July_2020", "Aug_2020", "Sep_2020", "Oct_2020", "Nov_2020",
+    "Dec_2020", "Jan_2021", "Feb_2021", "Mar_2021", "Apr_2021", "May_2021", "Jun_2021", "July_2021",
+)
+
+# Map full month names to abbreviated keys in monthly_claims
+MONTH_KEY_MAPPING = {
+    'January_2020': 'Jan_2020', 'February_2020': 'Feb_2020', 'March_2020': 'Mar_2020',
+    'April_2020': 'April_2020', 'May_2020': 'May_2020', 'June_2020': 'June_2020',
+    'July_2020': 'July_2020', 'August_2020': 'Aug_2020', 'September_2020': 'Sep_2020',
+    'October_2020': 'Oct_2020', 'November_2020': 'Nov_2020', 'December_2020': 'Dec_2020',
+    'January_2021': 'Jan_2021', 'February_2021': 'Feb_2021', 'March_2021': 'Mar_2021',
+    'April_2021': 'Apr_2021', 'May_2021': 'May_2021', 'June_2021': 'Jun_2021',
+    'July_2021': 'July_2021'
+}
+
+
+def _group_first(df, col, keys):
+    """First non-missing value of col per group, or an empty Series when the column is absent."""
+    if col and col in df.columns:
+        return df[col].groupby(keys, sort=False).first()
+    return pd.Series(dtype=object)
+
+
+def _format_period_labels(from_dates, till_dates):
+    """Format date pairs as "27 March 2020 to 30 April 2020"."""
+    return (
+        from_dates.dt.strftime('%d %B %Y').str.lstrip('0')
+        + " to "
+        + till_dates.dt.strftime('%d %B %Y').str.lstrip('0')
+    )
+
+
+def _summarize_groups(df, columns, keys, group_order, diagnostics=DISABLED):
+    """Aggregate every group of rows (keys aligned to df.index) in one grouped pass per statistic.
+
+    Date conversion, amount coercion and the monthly groupby run once over the whole frame; the
+    per-group dicts are then assembled from the grouped results. Returns summaries in group_order.
+    What was detected and computed per group goes to diagnostics (a utils.diagnostics.Diagnostics).
+    """
+    name_col = columns['name']
+    uif_col = columns['uif']
+    industry_col = columns['industry']
+    id_column = columns['employee_id']
+    has_id = bool(id_column and id_column in df.columns)
+
+    row_counts = keys.groupby(keys, sort=False).size()
+    names = _group_first(df, name_col, keys)
+    uifs = _group_first(df, uif_col, keys)
+    industries = _group_first(df, industry_col, keys)
+    if has_id:
+        # Count unique employees by ID number, falling back to row count if no ID column found
+        employee_counts = df[id_column].groupby(keys, sort=False).nunique()
+    else:
+        employee_counts = row_counts
+    group_positions = keys.groupby(keys, sort=False).indices
+
+    # Get all shutdown periods and format them properly
+    has_periods = 'SHUTDOWN_FROM' in df and 'SHUTDOWN_TILL' in df
+    periods_by_group = {}
+    if has_periods:
+        # Convert both date columns in bulk (serial numbers, date strings or datetimes)
+        from_dates = to_datetime_column(df['SHUTDOWN_FROM'])
+        till_dates = to_datetime_column(df['SHUTDOWN_TILL'])
+        has_period = from_dates.notna() & till_dates.notna()
+
+        # Unique (group, from, till) triples in order of first appearance, formatted once each
+        period_pairs = pd.DataFrame({
+            'key': keys[has_period],
+            'from': from_dates[has_period],
+            'till': till_dates[has_period],
+        }).drop_duplicates()
+        period_labels = _format_period_labels(period_pairs['from'], period_pairs['till'])
+        for key, labels in period_labels.groupby(period_pairs['key'], sort=False):
+            periods_by_group[key] = list(dict.fromkeys(labels))
+
+    # Financial totals - ensure expected numeric columns exist and are numeric
+    amounts = {}
+    for col in AMOUNT_COLUMNS:
+        if col in df.columns:
+            amounts[col] = pd.to_numeric(df[col], errors='coerce').fillna(0)
+        else:
+            amounts[col] = pd.Series(0, index=df.index)
+    bank_pay_amount = amounts['BANK_PAY_AMOUNT']
+
+    # Calculate total amount verified based on payment status and medium
+    payment_status_col = columns['payment_status']
+    payment_medium_col = columns['payment_medium']
+    try:
+        if payment_status_col and payment_medium_col:
+            # Filter for payment status = 3 and payment medium = 1 or 2
+            mask = (df[payment_status_col] == 3) & (df[payment_medium_col].isin([1, 2]))
+            verified_totals = bank_pay_amount[mask].groupby(keys[mask], sort=False).sum()
+        else:
+            # Fallback: sum all bank pay amounts
+            verified_totals = bank_pay_amount.groupby(keys, sort=False).sum()
+    except Exception:
+        verified_totals = pd.Series(dtype='float64')
+
+    # Monthly claims, iterations and gaps based on shutdown dates
+    month_stats_by_group = {}
+    month_stats_error = None
+    if 'SHUTDOWN_TILL' in df:
+        try:
+            # Bucket every row into its shutdown month with one vectorized conversion
+            shutdown_month = to_month_period(df['SHUTDOWN_TILL'])
+
+            # Only paid entries (BANK_PAY_AMOUNT > 0) count towards iterations; count unique
+            # employees if an ID column exists, else count rows
+            paid = bank_pay_amount > 0
+            paid_key = df[id_column] if has_id else pd.Series(df.index, index=df.index)
+
+            # Single grouped pass: monthly totals and paid-employee counts per group and month
+            month_stats = pd.DataFrame({
+                'key': keys,
+                'month': shutdown_month,
+                'amount': bank_pay_amount,
+                'paid_key': paid_key.where(paid),
+            }).groupby(['key', 'month'], sort=True).agg(
+                total_amount=('amount', 'sum'),
+                paid_employees=('paid_key', 'nunique'),
+            )
+            for key, stats in month_stats.groupby(level='key', sort=False):
+                month_stats_by_group[key] = stats.droplevel('key')
+        except Exception as e:
+            month_stats_error = e
+
+    summaries = []
+    for key in group_order:
+        positions = group_positions.get(key, np.array([], dtype='int64'))
+        row_count = int(row_counts.get(key, 0))
+
+        name_value = names.get(key)
+        name_of_employer = str(name_value) if name_value is not None and not pd.isna(name_value) else ''
+        diagnostics.info("Employer column detected = %s, value = '%s'", name_col or 'None', name_of_employer)
+
+        uif_value = uifs.get(key)
+        uif_reg_number = normalize_uif_key(uif_value) if uif_value is not None and not pd.isna(uif_value) else ''
+        diagnostics.info("UIF column detected = %s, value = '%s'", uif_col or 'None', uif_reg_number)
+
+        industry_value = industries.get(key)
+        industry = str(industry_value) if industry_value is not None and not pd.isna(industry_value) else ''
+        diagnostics.info("Industry column detected = %s, value = '%s'", industry_col or 'None', industry)
+
+        number_of_employees = int(employee_counts.get(key, 0))
+
+        shutdown_periods = []
+        if has_periods:
+            shutdown_periods = periods_by_group.get(key, [])
+            diagnostics.debug(
+                "Processed %d rows for periods, %d unique: %s",
+                row_count, len(shutdown_periods), "; ".join(shutdown_periods),
+            )
+        period_claimed = ", ".join(shutdown_periods)
+
+        total_amount_verified = float(round(verified_totals.get(key, 0), 2))
+        diagnostics.info("Total Amount Verified computed = R %.2f", total_amount_verified)
+
+        monthly_claims = {month: "N/A" for month in MONTHLY_CLAIM_KEYS}
+        iteration_counts = None
+        gaps_flag = None
+        if 'SHUTDOWN_TILL' in df:
+            if diagnostics.enabled_for(logging.DEBUG):
+                diagnostics.debug(
+                    "Found %d rows in datafile, SHUTDOWN_TILL values: %s",
+                    row_count, df['SHUTDOWN_TILL'].iloc[positions].dropna().unique(),
+                )
+            if month_stats_error is not None:
+                diagnostics.warning("Failed to compute monthly claims/iterations/gaps: %s", month_stats_error)
+            else:
+                stats = month_stats_by_group.get(key)
+                if stats is None:
+                    stats = pd.DataFrame(
+                        {'total_amount': [], 'paid_employees': []},
+                        index=pd.PeriodIndex([], freq='M'),
+                    )
+
+                mapped = []
+                for month_period, total_amount in stats['total_amount'].items():
+                    month_key = month_period.strftime('%B_%Y')
+                    claim_value = f"R {round(float(total_amount), 2)}"
+
+                    # Try to find the correct key
+                    if month_key in monthly_claims:
+                        monthly_claims[month_key] = claim_value
+                        mapped.append(f"{month_key} -> {claim_value}")
+                    elif month_key in MONTH_KEY_MAPPING:
+                        mapped_key = MONTH_KEY_MAPPING[month_key]
+                        if mapped_key in monthly_claims:
+                            monthly_claims[mapped_key] = claim_value
+                            mapped.append(f"{month_key} -> {mapped_key} -> {claim_value}")
+                        else:
+                            diagnostics.warning("Mapped key '%s' not found in monthly_claims", mapped_key)
+                    else:
+                        diagnostics.warning(
+                            "Month key '%s' not found in monthly_claims or mapping (available: %s)",
+                            month_key, ", ".join(monthly_claims),
+                        )
+                diagnostics.debug("Found %d unique shutdown months: %s", len(stats), "; ".join(mapped))
+
+                # Determine gaps: any non-consecutive month differences > 1
+                gaps_flag = "Yes" if (np.diff(stats.index.asi8) > 1).any() else "No"
+                iteration_counts = [int(count) for count in stats['paid_employees']]
+                diagnostics.debug("Iteration counts = %s, Gaps = %s", iteration_counts, gaps_flag)
+
+        summaries.append({
+            "version": SUMMARY_VERSION,
+            "columns": dict(columns),
+            "row_count": row_count,
+            "name_of_employer": name_of_employer,
+            "uif_reg_number": uif_reg_number,
+            "industry": industry,
+            "number_of_employees": number_of_employees,
+            "shutdown_periods": shutdown_periods,
+            "period_claimed": period_claimed,
+            "total_amount_verified": total_amount_verified,
+            "monthly_claims": monthly_claims,
+            "iteration_counts": iteration_counts,
+            "gaps_flag": gaps_flag,
+        })
+    return summaries
+
+
+def summarize_datafile(df, columns, diagnostics=DISABLED):
+    """Compute the report aggregates for one employer's DataFile rows.
+
+    columns is the role -> header map from resolve_datafile_columns(). Returns a JSON-serializable
+    dict: employer name, UIF reference, industry, employee count, period string, total amount
+    verified, monthly claims, iteration counts and gaps flag. iteration_counts/gaps_flag are None
+    when the DataFile has no usable SHUTDOWN_TILL data. The detected columns and computed values
+    are reported to diagnostics at info/debug level.
+    """
+    keys = pd.Series(0, index=df.index)
+    return _summarize_groups(df, columns, keys, [0], diagnostics)[0]
+
+
+def summarize_employers(df, columns):
+    """Split a multi-employer DataFile by UIF reference and summarize every employer.
+
+    Rows are grouped on the normalized UIF reference and all employers are aggregated together in
+    one grouped pass; each summary has the same shape as summarize_datafile() output. Returns
+    (summaries, skipped_rows) with summaries in order of first appearance; rows without a UIF
+    reference are not assigned to any employer and are only counted. A file without a UIF column
+    is treated as a single employer.
+    """
+    uif_col = columns['uif']
+    if not uif_col or uif_col not in df.columns:
+        return [summarize_datafile(df, columns)], 0
+
+    uif_values = df[uif_col].dropna()
+    keys = normalize_uif_column(uif_values)
+    keys = keys[keys != ""]
+    skipped_rows = len(df) - len(keys)
+    if skipped_rows:
+        df = df.loc[keys.index]
+    return _summarize_groups(df, columns, keys, pd.unique(keys)), skipped_rows
@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+
+# Excel's day zero (accounts for the 1900 leap-year bug for all serials after Feb 1900)
+EXCEL_EPOCH = np.datetime64("1899-12-30", "D")
+
+# Serial day range that fits in datetime64[ns]; anything outside is treated as unparseable
+_MIN_SERIAL = (pd.Timestamp.min.ceil("D").date() - EXCEL_EPOCH.astype(object)).days
+_MAX_SERIAL = (pd.Timestamp.max.floor("D").date() - EXCEL_EPOCH.astype(object)).days
+
+
+def excel_serial_to_datetime(values):
+    """Convert an array of Excel serial day numbers to datetime64[ns].
+
+    Fractional days are truncated (time of day is dropped). NaN and out-of-range serials -> NaT.
+    """
+    days = np.asarray(values, dtype="float64")
+    result = np.full(days.shape, np.datetime64("NaT"), dtype="datetime64[ns]")
+    valid = np.isfinite(days)
+    valid[valid] = (days[valid] >= _MIN_SERIAL) & (days[valid] <= _MAX_SERIAL)
+    whole_days = np.trunc(days[valid]).astype("int64").astype("timedelta64[D]")
+    result[valid] = (EXCEL_EPOCH + whole_days).astype("datetime64[ns]")
+    return result
+
+
+def _parse_date_value(value):
+    """Parse a single non-numeric cell (date string, datetime, date) -> Timestamp or NaT."""
+    try:
+        parsed = pd.to_datetime(value)
+    except (ValueError, TypeError, OverflowError):
+        return pd.NaT
+    if isinstance(parsed, pd.Timestamp) and parsed.tzinfo is not None:
+        parsed = parsed.tz_localize(None)
+    return parsed
+
+
+def to_datetime_column(values):
+    """Convert a DataFile date column to a datetime64[ns] Series in bulk.
+
+    Handles columns that are already datetime64, numeric Excel serial numbers (converted with
+    NumPy) and object/string columns mixing serials, date strings and datetime objects. Numeric
+    strings are read as serials, matching how Excel exports them. Only distinct non-numeric
+    values are parsed individually, so cost does not grow with the row count.
+    Unparseable or missing cells become NaT; the index of the input is preserved.
+    """
+    series = values if isinstance(values, pd.Series) else pd.Series(values)
+
+    if pd.api.types.is_datetime64_any_dtype(series.dtype):
+        if getattr(series.dt, "tz", None) is not None:
+            series = series.dt.tz_localize(None)
+        return series.astype("datetime64[ns]")
+
+    if pd.api.types.is_numeric_dtype(series.dtype) and not pd.api.types.is_bool_dtype(series.dtype):
+        return pd.Series(excel_serial_to_datetime(series.to_numpy(dtype="float64", na_value=np.nan)), index=series.index)
+
+    # Mixed/object column: serials first (vectorized), then the remaining distinct values
+    serials = pd.to_numeric(series, errors="coerce")
+    result = pd.Series(excel_serial_to_datetime(serials.to_numpy(dtype="float64", na_value=np.nan)), index=series.index)
+
+    remaining = serials.isna() & series.notna()
+    if remaining.any():
+        rest = series[remaining]
+        parsed = {value: _parse_date_value(value) for value in pd.unique(rest)}
+        result[remaining] = pd.to_datetime(rest.map(parsed), errors="coerce")
+    return result
+
+
+def to_month_period(values):
+    """Convert a DataFile date column straight to monthly periods (NaT stays missing)."""
+    return to_datetime_column(values).dt.to_period("M")
@@ -0,0 +1,101 @@
+import logging
+import os
+import time
+from collections import deque
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+# DIAGNOSTICS_LEVEL values; anything else (including unset) leaves diagnostics off
+LEVELS = {"debug": logging.DEBUG, "info": logging.INFO, "warning": logging.WARNING, "error": logging.ERROR}
+# Newest entries kept per channel for the diagnostics panel
+MAX_ENTRIES = 500
+
+
+def diagnostics_level():
+    """Level from DIAGNOSTICS_LEVEL (debug, info, warning or error), None when diagnostics are off."""
+    return LEVELS.get(os.environ.get("DIAGNOSTICS_LEVEL", "").strip().lower())
+
+
+def log_to_file(path, level=logging.DEBUG):
+    """Also append this module's log records to path (once per process; repeat calls are no-ops)."""
+    path = os.path.abspath(path)
+    for handler in logger.handlers:
+        if isinstance(handler, logging.FileHandler) and handler.baseFilename == path:
+            return handler
+    handler = logging.FileHandler(path, encoding="utf-8")
+    handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(message)s"))
+    logger.addHandler(handler)
+    logger.setLevel(min(level, logger.level or level))
+    return handler
+
+
+class Diagnostics:
+    """Leveled diagnostic messages and timing spans, off unless a level is given.
+
+    Messages take logging-style arguments (diagnostics.debug("Found %d rows", n)) and are only
+    formatted when their level is enabled, so a disabled channel costs one comparison per call;
+    guard anything expensive to compute with enabled_for(). Enabled entries are kept (newest
+    max_entries) for the app's diagnostics panel and also passed to this module's logger (see
+    log_to_file). span(name) records how long its block took.
+    """
+
+    def __init__(self, level=None, max_entries=MAX_ENTRIES):
+        self.level = level
+        self._entries = deque(maxlen=max_entries)
+
+    @property
+    def enabled(self):
+        return self.level is not None
+
+    def enabled_for(self, level):
+        return self.level is not None and level >= self.level
+
+    def _record(self, level, message, seconds=None):
+        self._entries.append({
+            "at": time.time(),
+            "level": logging.getLevelName(level),
+            "message": message,
+            "seconds": seconds,
+        })
+        if logger.isEnabledFor(level):
+            logger.log(level, message if seconds is None else f"{message} ({seconds * 1000:.1f} ms)")
+
+    def log(self, level, message, *args):
+        if self.enabled_for(level):
+            self._record(level, message % args if args else message)
+
+    def debug(self, message, *args):
+        self.log(logging.DEBUG, message, *args)
+
+    def info(self, message, *args):
+        self.log(logging.INFO, message, *args)
+
+    def warning(self, message, *args):
+        self.log(logging.WARNING, message, *args)
+
+    def error(self, message, *args):
+        self.log(logging.ERROR, message, *args)
+
+    @contextmanager
+    def span(self, name, level=logging.INFO):
+        """Time the with-block and record it as one entry named name (also when it raises)."""
+        if not self.enabled_for(level):
+            yield
+            return
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._record(level, name, seconds=time.perf_counter() - started)
+
+    def entries(self):
+        """Recorded entries, oldest first: dicts with at, level, message and seconds (spans only)."""
+        return list(self._entries)
+
+    def clear(self):
+        self._entries.clear()
+
+
+# Shared channel for callers given no diagnostics: always off
+DISABLED = Diagnostics()
@@ -0,0 +1,168 @@
+import copy
+import hashlib
+import io
+import os
+import re
+import threading
+
+from docx.oxml.parser import element_class_lookup
+from docxtpl import DocxTemplate
+from jinja2 import Template, TemplateError
+from lxml import etree
+
+# Same settings docxtpl uses for rendered XML (recover from sloppy markup), plus python-docx's
+# element classes so the parsed tree can become the document part directly
+_RENDERED_XML_PARSER = etree.XMLParser(recover=True)
+_RENDERED_XML_PARSER.set_element_class_lookup(element_class_lookup)
+
+# String properties docxtpl renders in docProps/core.xml
+_CORE_PROPERTIES = ("author", "comments", "identifier", "language", "subject", "title")
+
+_FOOTNOTES_CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.wordprocessingml.footnotes+xml"
+
+_BODY_MARKER = "docx-template-body"
+
+
+def _add_docx_context(exc, src_xml):
+    """Attach the template text around a Jinja error's line as exc.docx_context, as docxtpl does."""
+    if getattr(exc, "lineno", None) is not None:
+        line_number = max(exc.lineno - 4, 0)
+        exc.docx_context = [
+            re.sub(r"<[^>]+>", "", line) for line in src_xml.splitlines()[line_number:line_number + 7]
+        ]
+
+
+def _compile_part(docx_template, xml):
+    """Patch raw part XML the way docxtpl does and compile it. Returns (source XML, Jinja template)."""
+    xml = re.sub(r"<w:p([ >])", r"\n<w:p\1", docx_template.patch_xml(xml))
+    try:
+        return xml, Template(xml)
+    except TemplateError as exc:
+        _add_docx_context(exc, xml)
+        raise
+
+
+class CompiledTemplate:
+    """A .docx template parsed once and kept in memory for repeated rendering.
+
+    Holds the template's zip bytes (and their sha256) plus every templated part (body, headers, footers, footnotes
+    and core properties) already run through docxtpl's XML patching and compiled by Jinja.
+    clone() returns a DocxTemplate that renders from these instead of re-patching and
+    re-compiling the template each time. Instances are read-only and safe to share across threads.
+    """
+
+    def __init__(self, template_path):
+        with open(template_path, "rb") as f:
+            self.template_bytes = f.read()
+        self.sha256 = hashlib.sha256(self.template_bytes).hexdigest()
+        docx_template = DocxTemplate(io.BytesIO(self.template_bytes))
+        docx = docx_template.get_docx()
+
+        # Document root split around the body, so a render parses the complete document once
+        shell = copy.deepcopy(docx.element)
+        shell.replace(shell.body, etree.Element(_BODY_MARKER))
+        self.document_prefix, self.document_suffix = etree.tostring(shell, encoding="unicode").split(f"<{_BODY_MARKER}/>")
+        # The body's own copies of the root's namespace declarations are dropped, as they are when
+        # docxtpl puts the rendered body back into the document
+        body_xml = re.sub(r'^<w:body(?:\s+xmlns(?::\w+)?="[^"]*")+', "<w:body", docx_template.get_xml())
+        self.body = _compile_part(docx_template, body_xml)
+
+        self.headers_footers = []
+        for uri in (DocxTemplate.HEADER_URI, DocxTemplate.FOOTER_URI):
+            for rel_key, part in docx_template.get_headers_footers(uri):
+                xml = docx_template.get_part_xml(part)
+                encoding = docx_template.get_headers_footers_encoding(xml)
+                self.headers_footers.append((rel_key, encoding, _compile_part(docx_template, xml)))
+
+        self.footnotes = {}
+        for part in docx.part.package.parts:
+            if part.content_type == _FOOTNOTES_CONTENT_TYPE:
+                xml = part.blob.decode("utf-8") if isinstance(part.blob, bytes) else part.blob
+                self.footnotes[part.partname] = _compile_part(docx_template, xml)
+
+        self.core_properties = {
+            prop: Template(getattr(docx.core_properties, prop)) for prop in _CORE_PROPERTIES
+        }
+
+    def clone(self):
+        """Fresh renderable copy of the template (a DocxTemplate loaded from the cached bytes)."""
+        return TemplateClone(self)
+
+
+class TemplateClone(DocxTemplate):
+    """DocxTemplate whose render() uses the pre-compiled parts of a CompiledTemplate.
+
+    Output matches DocxTemplate.render() (see tests/test_docx_template.py), and Jinja errors
+    carry the same docx_context; a custom jinja_env or autoescape falls back to it. render()
+    uses docxtpl's rendering helpers directly, so requirements.txt pins the docxtpl release it
+    was checked against.
+    """
+
+    def __init__(self, compiled):
+        super().__init__(io.BytesIO(compiled.template_bytes))
+        self.compiled = compiled
+
+    def _render_compiled(self, compiled_part, part, context):
+        """Render a compiled part and apply docxtpl's post-processing (see render_xml_part)."""
+        src_xml, template = compiled_part
+        self.current_rendering_part = part
+        try:
+            dst_xml = template.render(context)
+        except TemplateError as exc:
+            _add_docx_context(exc, src_xml)
+            raise
+        dst_xml = re.sub(r"\n<w:p([ >])", r"<w:p\1", dst_xml)
+        dst_xml = (
+            dst_xml.replace("{_{", "{{")
+            .replace("}_}", "}}")
+            .replace("{_%", "{%")
+            .replace("%_}", "%}")
+        )
+        return self.resolve_listing(dst_xml)
+
+    def render(self, context, jinja_env=None, autoescape=False):
+        if jinja_env is not None or autoescape:
+            return super().render(context, jinja_env, autoescape)
+
+        self.render_init()
+        compiled = self.compiled
+        part = self.docx.part
+
+        # Body: rendered into the whole document and parsed once (replacing only the body element
+        # of the loaded document makes lxml re-home every node, which dominates render time)
+        body_xml = self._render_compiled(compiled.body, part, context)
+        tree = self.fix_tables(compiled.document_prefix + body_xml + compiled.document_suffix)
+        self.fix_docpr_ids(tree)
+        part._element = etree.fromstring(etree.tostring(tree), _RENDERED_XML_PARSER)
+        self.docx = part.document
+
+        for rel_key, encoding, compiled_part in compiled.headers_footers:
+            header_part = part.rels[rel_key].target_part
+            xml = self._render_compiled(compiled_part, header_part, context)
+            self.map_headers_footers_xml(rel_key, xml.encode(encoding))
+
+        for prop, template in compiled.core_properties.items():
+            setattr(self.docx.core_properties, prop, template.render(context))
+
+        for footnotes_part in part.package.parts:
+            compiled_part = compiled.footnotes.get(footnotes_part.partname)
+            if compiled_part is not None:
+                footnotes_part._blob = self._render_compiled(compiled_part, footnotes_part, context).encode("utf-8")
+
+        self.is_rendered = True
+
+
+_compiled_templates = {}
+_compiled_templates_lock = threading.Lock()
+
+
+def load_compiled_template(template_path):
+    """Process-wide CompiledTemplate for template_path, re-parsed only when the file changes."""
+    stat = os.stat(template_path)
+    key = (os.path.abspath(template_path), stat.st_mtime_ns, stat.st_size)
+    with _compiled_templates_lock:
+        compiled = _compiled_templates.get(key[0])
+        if compiled is None or compiled[0] != key:
+            compiled = (key, CompiledTemplate(template_path))
+            _compiled_templates[key[0]] = compiled
+        return compiled[1]
@@ -0,0 +1,88 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+
+from utils.datafile import SUMMARY_VERSION
+
+DEFAULT_CACHE_DIR = os.path.join(".cache", "ingest")
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+def datafile_cache_key(file_bytes):
+    """Content address for an uploaded DataFile: sha256 of the aggregation version plus the bytes."""
+    digest = hashlib.sha256()
+    digest.update(f"summary-v{SUMMARY_VERSION}\0".encode())
+    digest.update(file_bytes)
+    return digest.hexdigest()
+
+
+class IngestCache:
+    """On-disk cache of DataFile summaries keyed by datafile_cache_key().
+
+    Each entry is one small JSON file. A hit refreshes the file's mtime, and after every write the
+    least recently used entries are evicted until the directory is back under max_bytes.
+    """
+
+    def __init__(self, cache_dir=None, max_bytes=None):
+        self.cache_dir = cache_dir or os.environ.get("INGEST_CACHE_DIR", DEFAULT_CACHE_DIR)
+        self.max_bytes = int(max_bytes or os.environ.get("INGEST_CACHE_MAX_BYTES", DEFAULT_MAX_BYTES))
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _entry_path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, key):
+        """Cached summary for key, or None."""
+        path = self._entry_path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                summary = json.load(f)
+            os.utime(path, None)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        if summary.get("version") != SUMMARY_VERSION:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return summary
+
+    def put(self, key, summary):
+        """Store summary under key (atomic write), then enforce the size bound. Errors are ignored."""
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(prefix=f"{key}.", suffix=".tmp", dir=self.cache_dir)
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(summary, f)
+            os.replace(tmp_path, self._entry_path(key))
+        except OSError:
+            return
+        self.evict()
+
+    def evict(self):
+        """Delete least recently used entries until the cache fits in max_bytes."""
+        with self._lock:
+            try:
+                entries = []
+                with os.scandir(self.cache_dir) as it:
+                    for entry in it:
+                        if entry.name.endswith(".json"):
+                            stat = entry.stat()
+                            entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+            except OSError:
+                return
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+                total -= size
+                self.evictions += 1
@@ -0,0 +1,121 @@
+import os
+import sqlite3
+import time
+
+MANIFEST_FILENAME = "manifest.sqlite"
+
+# Status values stored in the manifest
+DONE = "done"
+FAILED = "failed"
+PARTIAL = "partial"
+
+
+class BatchManifest:
+    """Checkpoint of a folder batch run, kept as sqlite in the run's output folder.
+
+    One row per DataFile (content hash, status, employers, read time) and one row per employer
+    report (input hash, status, output path, render time, error). Rows are committed as each task
+    finishes, so an interrupted run can be resumed by running again with the same output folder:
+    DataFiles whose hash is unchanged and whose reports all completed are not even read, and within
+    other DataFiles only reports that failed or whose inputs changed are rendered again.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS datafiles (
+                datafile TEXT PRIMARY KEY,
+                file_hash TEXT NOT NULL,
+                status TEXT NOT NULL,
+                employers INTEGER NOT NULL,
+                read_seconds REAL NOT NULL,
+                updated_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS reports (
+                datafile TEXT NOT NULL,
+                uif_reg_number TEXT NOT NULL,
+                input_hash TEXT NOT NULL,
+                status TEXT NOT NULL,
+                output_path TEXT,
+                seconds REAL NOT NULL,
+                error TEXT,
+                updated_at REAL NOT NULL,
+                PRIMARY KEY (datafile, uif_reg_number)
+            );
+        """)
+
+    @classmethod
+    def for_output_dir(cls, output_dir):
+        return cls(os.path.join(output_dir, MANIFEST_FILENAME))
+
+    def datafile_complete(self, datafile, file_hash):
+        """Employer count if datafile was fully reported from this exact content, else None.
+
+        Complete means the file's last run finished with every report done and every report file
+        still on disk.
+        """
+        row = self.conn.execute(
+            "SELECT file_hash, status, employers FROM datafiles WHERE datafile = ?", (datafile,)
+        ).fetchone()
+        if row is None or row[0] != file_hash or row[1] != DONE:
+            return None
+        reports = self.conn.execute(
+            "SELECT status, output_path FROM reports WHERE datafile = ?", (datafile,)
+        ).fetchall()
+        if len(reports) != row[2]:
+            return None
+        if any(status != DONE or not output_path or not os.path.exists(output_path) for status, output_path in reports):
+            return None
+        return row[2]
+
+    def completed_report(self, datafile, uif_reg_number, input_hash):
+        """Output path of an earlier successful render of the same inputs (file still on disk), else None."""
+        row = self.conn.execute(
+            "SELECT input_hash, status, output_path FROM reports WHERE datafile = ? AND uif_reg_number = ?",
+            (datafile, uif_reg_number),
+        ).fetchone()
+        if row is None or row[0] != input_hash or row[1] != DONE:
+            return None
+        if not row[2] or not os.path.exists(row[2]):
+            return None
+        return row[2]
+
+    def completed_outputs(self):
+        """Output paths of every report recorded as done whose file is still on disk."""
+        rows = self.conn.execute(
+            "SELECT output_path FROM reports WHERE status = ? AND output_path IS NOT NULL ORDER BY datafile, output_path",
+            (DONE,),
+        )
+        return [path for (path,) in rows if os.path.exists(path)]
+
+    def record_datafile(self, datafile, file_hash, status, employers=0, read_seconds=0.0):
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO datafiles VALUES (?, ?, ?, ?, ?, ?)",
+                (datafile, file_hash, status, employers, read_seconds, time.time()),
+            )
+
+    def record_report(self, datafile, uif_reg_number, input_hash, status, output_path=None, seconds=0.0,
+                      error=None):
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO reports VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (datafile, uif_reg_number, input_hash, status, output_path, seconds, error, time.time()),
+            )
+
+    def forget_missing_reports(self, datafile, uif_reg_numbers):
+        """Drop report rows for employers no longer present in datafile."""
+        keep = set(uif_reg_numbers)
+        stale = [
+            (datafile, uif) for (uif,) in self.conn.execute(
+                "SELECT uif_reg_number FROM reports WHERE datafile = ?", (datafile,)
+            ) if uif not in keep
+        ]
+        if stale:
+            with self.conn:
+                self.conn.executemany("DELETE FROM reports WHERE datafile = ? AND uif_reg_number = ?", stale)
+
+    def close(self):
+        self.conn.close()
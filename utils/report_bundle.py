@@ -0,0 +1,137 @@
+import io
+import os
+import tempfile
+import time
+import zipfile
+from datetime import datetime
+
+from utils.manifest import MANIFEST_FILENAME, BatchManifest
+
+CHUNK_SIZE = 1024 * 1024
+# Built bundles live in this subfolder of the reports folder, where the retention sweep removes old ones
+BUNDLES_DIRNAME = ".bundles"
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only, non-seekable stream that collects what zipfile writes until it is drained."""
+
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        # zipfile records header offsets from tell(); seek() stays unsupported
+        return self._position
+
+    def drain(self):
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def iter_zip_chunks(entries, chunk_size=CHUNK_SIZE):
+    """Yield a ZIP archive of entries ((arcname, path) pairs) as byte chunks.
+
+    Files are copied chunk_size bytes at a time and every chunk is yielded as soon as it is
+    written, so memory stays flat however many reports go in. Reports are stored uncompressed
+    (.docx files are already deflated). Unreadable files are skipped.
+    """
+    sink = _ChunkSink()
+    with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_STORED, allowZip64=True) as archive:
+        for arcname, path in entries:
+            try:
+                source = open(path, "rb")
+            except OSError:
+                continue
+            with source:
+                info = zipfile.ZipInfo(arcname, date_time=time.localtime(os.fstat(source.fileno()).st_mtime)[:6])
+                with archive.open(info, "w", force_zip64=True) as target:
+                    while True:
+                        block = source.read(chunk_size)
+                        if not block:
+                            break
+                        target.write(block)
+                        yield sink.drain()
+            yield sink.drain()
+    yield sink.drain()
+
+
+def write_zip_bundle(entries, output_path, chunk_size=CHUNK_SIZE):
+    """Stream the ZIP of entries into output_path (temp file + rename). Returns its size in bytes."""
+    directory = os.path.dirname(output_path) or "."
+    fd, tmp_path = tempfile.mkstemp(prefix=os.path.basename(output_path) + ".", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            for chunk in iter_zip_chunks(entries, chunk_size):
+                if chunk:
+                    f.write(chunk)
+        os.replace(tmp_path, output_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return os.path.getsize(output_path)
+
+
+def read_bundle(path):
+    """Bytes of a finished bundle, read only when it is actually downloaded."""
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def folder_report_entries(root_dir, since=None):
+    """(arcname, path) for every report under root_dir, arcnames relative to it, sorted.
+
+    When the folder holds a batch manifest only reports it records as done are included. since
+    (a datetime) keeps reports modified at or after it.
+    """
+    manifest_path = os.path.join(root_dir, MANIFEST_FILENAME)
+    if os.path.exists(manifest_path):
+        manifest = BatchManifest(manifest_path)
+        try:
+            paths = manifest.completed_outputs()
+        finally:
+            manifest.close()
+    else:
+        paths = []
+        for folder, _, names in os.walk(root_dir):
+            paths.extend(os.path.join(folder, name) for name in names if name.lower().endswith(".docx"))
+
+    cutoff = since.timestamp() if since is not None else None
+    entries = []
+    for path in paths:
+        try:
+            if cutoff is not None and os.path.getmtime(path) < cutoff:
+                continue
+        except OSError:
+            continue
+        entries.append((os.path.relpath(path, root_dir).replace(os.sep, "/"), path))
+    return sorted(entries)
+
+
+def bundle_filename(label="reports"):
+    """Download name for a bundle, e.g. reports_20240115_093000.zip."""
+    return f"{label}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.zip"
+
+def bundle_dir(reports_dir="generated_reports"):
+    """Folder built bundles are written to (see BUNDLES_DIRNAME)."""
+    return os.path.join(reports_dir, BUNDLES_DIRNAME)
+
+
+def bundle_sources(reports_dir="generated_reports"):
+    """Folders a bundle can be built from: reports_dir itself, then its subfolders (batch runs), newest first."""
+    if not os.path.isdir(reports_dir):
+        return []
+    subfolders = [
+        entry.path for entry in os.scandir(reports_dir)
+        if entry.is_dir(follow_symlinks=False) and entry.name != BUNDLES_DIRNAME
+    ]
+    return [reports_dir] + sorted(subfolders, key=os.path.getmtime, reverse=True)
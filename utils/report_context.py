@@ -0,0 +1,180 @@
+from config.copy_paste_text import get_batch_default_texts, substitute_template_variables
+from utils.datafile import MONTHLY_CLAIM_KEYS
+
+# Template field holding the amount claimed for each month in monthly_claims
+CLAIM_FIELD_KEYS = {
+    "April_2020": "April_2020_Indicate_NA_where_no_claim_",
+    "May_2020": "May_2020",
+    "June_2020": "June_2020",
+    "July_2020": "July_2020",
+    "Aug_2020": "Aug_2020",
+    "Sep_2020": "Sep_2020",
+    "Oct_2020": "Oct_2020",
+    "Nov_2020": "Nov_2020",
+    "Dec_2020": "Dec_2020",
+    "Jan_2021": "Jan_2021",
+    "Feb_2021": "Feb_2021",
+    "Mar_2021": "Mar_2021",
+    "Apr_2021": "Apr_2021",
+    "May_2021": "May_2021",
+    "Jun_2021": "Jun_2021",
+    "July_2021": "July_2021",
+}
+
+# Template field holding the amount paid to beneficiaries for each month
+PAYMENT_FIELD_KEYS = {
+    "April_2020": "April_2020_Indicate_NA_where_no_paymen",
+    "May_2020": "May_20201",
+    "June_2020": "June_20201",
+    "July_2020": "July_20201",
+    "Aug_2020": "Aug_20201",
+    "Sep_2020": "Sep_20201",
+    "Oct_2020": "Oct_20201",
+    "Nov_2020": "Nov_20201",
+    "Dec_2020": "Dec_20201",
+    "Jan_2021": "Jan_20211",
+    "Feb_2021": "Feb_20211",
+    "Mar_2021": "Mar_20211",
+    "Apr_2021": "Apr_20211",
+    "May_2021": "May_20211",
+    "Jun_2021": "Jun_20211",
+    "July_2021": "July_20211",
+}
+
+# Template field for each helper-text section (session_state.button_data key)
+BUTTON_DATA_FIELDS = {
+    "main_findings": "Main_Findings",
+    "limitation_of_scope": "Limitation_of_scope",
+    "compliance_comments": "Compliance_Comments",
+    "overall_outcomes": "Overall_Outcomes",
+    "payment_verification_scope": "Payment_Verification_Scope",
+    "employment_verification_scope": "Employment_Verification_Scope",
+    "claims_validity_scope": "Claims_Validity_Scope",
+    "objective_1_comment": "Objective_1_Comment",
+    "objective_2_comment": "Objective_2_Comment",
+    "objective_3_comment": "Objective_3_Comment",
+    "objective_4_comment": "Objective_4_Comment",
+    "objective_5_comment": "Objective_5_Comment",
+}
+
+# Individual findings a new form starts with
+DEFAULT_FINDINGS = [
+    {
+        "description": "IRP5s, ID Copies and Employment contracts for the all the beneficiaries were not provided",
+        "rating": "Critical",
+        "page_ref": "TP.2"
+    },
+    {
+        "description": "The employer did not provide all the required bank statements detailing the funds they received from UIF.",
+        "rating": "Critical",
+        "page_ref": "TP.3"
+    },
+    {
+        "description": "No payroll data or EMP501/201 documents were provided to confirm the employer's monthly UIF contributions/declarations.",
+        "rating": "Critical",
+        "page_ref": "TP.4"
+    }
+]
+
+# Values a new form starts with for the remaining shared fields
+DEFAULT_SHARED_FIELDS = {
+    "Compliance_with_UI_Act_Provide_comments": "",
+    "Compliance_Documents_List": "N/A",
+    "Possible_Fraud_Fraud_Indicators_YesNo1": "No",
+    "Overpayments_Identified_YesNo1": "No",
+}
+
+
+def findings_fields(findings):
+    """Finding_<i>, Finding_<i>_Rating and Finding_<i>_Page template fields."""
+    fields = {}
+    for i, finding in enumerate(findings, 1):
+        fields[f"Finding_{i}"] = finding["description"]
+        fields[f"Finding_{i}_Rating"] = finding["rating"]
+        fields[f"Finding_{i}_Page"] = finding["page_ref"] or f"TP.{i+1}"
+    return fields
+
+
+def default_shared_fields(form_data):
+    """Shared sections for reports generated without the form.
+
+    Helper texts come from BATCH_DEFAULTS in config/copy_paste_text.py, substituted with
+    form_data (the employer's fields); everything else takes the value a new form starts with.
+    """
+    fields = dict(DEFAULT_SHARED_FIELDS)
+    texts = get_batch_default_texts(form_data)
+    for section, field in BUTTON_DATA_FIELDS.items():
+        fields[field] = texts.get(section, "")
+    fields.update(findings_fields(DEFAULT_FINDINGS))
+    return fields
+
+
+def datafile_form_fields(summary, address="", province=""):
+    """form_data fields populated from a DataFile summary (company details, financials, months).
+
+    Payment fields are left blank for months with a claim (user input) and "N/A" otherwise.
+    """
+    total_amount_verified = summary["total_amount_verified"]
+    monthly_claims = summary["monthly_claims"]
+    fields = {
+        "Name_of_Employer": summary["name_of_employer"],
+        "UIF_REG_Number": summary["uif_reg_number"],
+        "Industry": summary["industry"],
+        "Number_of_Employees": str(summary["number_of_employees"]),
+        "Period_Claimed_For_Lockdown_Period": summary["period_claimed"],
+        "Location_Type_address_in_full": address,  # Auto-populated from address book
+        "Province": province,  # Auto-populated from address book
+        "Total_Amount_Verified": f"R {total_amount_verified:.2f}",
+        "Amount_Verified_as_Accurate": "",  # Leave blank for user input
+        "Amount_not_Disbursed": f"R {total_amount_verified:.2f}",
+        "Verified_Percentage": "0.00%",  # Will be calculated when user inputs amount verified as accurate
+        "Affected_Employees": "",  # Leave blank for user input
+    }
+    for month in MONTHLY_CLAIM_KEYS:
+        claim_amount = monthly_claims[month]
+        fields[CLAIM_FIELD_KEYS[month]] = claim_amount
+        fields[PAYMENT_FIELD_KEYS[month]] = "" if claim_amount != "N/A" else "N/A"
+    return fields
+
+
+def iteration_fields(iteration_counts, gaps_flag):
+    """Iteration_1..16, Iteration_total and Gaps template fields."""
+    iteration_counts = iteration_counts or []
+    fields = {}
+    for idx in range(16):
+        fields[f"Iteration_{idx+1}"] = str(iteration_counts[idx]) if idx < len(iteration_counts) else "0"
+    fields["Iteration_total"] = str(sum(iteration_counts)) if iteration_counts else "0"
+    fields["Gaps"] = gaps_flag or "No"
+    return fields
+
+
+def build_employer_context(summary, address="", province="", shared_fields=None):
+    """Complete template context for one employer without going through the form.
+
+    shared_fields holds the sections that are not employer specific (findings, scopes, objectives,
+    compliance); the employer's DataFile fields are laid over them. Helper texts in shared_fields
+    (BUTTON_DATA_FIELDS) may keep their {{variables}}, which are filled in with this employer's
+    fields. Without shared_fields the configured batch defaults are used (see
+    default_shared_fields). Months with a claim default their payment to the claimed amount, as
+    the monthly payments section does.
+    """
+    employer_fields = datafile_form_fields(summary, address, province)
+    if shared_fields is None:
+        shared_fields = default_shared_fields(employer_fields)
+    context = dict(shared_fields)
+    for field in BUTTON_DATA_FIELDS.values():
+        if field in context:
+            context[field] = substitute_template_variables(context[field], employer_fields)
+    context.update(employer_fields)
+    for month, claim_amount in summary["monthly_claims"].items():
+        if claim_amount != "N/A":
+            context[PAYMENT_FIELD_KEYS[month]] = claim_amount
+    context.update(iteration_fields(summary["iteration_counts"], summary["gaps_flag"]))
+
+    # Add compliance field for template compatibility
+    if "Compliance_Comments" in context:
+        context["Compliance"] = "Yes" if "accurate" in context["Compliance_Comments"].lower() else "No"
+    # Template expects Finding_3 and Finding_3_Rating
+    context.setdefault("Finding_3", "")
+    context.setdefault("Finding_3_Rating", "")
+    return context
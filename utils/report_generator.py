@@ -1,36 +1,211 @@
-from docxtpl import DocxTemplate
+import hashlib
+import io
+import json
+import logging
 import os
+import re
+import tempfile
+import threading
+import time
+import uuid
+from collections import OrderedDict
 from datetime import datetime
-from html import escape
+from functools import lru_cache
 
-class ReportGenerator:
-    def __init__(self, template_path):
-        """Initialize with hardcoded template path."""
-        if not os.path.exists(template_path):
-            raise FileNotFoundError(f"Template not found at {template_path}")
-        self.template = DocxTemplate(template_path)
+from utils.docx_template import load_compiled_template
 
-    def _sanitize_for_xml(self, value):
-        """Recursively escape XML-unsafe characters in strings within context.
 
-        Handles nested dicts/lists used by the template context. Ensures None -> "".
-        """
+def safe_filename(name):
+    """Employer name as a filesystem-safe file name stem."""
+    name = str(name).replace(" ", "_")
+    for ch in ['\\', '/', ':', '*', '?', '"', '<', '>', '|']:
+        name = name.replace(ch, "")
+    return name
+
+
+def report_filename(context):
+    """Default report file name, unique per generation: <employer>_<date>_<time>_<id>.docx.
+
+    The date is the one set by render_report; the time and random id keep two generations for
+    the same employer on the same day from overwriting each other.
+    """
+    employer_name = safe_filename(context.get("Name_of_Employer", "report"))
+    generation = datetime.now().strftime("%H%M%S") + "_" + uuid.uuid4().hex[:8]
+    return f"{employer_name}_{context['date']}_{generation}.docx"
+
+
+def write_file_atomic(path, data):
+    """Write bytes to path via a temp file in the same folder and a rename, so readers never see a partial file."""
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix=os.path.basename(path) + ".", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+# Characters XML 1.0 cannot hold (C0 controls other than tab/LF/CR, lone surrogates, U+FFFE/U+FFFF);
+# they arrive in text pasted from Excel and make render() fail
+_XML_ILLEGAL = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f\ud800-\udfff\ufffe\uffff]")
+
+
+# Strings up to this long are memoised (field values repeat across reports); longer ones, such as
+# pasted findings, are sanitized each time so the cache cannot pin large texts in memory
+SANITIZE_CACHE_MAX_CHARS = 1024
+
+
+def _sanitize_text(text):
+    """(safe text, changed, had illegal characters) for one string.
+
+    Clean strings are recognised with C-level scans (every illegal character is non-printable, so
+    the regex only runs on strings that fail isprintable()) and returned as-is.
+    """
+    stripped = not text.isprintable() and _XML_ILLEGAL.search(text) is not None
+    if stripped:
+        text = _XML_ILLEGAL.sub("", text)
+    if "&" in text or "<" in text or ">" in text:
+        # Escape &, <, >. Leave quotes as-is for readability in docs
+        return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;"), True, stripped
+    return text, stripped, stripped
+
+
+_sanitize_short_text = lru_cache(maxsize=4096)(_sanitize_text)
+
+
+def sanitize_for_xml(value):
+    """Copy of a template context that is safe to render into XML, plus counts of what changed.
+
+    Strings are escaped (&, <, > - quotes are left as-is for readability) and stripped of
+    characters XML cannot hold, such as control characters pasted from Excel; None
+    becomes "". Strings up to SANITIZE_CACHE_MAX_CHARS are memoised. Nested dicts, lists and tuples are handled. Returns (safe_value, stats) where stats
+    holds values_changed and values_stripped (values that lost illegal characters).
+    """
+    stats = {"values_changed": 0, "values_stripped": 0}
+
+    def sanitize(value):
+        if isinstance(value, str):
+            if len(value) <= SANITIZE_CACHE_MAX_CHARS:
+                safe, changed, stripped = _sanitize_short_text(value)
+            else:
+                safe, changed, stripped = _sanitize_text(value)
+            if changed:
+                stats["values_changed"] += 1
+                stats["values_stripped"] += stripped
+            return safe
         if value is None:
+            stats["values_changed"] += 1
             return ""
-        if isinstance(value, str):
-            # Escape &, <, >. Leave quotes as-is for readability in docs
-            return escape(value, quote=False)
+        if isinstance(value, dict):
+            return {key: sanitize(val) for key, val in value.items()}
         if isinstance(value, list):
-            return [self._sanitize_for_xml(item) for item in value]
+            return [sanitize(item) for item in value]
         if isinstance(value, tuple):
-            return tuple(self._sanitize_for_xml(item) for item in value)
-        if isinstance(value, dict):
-            return {key: self._sanitize_for_xml(val) for key, val in value.items()}
+            return tuple(sanitize(item) for item in value)
         # Numbers, booleans, etc. are safe
         return value
 
-    def generate_report(self, context):
-        """Generate report and return output path."""
+    return sanitize(value), stats
+
+
+logger = logging.getLogger(__name__)
+
+# Phases timed for every generation (see ReportGenerator.last_timings)
+TIMING_PHASES = ("template_load", "sanitize", "render", "save")
+
+
+def timings_log_line(timings, **fields):
+    """One structured (JSON) log line for a generation's timings, e.g. fields=employer=..., output_path=..."""
+    record = {"event": "report_generated"}
+    record.update(fields)
+    for phase in TIMING_PHASES + ("total",):
+        record[f"{phase}_ms"] = round(timings.get(phase, 0.0) * 1000, 2)
+    record["reused"] = timings.get("reused", False)
+    return json.dumps(record, default=str)
+
+
+# Recently rendered reports kept per process, keyed by context_hash()
+RENDER_CACHE_SIZE = 16
+# Recently written report paths remembered per process (see generate_report)
+WRITTEN_CACHE_SIZE = 1024
+
+
+def context_hash(context, template_hash):
+    """Identity of a report's inputs: sha256 of the template hash plus the context as canonical JSON."""
+    digest = hashlib.sha256()
+    digest.update(template_hash.encode())
+    digest.update(b"\0")
+    digest.update(json.dumps(context, sort_keys=True, ensure_ascii=False, default=str).encode("utf-8"))
+    return digest.hexdigest()
+
+
+_rendered_reports = OrderedDict()
+_written_reports = OrderedDict()
+_rendered_reports_lock = threading.Lock()
+
+
+def _written_stamp(path, key):
+    """(context hash, mtime, size) of a written report, None when the file is gone."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return key, stat.st_mtime_ns, stat.st_size
+
+
+class ReportGenerator:
+    def __init__(self, template_path):
+        """Initialize with hardcoded template path.
+
+        The template is parsed once per process (see load_compiled_template) and every report
+        renders from a fresh in-memory clone of it.
+
+        After each render_report()/generate_report(), last_timings holds seconds per phase
+        (TIMING_PHASES) plus total and reused; template_load includes loading the template here
+        for the first report of this generator. Each generation is also logged as a JSON line
+        (timings_log_line) at INFO on this module's logger.
+        """
+        if not os.path.exists(template_path):
+            raise FileNotFoundError(f"Template not found at {template_path}")
+        started = time.perf_counter()
+        self.template = load_compiled_template(template_path)
+        self._template_load_seconds = time.perf_counter() - started
+        self.last_context_hash = None
+        self.last_render_reused = False
+        self.last_sanitize_stats = {}
+        self.last_timings = {}
+
+    def _start_timings(self):
+        # The template load done in __init__ is charged to this generator's first report
+        self.last_timings = dict.fromkeys(TIMING_PHASES, 0.0)
+        self.last_timings["template_load"] = self._template_load_seconds
+        self.last_timings["total"] = self._template_load_seconds
+        self._template_load_seconds = 0.0
+
+    def _finish_timings(self, started, **fields):
+        self.last_timings["total"] += time.perf_counter() - started
+        self.last_timings["reused"] = self.last_render_reused
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(timings_log_line(self.last_timings, **fields))
+
+    def render_report(self, context):
+        """Render the report in memory and return the .docx file contents as bytes.
+
+        Rendering is skipped when the same sanitized context was rendered from the same template
+        recently (e.g. Final Submit pressed again without edits); the earlier bytes are returned and
+        last_render_reused is set.
+        """
+        started = time.perf_counter()
+        report_bytes = self._render_report(context)
+        self._finish_timings(started, employer=context.get("Name_of_Employer"))
+        return report_bytes
+
+    def _prepare_context(self, context):
+        """Complete context for rendering and return its sanitized copy; sets last_context_hash."""
         # Add date for report naming
         context["date"] = datetime.now().strftime("%Y-%m-%d")
         # Ensure monthly_amounts is in context for table rendering
@@ -41,17 +216,84 @@ class ReportGenerator:
             item for item in context["monthly_amounts"]
             if item["amount"] or item["payment"]
         ]
-        # Sanitize context to prevent XML parsing errors from characters like & and <
-        safe_context = self._sanitize_for_xml(context)
-        # Render template
-        self.template.render(safe_context)
-        # Create output directory
-        os.makedirs("generated_reports", exist_ok=True)
-        # Generate unique output path
-        employer_name = str(context.get("Name_of_Employer", "report")).replace(" ", "_")
-        # Basic filesystem-safe name
-        for ch in ['\\', '/', ':', '*', '?', '"', '<', '>', '|']:
-            employer_name = employer_name.replace(ch, "")
-        output_path = f"generated_reports/{employer_name}_{context['date']}.docx"
-        self.template.save(output_path)
-        return output_path
\ No newline at end of file
+        # Sanitize context to prevent XML parsing errors from characters like & and < or control characters
+        safe_context, self.last_sanitize_stats = sanitize_for_xml(context)
+        self.last_context_hash = context_hash(safe_context, self.template.sha256)
+        return safe_context
+
+    def report_context_hash(self, context):
+        """context_hash() of the report render_report(context) would produce, without rendering it.
+
+        Starts this generator's timings like a render does (the work is charged to sanitize), so a
+        caller that finds the report already saved can report them as a reused generation.
+        """
+        self._start_timings()
+        phase_started = time.perf_counter()
+        self._prepare_context(context)
+        self.last_timings["sanitize"] = time.perf_counter() - phase_started
+        self.last_timings["total"] += self.last_timings["sanitize"]
+        return self.last_context_hash
+
+    def _render_report(self, context):
+        self._start_timings()
+        timings = self.last_timings
+        phase_started = time.perf_counter()
+        safe_context = self._prepare_context(context)
+        key = self.last_context_hash
+        with _rendered_reports_lock:
+            report_bytes = _rendered_reports.get(key)
+            if report_bytes is not None:
+                _rendered_reports.move_to_end(key)
+        self.last_render_reused = report_bytes is not None
+        timings["sanitize"] = time.perf_counter() - phase_started
+        if report_bytes is not None:
+            return report_bytes
+
+        # Render a clone of the parsed template (render() mutates the document)
+        phase_started = time.perf_counter()
+        document = self.template.clone()
+        timings["template_load"] += time.perf_counter() - phase_started
+        phase_started = time.perf_counter()
+        document.render(safe_context)
+        timings["render"] = time.perf_counter() - phase_started
+        phase_started = time.perf_counter()
+        buffer = io.BytesIO()
+        document.save(buffer)
+        report_bytes = buffer.getvalue()
+        timings["save"] = time.perf_counter() - phase_started
+        with _rendered_reports_lock:
+            _rendered_reports[key] = report_bytes
+            while len(_rendered_reports) > RENDER_CACHE_SIZE:
+                _rendered_reports.popitem(last=False)
+        return report_bytes
+
+    def generate_report(self, context, output_path=None):
+        """Generate report and return output path.
+
+        output_path defaults to a new generated_reports/<employer>_<date>_<time>_<id>.docx for
+        every generation. The file is written atomically (temp file + rename), and left alone when
+        this process recently wrote the same report there (one of the last WRITTEN_CACHE_SIZE paths)
+        and it has not changed since.
+        """
+        started = time.perf_counter()
+        report_bytes = self._render_report(context)
+        if output_path is None:
+            output_path = f"generated_reports/{report_filename(context)}"
+        written_key = os.path.abspath(output_path)
+        with _rendered_reports_lock:
+            written = _written_reports.get(written_key)
+            if written is not None:
+                _written_reports.move_to_end(written_key)
+        if not (self.last_render_reused and written is not None
+                and written == _written_stamp(output_path, self.last_context_hash)):
+            phase_started = time.perf_counter()
+            write_file_atomic(output_path, report_bytes)
+            written = _written_stamp(output_path, self.last_context_hash)
+            with _rendered_reports_lock:
+                _written_reports[written_key] = written
+                while len(_written_reports) > WRITTEN_CACHE_SIZE:
+                    _written_reports.popitem(last=False)
+            self.last_timings["save"] += time.perf_counter() - phase_started
+        self._finish_timings(started, employer=context.get("Name_of_Employer"), output_path=output_path)
+        return output_path
+
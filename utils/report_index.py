@@ -0,0 +1,58 @@
+import os
+import sqlite3
+import time
+
+DEFAULT_INDEX_PATH = os.path.join("generated_reports", "index.sqlite")
+
+
+def report_employer_key(context):
+    """Employer a report belongs to: its UIF reference, else the employer name."""
+    return str(context.get("UIF_REG_Number") or context.get("Name_of_Employer") or "")
+
+
+class ReportIndex:
+    """Latest saved report per (session, employer), kept as sqlite next to the reports.
+
+    Render workers in several processes write to it concurrently; sqlite's locking (WAL mode plus
+    a busy timeout) serializes the small writes. The path comes from REPORT_INDEX_PATH, else
+    generated_reports/index.sqlite.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or os.environ.get("REPORT_INDEX_PATH", DEFAULT_INDEX_PATH)
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self.conn = sqlite3.connect(self.path, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS latest_reports (
+                session_id TEXT NOT NULL,
+                employer TEXT NOT NULL,
+                name_of_employer TEXT,
+                output_path TEXT NOT NULL,
+                context_hash TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                PRIMARY KEY (session_id, employer)
+            )
+        """)
+
+    def record(self, session_id, context, output_path, context_hash):
+        """Make output_path the latest report of this session for the context's employer."""
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO latest_reports VALUES (?, ?, ?, ?, ?, ?)",
+                (session_id, report_employer_key(context), context.get("Name_of_Employer"), output_path,
+                 context_hash, time.time()),
+            )
+
+    def latest(self, session_id, context):
+        """Latest report of this session for the context's employer (dict), or None when there is none on disk."""
+        row = self.conn.execute(
+            "SELECT output_path, context_hash, created_at FROM latest_reports WHERE session_id = ? AND employer = ?",
+            (session_id, report_employer_key(context)),
+        ).fetchone()
+        if row is None or not os.path.exists(row[0]):
+            return None
+        return {"output_path": row[0], "context_hash": row[1], "created_at": row[2]}
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,335 @@
+import multiprocessing
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+
+from utils.docx_template import load_compiled_template
+from utils.report_generator import ReportGenerator, context_hash
+from utils.report_index import ReportIndex
+
+# Finished jobs kept for status/result lookups (each holds the rendered .docx bytes)
+DEFAULT_MAX_FINISHED_JOBS = 100
+# Recent in-memory results reused when the same context is submitted again
+RECENT_RESULTS = 16
+# Batches kept for batch_status lookups (results only, no report bytes)
+MAX_BATCHES = 20
+
+# Job status values
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+
+def default_workers():
+    """Worker processes for report jobs: REPORT_JOB_WORKERS, else one per CPU."""
+    return int(os.environ.get("REPORT_JOB_WORKERS") or os.cpu_count() or 1)
+
+
+def warm_worker(template_path):
+    """Worker initializer: parse the template once so the worker's first report is already warm."""
+    load_compiled_template(template_path)
+
+
+def _worker_ready():
+    return os.getpid()
+
+
+def _read_saved_report(path):
+    """Bytes of a previously saved report, or None when it can no longer be read."""
+    try:
+        with open(path, "rb") as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def run_report_job(template_path, context, save_to_disk=False, session_id=None, output_path=None):
+    """Render one report and return its result dict (runs in a worker process).
+
+    The result holds report_bytes, output_path (set when save_to_disk, see
+    ReportGenerator.generate_report), timings, reused, sanitize_stats and started_at. Saved
+    reports are recorded in the ReportIndex under session_id; when the session's latest report
+    for the employer has the same content hash, that file is returned without rendering or
+    writing another copy. With output_path (batch reports) the report is written there and
+    report_bytes is None, so the bytes do not travel back to the server.
+    """
+    started_at = time.time()
+    generator = ReportGenerator(template_path)
+    if output_path is not None:
+        generator.generate_report(context, output_path)
+        return {
+            "report_bytes": None,
+            "output_path": output_path,
+            "timings": dict(generator.last_timings),
+            "reused": generator.last_render_reused,
+            "sanitize_stats": generator.last_sanitize_stats,
+            "started_at": started_at,
+        }
+    index = ReportIndex() if save_to_disk and session_id else None
+    try:
+        if index is not None:
+            latest = index.latest(session_id, context)
+            if latest is not None and latest["context_hash"] == generator.report_context_hash(context):
+                report_bytes = _read_saved_report(latest["output_path"])
+                if report_bytes is not None:
+                    return {
+                        "report_bytes": report_bytes,
+                        "output_path": latest["output_path"],
+                        "timings": dict(generator.last_timings, reused=True),
+                        "reused": True,
+                        "sanitize_stats": generator.last_sanitize_stats,
+                        "started_at": started_at,
+                    }
+
+        report_bytes = generator.render_report(context)
+        result = {
+            "report_bytes": report_bytes,
+            "output_path": None,
+            "timings": dict(generator.last_timings),
+            "reused": generator.last_render_reused,
+            "sanitize_stats": generator.last_sanitize_stats,
+            "started_at": started_at,
+        }
+        if save_to_disk:
+            # Same context, so this writes the bytes just rendered without rendering again
+            result["output_path"] = generator.generate_report(context)
+            result["timings"]["save"] += generator.last_timings["save"]
+            result["timings"]["total"] += generator.last_timings["total"]
+            if index is not None:
+                index.record(session_id, context, result["output_path"], generator.last_context_hash)
+        return result
+    finally:
+        if index is not None:
+            index.close()
+
+
+class ReportJobQueue:
+    """Background report generation shared by every session in the process.
+
+    Reports render in a pool of worker processes (spawned, so nothing forks the threaded server),
+    which keeps CPU-bound Jinja/lxml work off the server's GIL and lets throughput grow with
+    cores. Each worker parses the template when it starts and keeps it warm. submit() returns a
+    job ID straight away; status(job_id) reports queued / running / done / failed together with
+    the result once finished. The oldest finished jobs are dropped beyond max_finished_jobs so
+    rendered bytes do not pile up.
+
+    Rendered bytes come back to this process, so an in-memory submit of a context rendered
+    recently is answered from here without a worker. A worker that dies fails its jobs and the
+    pool is replaced on the next submit. submit_batch() queues many reports written straight to
+    files (a multi-employer DataFile) and batch_status() follows them as one unit.
+    """
+
+    def __init__(self, template_path, workers=None, max_finished_jobs=None):
+        self.template_path = template_path
+        self.workers = int(workers or default_workers())
+        self.max_finished_jobs = max_finished_jobs or DEFAULT_MAX_FINISHED_JOBS
+        self._jobs = {}
+        self._finished = OrderedDict()
+        self._recent_results = OrderedDict()
+        self._batches = OrderedDict()
+        self._lock = threading.Lock()
+        self._executor = self._new_executor()
+
+    def _new_executor(self):
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=warm_worker,
+            initargs=(self.template_path,),
+        )
+
+    def warm(self):
+        """Start every worker now (each parses the template) instead of on the first submits.
+
+        Returns without waiting; the returned futures complete once the workers are ready.
+        """
+        with self._lock:
+            executor = self._executor
+        return [executor.submit(_worker_ready) for _ in range(self.workers)]
+
+    def _replace_broken_executor(self, broken):
+        """Replace the broken pool once, however many threads found it broken; returns the current pool."""
+        with self._lock:
+            replaced = self._executor is broken
+            if replaced:
+                self._executor = self._new_executor()
+            executor = self._executor
+        if replaced:
+            broken.shutdown(wait=False)
+        return executor
+
+    def _result_key(self, context):
+        # Same inputs as ReportGenerator's own render cache: the context as rendered today plus the template
+        stat = os.stat(self.template_path)
+        dated = dict(context, date=datetime.now().strftime("%Y-%m-%d"))
+        return context_hash(dated, f"{stat.st_mtime_ns}:{stat.st_size}")
+
+    def submit(self, context, save_to_disk=False, session_id=None, output_path=None, batch_id=None):
+        """Queue a report for context (copied, so later form edits do not leak in). Returns the job ID.
+
+        session_id identifies the submitting session in the saved-report index (see run_report_job).
+        output_path writes the report to that file instead of returning its bytes; batch_id adds
+        the job to a batch from submit_batch().
+        """
+        job_id = uuid.uuid4().hex
+        context = dict(context)
+        job = {
+            "job_id": job_id,
+            "status": QUEUED,
+            "submitted_at": time.time(),
+            "started_at": None,
+            "finished_at": None,
+            "error": None,
+            "result": None,
+            "batch_id": batch_id,
+            "employer": (context.get("UIF_REG_Number", ""), context.get("Name_of_Employer", "")),
+        }
+        result_key = self._result_key(context)
+        with self._lock:
+            self._jobs[job_id] = job
+            recent = self._recent_results.get(result_key) if not (save_to_disk or output_path) else None
+        if recent is not None:
+            timings = dict.fromkeys(recent["timings"], 0.0)
+            timings["reused"] = True
+            job["result"] = dict(recent, timings=timings, reused=True)
+            job["started_at"] = job["submitted_at"]
+            self._finish(job, DONE)
+            return job_id
+
+        with self._lock:
+            executor = self._executor
+        try:
+            future = executor.submit(
+                run_report_job, self.template_path, context, save_to_disk, session_id, output_path)
+        except BrokenProcessPool:
+            # A worker died (e.g. killed for memory); start a fresh pool and try once more
+            executor = self._replace_broken_executor(executor)
+            future = executor.submit(
+                run_report_job, self.template_path, context, save_to_disk, session_id, output_path)
+        job["future"] = future
+        future.add_done_callback(lambda done, job=job, key=result_key: self._job_done(job, done, key))
+        return job_id
+
+    def _job_done(self, job, future, result_key):
+        try:
+            result = future.result()
+        except Exception as e:
+            job["error"] = str(e) or type(e).__name__
+            self._finish(job, FAILED)
+            return
+        job["result"] = result
+        job["started_at"] = result["started_at"]
+        if result["report_bytes"] is not None:
+            with self._lock:
+                self._recent_results[result_key] = result
+                self._recent_results.move_to_end(result_key)
+                while len(self._recent_results) > RECENT_RESULTS:
+                    self._recent_results.popitem(last=False)
+        self._finish(job, DONE)
+
+    def _finish(self, job, status):
+        with self._lock:
+            job["finished_at"] = time.time()
+            job["status"] = status
+            self._finished[job["job_id"]] = True
+            while len(self._finished) > self.max_finished_jobs:
+                expired, _ = self._finished.popitem(last=False)
+                self._jobs.pop(expired, None)
+            batch = self._batches.get(job["batch_id"])
+            if batch is not None:
+                # Kept with the batch, so its results outlive the job's own expiry
+                result = job["result"] or {}
+                batch["results"].append({
+                    "uif_reg_number": job["employer"][0],
+                    "name_of_employer": job["employer"][1],
+                    "output_path": result.get("output_path"),
+                    "seconds": job["finished_at"] - (job["started_at"] or job["submitted_at"]),
+                    "timings": result.get("timings", {}),
+                    "error": job["error"],
+                })
+                if len(batch["results"]) == batch["total"]:
+                    batch["finished_at"] = job["finished_at"]
+
+    def submit_batch(self, reports, output_dir=None):
+        """Queue one job per (context, output_path) in reports; each report is written to its path.
+
+        Returns a batch ID for batch_status(). The oldest batches are dropped beyond MAX_BATCHES.
+        """
+        batch_id = uuid.uuid4().hex
+        with self._lock:
+            self._batches[batch_id] = {
+                "batch_id": batch_id,
+                "total": len(reports),
+                "output_dir": output_dir,
+                "submitted_at": time.time(),
+                "finished_at": time.time() if not reports else None,
+                "results": [],
+            }
+            while len(self._batches) > MAX_BATCHES:
+                self._batches.popitem(last=False)
+        for context, output_path in reports:
+            self.submit(context, output_path=output_path, batch_id=batch_id)
+        return batch_id
+
+    def batch_status(self, batch_id):
+        """Snapshot of a batch, or None for an unknown or expired batch ID.
+
+        Holds total, done (reports finished so far), finished_at, results (one dict per finished
+        report: uif_reg_number, name_of_employer, output_path, seconds, timings, error) and stats
+        over those results (reports, failed, seconds since submit_batch, reports_per_minute, output_dir).
+        """
+        with self._lock:
+            batch = self._batches.get(batch_id)
+            if batch is None:
+                return None
+            results = list(batch["results"])
+            finished_at = batch["finished_at"]
+        elapsed = (finished_at or time.time()) - batch["submitted_at"]
+        generated = sum(1 for result in results if result["error"] is None)
+        return {
+            "batch_id": batch_id,
+            "total": batch["total"],
+            "done": len(results),
+            "finished_at": finished_at,
+            "results": results,
+            "stats": {
+                "reports": generated,
+                "failed": len(results) - generated,
+                "seconds": elapsed,
+                "reports_per_minute": generated * 60 / elapsed if elapsed > 0 else 0.0,
+                "output_dir": batch["output_dir"],
+            },
+        }
+
+    def status(self, job_id):
+        """Snapshot of a job (see submit), or None for an unknown or expired job ID."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            snapshot = {key: value for key, value in job.items() if key != "future"}
+        if snapshot["status"] == QUEUED and job.get("future") is not None and job["future"].running():
+            snapshot["status"] = RUNNING
+        return snapshot
+
+    def counts(self):
+        """Number of known jobs per status."""
+        with self._lock:
+            jobs = list(self._jobs)
+        counts = dict.fromkeys((QUEUED, RUNNING, DONE, FAILED), 0)
+        for job_id in jobs:
+            snapshot = self.status(job_id)
+            if snapshot is not None:
+                counts[snapshot["status"]] += 1
+        return counts
+
+    def shutdown(self):
+        with self._lock:
+            executor = self._executor
+        executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,181 @@
+import os
+import re
+import threading
+import time
+
+DEFAULT_REPORTS_DIR = "generated_reports"
+DEFAULT_MAX_BYTES = 1024 * 1024 * 1024
+DEFAULT_MAX_AGE_DAYS = 30
+DEFAULT_KEEP_PER_EMPLOYER = 5
+DEFAULT_INTERVAL_SECONDS = 15 * 60
+# Temp files older than this are left over from an interrupted write
+STALE_TEMP_SECONDS = 60 * 60
+# ZIP bundles (utils.report_bundle) older than this belong to sessions that have ended or moved on
+STALE_BUNDLE_SECONDS = 6 * 60 * 60
+
+# <employer>_<date>[_<time>_<id>] as written by report_filename(); batch reports are <employer>_<uif>
+_GENERATION_SUFFIX = re.compile(r"_\d{4}-\d{2}-\d{2}(?:_\d{6}_[0-9a-f]{8})?$")
+
+
+def _env_number(name, default, cast=int):
+    value = os.environ.get(name)
+    return cast(value) if value not in (None, "") else default
+
+
+def report_employer_stem(path):
+    """Employer part of a report file name, used to group reports for keep-last-N."""
+    stem = os.path.splitext(os.path.basename(path))[0]
+    return _GENERATION_SUFFIX.sub("", stem)
+
+
+class ReportRetention:
+    """Keeps generated_reports/ bounded by age, per-employer count and total size.
+
+    sweep() evicts, oldest first: reports older than max_age_seconds, then all but the newest
+    keep_per_employer reports of each employer, then more of the oldest until the folder fits in
+    max_bytes. Stale temp files from interrupted writes and ZIP bundles older than
+    STALE_BUNDLE_SECONDS are removed and emptied batch folders are pruned; sqlite files (report index, batch manifests) are never touched. A limit of 0 disables
+    it. start() runs sweep() every interval_seconds on a daemon thread.
+
+    Limits default to REPORT_RETENTION_MAX_BYTES, REPORT_RETENTION_MAX_AGE_DAYS,
+    REPORT_RETENTION_KEEP_PER_EMPLOYER and REPORT_RETENTION_INTERVAL_SECONDS.
+    """
+
+    def __init__(self, reports_dir=None, max_bytes=None, max_age_seconds=None, keep_per_employer=None,
+                 interval_seconds=None):
+        self.reports_dir = reports_dir or DEFAULT_REPORTS_DIR
+        self.max_bytes = max_bytes if max_bytes is not None else _env_number(
+            "REPORT_RETENTION_MAX_BYTES", DEFAULT_MAX_BYTES)
+        self.max_age_seconds = max_age_seconds if max_age_seconds is not None else _env_number(
+            "REPORT_RETENTION_MAX_AGE_DAYS", DEFAULT_MAX_AGE_DAYS, float) * 24 * 3600
+        self.keep_per_employer = keep_per_employer if keep_per_employer is not None else _env_number(
+            "REPORT_RETENTION_KEEP_PER_EMPLOYER", DEFAULT_KEEP_PER_EMPLOYER)
+        self.interval_seconds = interval_seconds or _env_number(
+            "REPORT_RETENTION_INTERVAL_SECONDS", DEFAULT_INTERVAL_SECONDS, float)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self.files_evicted = 0
+        self.bytes_reclaimed = 0
+        self.sweeps = 0
+        self.last_sweep_at = None
+        self.last_sweep_seconds = 0.0
+        self.total_files = 0
+        self.total_bytes = 0
+
+    def _scan(self):
+        """(reports, stale temp files and bundles, folders) under reports_dir; entries are (mtime_ns, size, path)."""
+        reports, temps, folders = [], [], []
+        stale_before = time.time_ns() - int(STALE_TEMP_SECONDS * 1e9)
+        stale_bundles_before = time.time_ns() - int(STALE_BUNDLE_SECONDS * 1e9)
+        pending = [self.reports_dir]
+        while pending:
+            folder = pending.pop()
+            folders.append(folder)
+            try:
+                with os.scandir(folder) as it:
+                    for entry in it:
+                        if entry.is_dir(follow_symlinks=False):
+                            pending.append(entry.path)
+                            continue
+                        name = entry.name.lower()
+                        if name.endswith(".docx"):
+                            stat = entry.stat()
+                            reports.append((stat.st_mtime_ns, stat.st_size, entry.path))
+                        elif name.endswith(".tmp"):
+                            stat = entry.stat()
+                            if stat.st_mtime_ns < stale_before:
+                                temps.append((stat.st_mtime_ns, stat.st_size, entry.path))
+                        elif name.endswith(".zip"):
+                            stat = entry.stat()
+                            if stat.st_mtime_ns < stale_bundles_before:
+                                temps.append((stat.st_mtime_ns, stat.st_size, entry.path))
+            except OSError:
+                continue
+        return reports, temps, folders
+
+    def _select_evictions(self, reports):
+        """Reports to evict (oldest first) and what remains."""
+        evict = set()
+        if self.max_age_seconds:
+            cutoff = time.time_ns() - int(self.max_age_seconds * 1e9)
+            evict.update(path for mtime_ns, _, path in reports if mtime_ns < cutoff)
+
+        if self.keep_per_employer:
+            by_employer = {}
+            for report in sorted(reports, reverse=True):
+                if report[2] not in evict:
+                    by_employer.setdefault(report_employer_stem(report[2]), []).append(report)
+            for employer_reports in by_employer.values():
+                evict.update(path for _, _, path in employer_reports[self.keep_per_employer:])
+
+        remaining = sorted(report for report in reports if report[2] not in evict)
+        if self.max_bytes:
+            total = sum(size for _, size, _ in remaining)
+            while remaining and total > self.max_bytes:
+                _, size, path = remaining.pop(0)
+                evict.add(path)
+                total -= size
+        return [report for report in sorted(reports) if report[2] in evict], remaining
+
+    def sweep(self):
+        """Apply the limits once. Returns (files evicted, bytes reclaimed) for this sweep."""
+        with self._lock:
+            started = time.perf_counter()
+            reports, temps, folders = self._scan()
+            evictions, remaining = self._select_evictions(reports)
+            files, reclaimed = 0, 0
+            for _, size, path in evictions + temps:
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+                files += 1
+                reclaimed += size
+            # Deepest first, so a batch folder emptied here goes too; the reports folder itself stays
+            for folder in sorted(folders, key=len, reverse=True):
+                if folder != self.reports_dir:
+                    try:
+                        os.rmdir(folder)
+                    except OSError:
+                        pass
+            self.files_evicted += files
+            self.bytes_reclaimed += reclaimed
+            self.total_files = len(remaining)
+            self.total_bytes = sum(size for _, size, _ in remaining)
+            self.sweeps += 1
+            self.last_sweep_at = time.time()
+            self.last_sweep_seconds = time.perf_counter() - started
+            return files, reclaimed
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.sweep()
+            except Exception:
+                # A failed sweep must not end the thread; the next interval tries again
+                pass
+            self._stop.wait(self.interval_seconds)
+
+    def start(self):
+        """Run sweep() now and then every interval_seconds on a background thread. Returns self."""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="report-retention", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def stats(self):
+        """Counters and current footprint as a dict."""
+        return {
+            "files_evicted": self.files_evicted,
+            "bytes_reclaimed": self.bytes_reclaimed,
+            "sweeps": self.sweeps,
+            "last_sweep_at": self.last_sweep_at,
+            "last_sweep_seconds": self.last_sweep_seconds,
+            "total_files": self.total_files,
+            "total_bytes": self.total_bytes,
+        }